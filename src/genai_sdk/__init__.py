@@ -1,11 +1,40 @@
-from .agent import Agent
-from .config import AgentConfig, GenerationConfig, ModelConfig
-from .errors import GenAISDKError
-from .memory.base import MemoryBackend
-from .prompting import PromptTemplate
-from .rag.base import Document, Retriever
-from .tools.base import Tool
-from .types import AgentResult, Message
+"""Minimal SDK for building AI agents.
+
+Public names are imported on first access, so ``import genai_sdk`` stays
+cheap and does not load pydantic, httpx or any backend until it is used.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .agent import Agent
+    from .config import AgentConfig, GenerationConfig, ModelConfig
+    from .errors import GenAISDKError
+    from .memory.base import MemoryBackend
+    from .prompting import PromptTemplate
+    from .rag.base import Document, MutableRetriever, Retriever
+    from .tools.base import Tool
+    from .types import AgentResult, Message
+
+_EXPORTS = {
+    "Agent": ".agent",
+    "AgentConfig": ".config",
+    "GenerationConfig": ".config",
+    "ModelConfig": ".config",
+    "GenAISDKError": ".errors",
+    "MemoryBackend": ".memory.base",
+    "PromptTemplate": ".prompting",
+    "Document": ".rag.base",
+    "Retriever": ".rag.base",
+    "MutableRetriever": ".rag.base",
+    "Tool": ".tools.base",
+    "AgentResult": ".types",
+    "Message": ".types",
+}
 
 __all__ = [
     "Agent",
@@ -17,7 +46,10 @@ __all__ = [
     "PromptTemplate",
     "Document",
     "Retriever",
+    "MutableRetriever",
     "Tool",
     "AgentResult",
     "Message",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,31 @@
+"""JSON encoding used on the request hot path.
+
+Uses ``orjson`` when it is installed (``pip install genai-sdk[fast]``) and the
+standard library otherwise. Both produce compact UTF-8 output.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency guard
+    orjson = None  # type: ignore[assignment]
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode a JSON document from text or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
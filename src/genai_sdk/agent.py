@@ -4,27 +4,41 @@ from __future__ import annotations
 
 import asyncio
 import json
+import sys
 import time
 import uuid
 from dataclasses import asdict
-from typing import Any, Sequence
+from typing import TYPE_CHECKING, Any, Sequence
 
-try:
-    from pydantic import BaseModel, ValidationError
-except ImportError:  # pragma: no cover - fallback for minimal environments
-    class ValidationError(Exception):
-        """Fallback validation error when pydantic is unavailable."""
-
-    class BaseModel:  # type: ignore[no-redef]
-        """Fallback BaseModel marker when pydantic is unavailable."""
+if TYPE_CHECKING:
+    from pydantic import BaseModel
 
 from .config import AgentConfig
-from .errors import StructuredOutputError, ToolExecutionError
+from .deadline import Deadline, within
+from .errors import DeadlineExceededError, StructuredOutputError, ToolExecutionError
 from .memory.in_memory import InMemoryMemory
-from .providers.base import Provider, ProviderRequest
+from .providers.base import Provider, ProviderRequest, ProviderResponse
 from .rag.base import RetrievedChunk
+from .rag.packing import format_context, pack_context
+from .runner import get_runner
+from .sessions import SessionExecutor
+from .structured import IncrementalJSONParser, get_validator
+from .tokens import ApproximateTokenizer, Tokenizer, count_message_tokens, count_messages_tokens, fit_history
+from .tools.artifacts import READ_ARTIFACT_TOOL, ArtifactStore, make_artifact_reader_tool, truncate_output
 from .tools.base import Tool, ToolContext
-from .types import AgentResult, Message, ToolCall, Usage
+from .tools.routing import FIND_TOOLS_TOOL, ToolRouter, make_tool_finder_tool
+from .tools.schema import SchemaValidator, compile_schema
+from .tracing import NoopTracer, RunTimer, Tracer
+from .types import AgentResult, Message, TimingBreakdown, ToolCall, ToolResult, Usage
+
+_FINAL_ANSWER_PROMPT = (
+    "The budget for this turn is used up. Do not call tools. "
+    "Give your best final answer using the information gathered so far."
+)
+_REPAIR_PROMPT = (
+    "Your previous reply could not be used: {error}. "
+    "Reply again with only a JSON value that matches the required schema."
+)
 
 
 class Agent:
@@ -37,6 +51,10 @@ class Agent:
         tools: Sequence[Tool] | None = None,
         memory: Any | None = None,
         retriever: Any | None = None,
+        artifacts: ArtifactStore | None = None,
+        tokenizer: Tokenizer | None = None,
+        tracer: Tracer | None = None,
+        sessions: SessionExecutor | None = None,
     ):
         """Create an agent instance.
 
@@ -46,12 +64,51 @@ class Agent:
             tools: Optional set of registered tools.
             memory: Session memory backend. Defaults to in-memory storage.
             retriever: Optional retriever used for RAG context injection.
+            artifacts: Store for tool outputs over their size limit. Created
+                on demand when ``tool_output_max_chars`` or a per-tool
+                ``max_output_chars`` is set.
+            tokenizer: Token counter for ``max_input_tokens`` budgeting.
+                Defaults to a fast approximate counter.
+            tracer: OpenTelemetry-style tracer that receives a span per run
+                phase and per provider/tool call. Phase timings are always
+                reported on :class:`AgentResult`; spans are skipped when
+                omitted.
+            sessions: Serializes turns that share a ``session_id`` so their
+                history loads and appends do not interleave. Defaults to a
+                private :class:`SessionExecutor`; pass one to share it
+                between agents that use the same memory.
         """
         self.config = config
         self.provider = provider
         self.tools = {t.name: t for t in (tools or [])}
+        self.artifacts = artifacts
+        self._owns_artifacts = False
+        if config.tool_output_max_chars is not None or any(
+            getattr(t, "max_output_chars", None) is not None for t in self.tools.values()
+        ):
+            if artifacts is None:
+                self.artifacts = ArtifactStore()
+                self._owns_artifacts = True
+            self.tools.setdefault(READ_ARTIFACT_TOOL, make_artifact_reader_tool(self.artifacts))
+        self.router: ToolRouter | None = None
+        if config.tool_routing_top_n is not None:
+            self.router = ToolRouter(list(self.tools.values()), pinned=[*config.pinned_tools, READ_ARTIFACT_TOOL])
+            # Always offered, so the model can ask for tools the routing missed.
+            finder = make_tool_finder_tool(self.router, config.tool_routing_top_n)
+            self.router.pinned.append(self.tools.setdefault(FIND_TOOLS_TOOL, finder))
+        self._validators: dict[str, SchemaValidator] = (
+            {t.name: compile_schema(t.input_schema) for t in self.tools.values()}
+            if config.validate_tool_arguments
+            else {}
+        )
         self.memory = memory or InMemoryMemory()
         self.retriever = retriever
+        self.tokenizer: Tokenizer = tokenizer or ApproximateTokenizer()
+        self.tracer: Tracer = tracer or NoopTracer()
+        self.sessions = sessions or SessionExecutor()
+        self._tool_tokens: dict[str, int] = {}
+        self._schemas: dict[str, dict[str, Any]] = {}
+        self._system_message = Message(role="system", content=config.system_prompt) if config.system_prompt else None
 
     async def run(
         self,
@@ -59,49 +116,137 @@ class Agent:
         session_id: str | None = None,
         user_id: str | None = None,
         response_model: type[BaseModel] | None = None,
+        timeout: float | None = None,
+        deadline: Deadline | None = None,
+    ) -> AgentResult:
+        """Execute one agent turn and return the normalized result.
+
+        When a per-run budget or ``max_tool_iterations`` runs out, the model is
+        asked for a final answer without tools and ``AgentResult.stop_reason``
+        names the exhausted limit.
+
+        ``timeout`` (seconds) or ``deadline`` bound the whole run: memory,
+        retrieval, provider and tool calls each get only the remaining time,
+        and outstanding work is cancelled with :class:`DeadlineExceededError`
+        once it passes.
+        """
+        if timeout is not None:
+            at = time.monotonic() + timeout
+            deadline = Deadline(min(at, deadline.at) if deadline is not None else at)
+        timer = RunTimer(self.tracer, TimingBreakdown())
+        if session_id is None:
+            # A fresh session cannot collide with another turn.
+            sid = str(uuid.uuid4())
+            with timer.phase("agent.run", session_id=sid):
+                return await self._run(input, sid, user_id, response_model, timer, deadline)
+        with timer.phase("agent.run", session_id=session_id):
+            async with self.sessions.hold(session_id, deadline) as wait_ms:
+                timer.timings.add("session_wait", wait_ms)
+                return await self._run(input, session_id, user_id, response_model, timer, deadline)
+
+    async def _run(
+        self,
+        input: str | list[Message],
+        sid: str,
+        user_id: str | None,
+        response_model: type[BaseModel] | None,
+        timer: RunTimer,
+        deadline: Deadline | None,
     ) -> AgentResult:
-        """Execute one agent turn and return the normalized result."""
         started = time.perf_counter()
-        sid = session_id or str(uuid.uuid4())
 
         incoming = [Message(role="user", content=input)] if isinstance(input, str) else input
-        history = await self.memory.load(sid, limit=self.config.memory_window_messages)
+        prefix_cache = self.config.prompt_layout == "prefix_cache"
+        with timer.phase("memory_load"):
+            if prefix_cache:
+                # Memory keeps at most summary_trigger_messages + 1 messages, so
+                # this reaches the session summary; only the window is sent.
+                limit = self.config.summary_trigger_messages + 1
+                stored = await within(deadline, self.memory.load(sid, limit=limit), "memory load")
+                history = _pin_summary(stored, self.config.memory_window_messages)
+            else:
+                limit = self.config.memory_window_messages
+                history = await within(deadline, self.memory.load(sid, limit=limit), "memory load")
+
+        tool_calls_accum: list[ToolCall] = []
+        tool_results: list[ToolResult] = []
+        usage = Usage()
+        route_query = incoming[-1].content if incoming else ""
+        route_limit = self.config.tool_routing_top_n
+        offered = self._route_tools(route_query, route_limit)
 
         rag_chunks: list[RetrievedChunk] = []
-        rag_context = ""
         if self.retriever and incoming:
-            query = incoming[-1].content
-            rag_chunks = await self.retriever.retrieve(query, k=self.config.retrieval_top_k)
-            if rag_chunks:
-                rag_context = "\n\n".join(
-                    [f"[doc:{c.document_id} score={c.score:.3f}] {c.text}" for c in rag_chunks]
-                )
-
-        messages = list(history)
-        if rag_context:
-            messages.append(
-                Message(
-                    role="system",
-                    content=(
-                        "Use only the provided context when relevant. If uncertain, say so.\n"
-                        f"Context:\n{rag_context}"
-                    ),
+            with timer.phase("retrieval"):
+                rag_chunks = await within(
+                    deadline, self.retriever.retrieve(route_query, k=self.config.retrieval_top_k), "retrieval"
                 )
-            )
-        messages.extend(incoming)
 
-        tool_calls_accum: list[ToolCall] = []
-        usage = Usage()
+        with timer.phase("context"):
+            history, rag_message = self._fit_context(history, incoming, rag_chunks, offered)
+        messages = [self._system_message] if self._system_message is not None else []
+        messages.extend(history)
+        if prefix_cache:
+            # Stable content first, per-turn content last, so providers can reuse the cached prefix.
+            messages.extend(incoming)
+            if rag_message is not None:
+                messages.append(rag_message)
+        else:
+            if rag_message is not None:
+                messages.append(rag_message)
+            messages.extend(incoming)
 
-        for _ in range(self.config.max_tool_iterations + 1):
+        stop_reason = "completed"
+        for iteration in range(self.config.max_tool_iterations + 1):
+            if stop_reason == "completed":
+                stop_reason = self._budget_exceeded(started, usage, len(tool_calls_accum))
+                last_round = iteration > 0 and iteration == self.config.max_tool_iterations
+                if stop_reason == "completed" and last_round and offered:
+                    # Tool rounds are used up: ask for the answer rather than another tool call.
+                    stop_reason = "max_tool_iterations"
+            if stop_reason == "time_budget":
+                # No time left for a final answer; return what the model has said so far.
+                break
+            final = stop_reason != "completed"
+            if final:
+                # Out of budget: ask for an answer from what is already known, with no tools.
+                request_messages = [*messages, Message(role="system", content=_FINAL_ANSWER_PROMPT)]
+            else:
+                request_messages = messages
             provider_request = ProviderRequest(
                 model=self.config.model.model,
-                messages=messages,
+                messages=request_messages,
                 generation=self.config.generation,
-                tools=[t.to_provider_schema() for t in self.tools.values()],
+                tools=[] if final else self._provider_tools(offered, sort=prefix_cache),
+                timeout=deadline.remaining() if deadline is not None else None,
+                user_id=user_id,
+                priority=self.config.request_priority,
             )
-            response = await self.provider.generate(provider_request)
-            usage = response.usage
+            ctx = ToolContext(session_id=sid, user_id=user_id, deadline=deadline)
+            allowed = 0 if final else self._remaining_tool_calls(len(tool_calls_accum))
+            with timer.phase("model", call=provider_request.model) as span:
+                if self.config.stream_tool_dispatch:
+                    # Only cut an invalid answer short when no tool call can follow
+                    # the text and there is a re-ask to fall back on.
+                    parser = (
+                        IncrementalJSONParser(validator=get_validator(response_model))
+                        if response_model is not None
+                        and self.config.structured_output_retries
+                        and not provider_request.tools
+                        else None
+                    )
+                    response, pending = await within(
+                        deadline,
+                        self._stream_and_dispatch(provider_request, ctx, timer, allowed, parser),
+                        "model call",
+                    )
+                else:
+                    response = await within(deadline, self.provider.generate(provider_request), "model call")
+                    pending = []
+                span.set_attribute("tool_calls", len(response.tool_calls))
+            usage = usage.add(response.usage)
+            if final and response.tool_calls:
+                response.tool_calls = []
 
             assistant_msg = Message(
                 role="assistant",
@@ -125,42 +270,58 @@ class Agent:
                 break
 
             tool_calls_accum.extend(response.tool_calls)
-            for call in response.tool_calls:
-                tool = self.tools.get(call.name)
-                if not tool:
-                    messages.append(
-                        Message(
-                            role="tool",
-                            content=f"Tool {call.name} not found",
-                            name=call.name,
-                            tool_call_id=call.call_id,
-                        )
-                    )
-                    continue
-
-                try:
-                    result = await asyncio.wait_for(
-                        tool.call(call.arguments, ToolContext(session_id=sid, user_id=user_id)),
-                        timeout=self.config.tool_timeout_seconds,
-                    )
-                except Exception as exc:
-                    raise ToolExecutionError(f"Tool {call.name} failed: {exc}") from exc
-
+            runnable = response.tool_calls[:allowed]
+            results = await within(deadline, self._finish_tools(runnable, pending, ctx, timer), "tool calls")
+            results += [
+                ToolResult(
+                    name=call.name,
+                    call_id=call.call_id,
+                    output=json.dumps({"error": "tool_call_budget_exhausted", "tool": call.name}),
+                    metadata={"skipped": True},
+                )
+                for call in response.tool_calls[allowed:]
+            ]
+            if len(runnable) < len(response.tool_calls):
+                stop_reason = "tool_call_budget"
+            for call, tool_result in zip(runnable, results):
+                need = call.arguments.get("need") if call.name == FIND_TOOLS_TOOL else None
+                if isinstance(need, str) and need.strip() and not tool_result.metadata.get("invalid_arguments"):
+                    # No offered tool fitted: widen the offer with what the model asked for.
+                    offered = self._route_tools(need, route_limit, keep=offered)
+            for call, tool_result in zip(response.tool_calls, results):
+                tool_results.append(tool_result)
                 messages.append(
                     Message(
                         role="tool",
-                        content=result,
+                        content=tool_result.output,
                         name=call.name,
                         tool_call_id=call.call_id,
                     )
                 )
 
-        output_text = messages[-1].content if messages else ""
-        if response_model is not None:
-            output_text = self._validate_structured_output(output_text, response_model)
+        if stop_reason == "time_budget":
+            # Out of time: return what the model said so far without re-asking
+            # or storing a turn that has no answer in it.
+            output_text = next((m.content for m in reversed(messages) if m.role == "assistant"), "")
+            if response_model is not None and output_text:
+                try:
+                    output_text = get_validator(response_model).validate_json(output_text)
+                except StructuredOutputError:
+                    pass
+        else:
+            output_text = messages[-1].content if messages else ""
+            if response_model is not None:
+                output_text, usage = await self._structured_output(
+                    output_text, response_model, messages, usage, timer, deadline, user_id
+                )
 
-        await self.memory.append(sid, incoming + [Message(role="assistant", content=output_text)])
-        await self.memory.summarize_if_needed(sid, budget=self.config.summary_trigger_messages)
+        if output_text or stop_reason != "time_budget":
+            with timer.phase("persistence"):
+                await within(
+                    deadline,
+                    self._persist(sid, incoming + [Message(role="assistant", content=output_text)]),
+                    "memory persistence",
+                )
 
         latency_ms = int((time.perf_counter() - started) * 1000)
         citations = [asdict(c) for c in rag_chunks]
@@ -168,28 +329,328 @@ class Agent:
             output_text=output_text,
             messages=messages,
             tool_calls=tool_calls_accum,
+            tool_results=tool_results,
             usage=usage,
             latency_ms=latency_ms,
             session_id=sid,
             citations=citations,
+            timings=timer.timings,
+            stop_reason=stop_reason,
         )
 
+    async def _persist(self, sid: str, messages: list[Message]) -> None:
+        await self.memory.append(sid, messages)
+        await self.memory.summarize_if_needed(sid, budget=self.config.summary_trigger_messages)
+
+    def _budget_exceeded(self, started: float, usage: Usage, tool_calls: int) -> str:
+        """Return which per-run budget is exhausted, or ``"completed"`` if none is."""
+        config = self.config
+        if config.max_run_tokens is not None:
+            spent = usage.total_tokens
+            if spent is None:
+                spent = (usage.input_tokens or 0) + (usage.output_tokens or 0)
+            if spent >= config.max_run_tokens:
+                return "token_budget"
+        if config.max_run_seconds is not None and time.perf_counter() - started >= config.max_run_seconds:
+            return "time_budget"
+        if config.max_tool_calls is not None and tool_calls >= config.max_tool_calls:
+            return "tool_call_budget"
+        return "completed"
+
+    def _remaining_tool_calls(self, used: int) -> int:
+        if self.config.max_tool_calls is None:
+            return sys.maxsize
+        return max(0, self.config.max_tool_calls - used)
+
+    def _fit_context(
+        self,
+        history: list[Message],
+        incoming: list[Message],
+        rag_chunks: list[RetrievedChunk],
+        tools: Sequence[Tool],
+    ) -> tuple[list[Message], Message | None]:
+        """Fit history and RAG context into the configured input-token budget.
+
+        The system prompt, incoming messages and offered tool schemas are
+        always sent, so they are reserved first. The rest of the budget goes
+        to RAG context and history (newest messages first) in
+        ``AgentConfig.context_priority`` order.
+        """
+        budget = self.config.max_input_tokens
+        if budget is None:
+            return list(history), self._rag_message(rag_chunks, self.config.rag_context_token_budget)
+
+        remaining = budget - count_messages_tokens(incoming, self.tokenizer)
+        if self._system_message is not None:
+            remaining -= count_message_tokens(self._system_message, self.tokenizer)
+        remaining -= sum(self._schema_tokens(t) for t in tools)
+        fitted: list[Message] = []
+        rag_message: Message | None = None
+        for section in self.config.context_priority:
+            if section == "rag":
+                limit = max(0, remaining)
+                if self.config.rag_context_token_budget is not None:
+                    limit = min(limit, self.config.rag_context_token_budget)
+                rag_message = self._rag_message(rag_chunks, limit)
+                if rag_message is not None:
+                    remaining -= count_message_tokens(rag_message, self.tokenizer)
+            elif section == "history":
+                fitted = fit_history(history, remaining, self.tokenizer)
+                remaining -= count_messages_tokens(fitted, self.tokenizer)
+        return fitted, rag_message
+
+    def _rag_message(self, chunks: list[RetrievedChunk], token_budget: int | None) -> Message | None:
+        """Build the RAG context system message, trimmed to ``token_budget``."""
+        if not chunks:
+            return None
+        passages: list[Any] = (
+            pack_context(chunks, token_budget, count_tokens=self.tokenizer.count)
+            if self.config.rag_pack_context
+            else list(chunks)
+        )
+        while passages:
+            message = Message(
+                role="system",
+                content=(
+                    "Use only the provided context when relevant. If uncertain, say so.\n"
+                    f"Context:\n{format_context(passages)}"
+                ),
+            )
+            if token_budget is None or count_message_tokens(message, self.tokenizer) <= token_budget:
+                return message
+            passages.pop()
+        return None
+
+    def _provider_tools(self, tools: Sequence[Tool], sort: bool = False) -> list[dict[str, Any]]:
+        """Provider schemas for ``tools``, built once per tool and reused across requests."""
+        if sort:
+            tools = sorted(tools, key=lambda t: t.name)
+        return [self._provider_schema(t) for t in tools]
+
+    def _provider_schema(self, tool: Tool) -> dict[str, Any]:
+        schema = self._schemas.get(tool.name)
+        if schema is None:
+            schema = self._schemas[tool.name] = tool.to_provider_schema()
+        return schema
+
+    def _schema_tokens(self, tool: Tool) -> int:
+        tokens = self._tool_tokens.get(tool.name)
+        if tokens is None:
+            tokens = self.tokenizer.count(json.dumps(self._provider_schema(tool)))
+            self._tool_tokens[tool.name] = tokens
+        return tokens
+
+    async def _stream_and_dispatch(
+        self,
+        request: ProviderRequest,
+        ctx: ToolContext,
+        timer: RunTimer,
+        limit: int,
+        parser: IncrementalJSONParser | None = None,
+    ) -> tuple[ProviderResponse, list[asyncio.Task[ToolResult]]]:
+        """Stream one model call, starting each tool as soon as its call is complete.
+
+        At most ``limit`` calls are dispatched; later calls are only collected.
+        When ``parser`` is given (only for requests without tools), the stream
+        ends as soon as the answer's JSON object closes and fails validation.
+        """
+        content: list[str] = []
+        calls: list[ToolCall] = []
+        tasks: list[asyncio.Task[ToolResult]] = []
+        usage = Usage()
+        stream = self.provider.stream(request)
+        try:
+            async for event in stream:
+                if event.type == "content":
+                    content.append(event.data)
+                    if parser is not None:
+                        parser.feed(event.data)
+                        if parser.failed:
+                            break
+                elif event.type == "tool_call":
+                    calls.append(event.data)
+                    if len(tasks) < limit:
+                        tasks.append(asyncio.ensure_future(self._execute_tool(event.data, _fork_context(ctx), timer)))
+                elif event.type == "done" and event.data is not None:
+                    usage = event.data
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        return ProviderResponse(content="".join(content), tool_calls=calls, usage=usage), tasks
+
+    async def _finish_tools(
+        self, calls: list[ToolCall], pending: list[asyncio.Task[ToolResult]], ctx: ToolContext, timer: RunTimer
+    ) -> list[ToolResult]:
+        """Collect tool results in call order, running any not already dispatched."""
+        if pending:
+            try:
+                return list(await asyncio.gather(*pending))
+            except BaseException:
+                for task in pending:
+                    task.cancel()
+                raise
+        return [await self._execute_tool(call, _fork_context(ctx), timer) for call in calls]
+
+    async def _execute_tool(self, call: ToolCall, ctx: ToolContext, timer: RunTimer) -> ToolResult:
+        """Run one requested tool call, timed as a ``tool`` phase."""
+        with timer.phase("tool", call=call.name, tool=call.name) as span:
+            result = await self._call_tool(call, ctx)
+            if "cache" in result.metadata:
+                span.set_attribute("cache", result.metadata["cache"])
+            return result
+
+    async def _call_tool(self, call: ToolCall, ctx: ToolContext) -> ToolResult:
+        """Run one requested tool call and normalize its output."""
+        tool = self.tools.get(call.name)
+        if not tool:
+            return ToolResult(name=call.name, call_id=call.call_id, output=f"Tool {call.name} not found")
+
+        metadata: dict[str, Any] = {}
+        checked = time.perf_counter()
+        errors = self._argument_errors(call)
+        metadata["validation_us"] = int((time.perf_counter() - checked) * 1_000_000)
+        if errors:
+            # Hand the problem back to the model instead of running the tool on bad input.
+            metadata["invalid_arguments"] = True
+            output = json.dumps({"error": "invalid_arguments", "tool": call.name, "details": errors})
+            return ToolResult(name=call.name, call_id=call.call_id, output=output, metadata=metadata)
+
+        timeout = self.config.tool_timeout_seconds
+        if ctx.deadline is not None:
+            timeout = ctx.deadline.timeout(timeout)
+        try:
+            output = await asyncio.wait_for(tool.call(call.arguments, ctx), timeout=timeout)
+        except Exception as exc:
+            if ctx.deadline is not None and ctx.deadline.expired:
+                raise DeadlineExceededError(f"Deadline exceeded while running tool {call.name}") from exc
+            raise ToolExecutionError(f"Tool {call.name} failed: {exc}") from exc
+
+        if "tool_cache" in ctx.metadata:
+            metadata["cache"] = ctx.metadata["tool_cache"]
+        output = await self._limit_output(tool, output, metadata)
+        return ToolResult(name=call.name, call_id=call.call_id, output=output, metadata=metadata)
+
+    async def _limit_output(self, tool: Tool, output: str, metadata: dict[str, Any]) -> str:
+        """Spill outputs over the tool's size limit to the artifact store."""
+        limit = getattr(tool, "max_output_chars", None)
+        if limit is None:
+            limit = self.config.tool_output_max_chars
+        if limit is None or len(output) <= limit or tool.name == READ_ARTIFACT_TOOL or self.artifacts is None:
+            return output
+        handle = await asyncio.to_thread(self.artifacts.put, output)
+        metadata["artifact"] = handle
+        metadata["output_chars"] = len(output)
+        return truncate_output(output, limit, handle)
+
+    def _argument_errors(self, call: ToolCall) -> list[str]:
+        """Return validation errors for a call's arguments."""
+        if call.arguments_error:
+            return [call.arguments_error]
+        validator = self._validators.get(call.name)
+        return validator.errors(call.arguments) if validator is not None else []
+
+    def _route_tools(self, query: str, limit: int | None, keep: Sequence[Tool] = ()) -> list[Tool]:
+        """Select the tools offered to the model for this turn."""
+        if self.router is None or limit is None:
+            return list(self.tools.values())
+        selected = list(keep)
+        names = {t.name for t in selected}
+        for tool in self.router.select(query, limit):
+            if tool.name not in names:
+                selected.append(tool)
+                names.add(tool.name)
+        return selected
+
     def run_sync(
         self,
         input: str | list[Message],
         session_id: str | None = None,
         user_id: str | None = None,
         response_model: type[BaseModel] | None = None,
+        timeout: float | None = None,
     ) -> AgentResult:
-        """Synchronous wrapper around :meth:`run`."""
-        return asyncio.run(self.run(input, session_id=session_id, user_id=user_id, response_model=response_model))
+        """Synchronous wrapper around :meth:`run`.
+
+        Runs on a shared background event loop (see :mod:`genai_sdk.runner`),
+        so it is safe to call from many threads and from code that already
+        has a running loop, and provider connection pools stay warm between
+        calls.
+        """
+        runner = get_runner()
+        if hasattr(self.provider, "aclose"):
+            runner.register_closeable(self.provider)
+        return runner.run(
+            self.run(input, session_id=session_id, user_id=user_id, response_model=response_model, timeout=timeout)
+        )
+
+    async def aclose(self) -> None:
+        """Release provider connections and the artifact store this agent created."""
+        if hasattr(self.provider, "aclose"):
+            await self.provider.aclose()
+        if self._owns_artifacts and self.artifacts is not None:
+            await asyncio.to_thread(self.artifacts.close)
+
+    async def _structured_output(
+        self,
+        text: str,
+        model: type[BaseModel],
+        messages: list[Message],
+        usage: Usage,
+        timer: RunTimer,
+        deadline: Deadline | None,
+        user_id: str | None,
+    ) -> tuple[str, Usage]:
+        """Validate the final answer, re-asking up to ``structured_output_retries`` times."""
+        validator = get_validator(model)
+        retries = 0
+        while True:
+            try:
+                with timer.phase("structured_output"):
+                    return validator.validate_json(text), usage
+            except StructuredOutputError as exc:
+                if retries >= self.config.structured_output_retries:
+                    raise
+                retries += 1
+                messages.append(Message(role="user", content=_REPAIR_PROMPT.format(error=exc)))
+            request = ProviderRequest(
+                model=self.config.model.model,
+                messages=messages,
+                generation=self.config.generation,
+                timeout=deadline.remaining() if deadline is not None else None,
+                user_id=user_id,
+                priority=self.config.request_priority,
+            )
+            with timer.phase("model", call=request.model):
+                response = await within(deadline, self.provider.generate(request), "model call")
+            usage = usage.add(response.usage)
+            messages.append(Message(role="assistant", content=response.content))
+            text = response.content
 
     @staticmethod
     def _validate_structured_output(text: str, model: type[BaseModel]) -> str:
         """Validate JSON output against a Pydantic model."""
-        try:
-            parsed = json.loads(text)
-            obj = model.model_validate(parsed)
-            return obj.model_dump_json()
-        except (json.JSONDecodeError, ValidationError, ValueError, TypeError, AttributeError) as exc:
-            raise StructuredOutputError(f"Failed to validate structured output: {exc}") from exc
+        return get_validator(model).validate_json(text)
+
+
+def _pin_summary(history: list[Message], window: int) -> list[Message]:
+    """Keep a leading session summary plus the newest ``window`` messages.
+
+    With the summary pinned right after the system prompt and tools, the
+    cached prefix holds until memory re-summarizes; the sliding window
+    after it changes every turn.
+    """
+    summary = history[:1] if history and history[0].role == "system" else []
+    recent = history[len(summary) :]
+    return summary + (recent[-window:] if window > 0 else [])
+
+
+def _fork_context(ctx: ToolContext) -> ToolContext:
+    """Give each tool call its own context so per-call metadata does not leak."""
+    return ToolContext(
+        session_id=ctx.session_id, user_id=ctx.user_id, metadata=dict(ctx.metadata), deadline=ctx.deadline
+    )
@@ -1,7 +1,14 @@
 """Configuration objects for model and agent runtime behavior."""
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Literal, get_args
+
+from .errors import ConfigurationError
+
+PromptLayout = Literal["default", "prefix_cache"]
+
+# Sections _fit_context hands the input budget to; tool schemas are always reserved first.
+_CONTEXT_SECTIONS = frozenset({"rag", "history"})
 
 
 @dataclass(slots=True)
@@ -37,3 +44,31 @@ class AgentConfig:
     memory_window_messages: int = 20
     summary_trigger_messages: int = 40
     retrieval_top_k: int = 5
+    rag_pack_context: bool = True
+    rag_context_token_budget: int | None = None
+    tool_routing_top_n: int | None = None
+    pinned_tools: list[str] = field(default_factory=list)
+    validate_tool_arguments: bool = True
+    stream_tool_dispatch: bool = False
+    tool_output_max_chars: int | None = None
+    max_input_tokens: int | None = None
+    context_priority: tuple[str, ...] = ("rag", "history")
+    system_prompt: str | None = None
+    prompt_layout: PromptLayout = "default"
+    max_run_tokens: int | None = None
+    max_run_seconds: float | None = None
+    max_tool_calls: int | None = None
+    structured_output_retries: int = 0
+    request_priority: str | None = None
+
+    def __post_init__(self) -> None:
+        sections = set(self.context_priority)
+        if len(sections) != len(self.context_priority) or not sections <= _CONTEXT_SECTIONS:
+            raise ConfigurationError(
+                f"context_priority must list distinct sections from {sorted(_CONTEXT_SECTIONS)}, "
+                f"got {self.context_priority!r}"
+            )
+        if self.prompt_layout not in get_args(PromptLayout):
+            raise ConfigurationError(
+                f"Unknown prompt_layout {self.prompt_layout!r}; expected one of {list(get_args(PromptLayout))}"
+            )
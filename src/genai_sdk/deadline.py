@@ -0,0 +1,58 @@
+"""Per-run deadlines shared by every step of an agent turn."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, TypeVar
+
+from .errors import DeadlineExceededError
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """An absolute point on the monotonic clock by which work must finish."""
+
+    __slots__ = ("at",)
+
+    def __init__(self, at: float):
+        self.at = at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """Create a deadline ``seconds`` from now."""
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+    def timeout(self, cap: float | None = None) -> float:
+        """Remaining time, limited to ``cap`` when given."""
+        remaining = self.remaining()
+        return remaining if cap is None else min(cap, remaining)
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f}s)"
+
+
+async def within(deadline: Deadline | None, aw: Awaitable[T], step: str) -> T:
+    """Await ``aw``, cancelling it and raising :class:`DeadlineExceededError` at the deadline."""
+    if deadline is None:
+        return await aw
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        if asyncio.iscoroutine(aw):
+            aw.close()
+        raise DeadlineExceededError(f"Deadline exceeded before {step}")
+    try:
+        return await asyncio.wait_for(aw, remaining)
+    except asyncio.TimeoutError:
+        if not deadline.expired:
+            raise
+        raise DeadlineExceededError(f"Deadline exceeded during {step}") from None
@@ -10,9 +10,21 @@ class ProviderError(GenAISDKError):
     """Raised when provider request/response fails."""
 
 
+class ProviderOverloadedError(ProviderError):
+    """Raised when a scheduled provider sheds a request instead of queueing it."""
+
+
 class ToolExecutionError(GenAISDKError):
     """Raised when tool execution fails."""
 
 
 class StructuredOutputError(GenAISDKError):
     """Raised when structured output validation fails."""
+
+
+class DeadlineExceededError(GenAISDKError):
+    """Raised when an agent run does not finish before its deadline."""
+
+
+class SessionBusyError(GenAISDKError):
+    """Raised when too many turns are already queued for one session."""
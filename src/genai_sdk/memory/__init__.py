@@ -1,4 +1,13 @@
-from .in_memory import InMemoryMemory
-from .sqlite import SQLiteMemory
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .in_memory import InMemoryMemory
+    from .sqlite import SQLiteMemory
 
 __all__ = ["InMemoryMemory", "SQLiteMemory"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {"InMemoryMemory": ".in_memory", "SQLiteMemory": ".sqlite"})
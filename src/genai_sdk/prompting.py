@@ -1,10 +1,87 @@
 """Prompt template utilities."""
 
+from __future__ import annotations
+
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from string import Formatter
+from typing import Any, Iterable, Mapping
 
 from .errors import ConfigurationError
 
+# A field segment: (field_name, conversion, format_spec).
+_Field = tuple[str, str | None, str]
+_ACCESSOR = re.compile(r"[.\[]")
+
+
+class CompiledTemplate:
+    """A template parsed once into literal and field segments.
+
+    The variable set is computed at compile time, so rendering is a subset
+    check plus a single ``str.format_map`` call. Missing-variable checking
+    matches :meth:`PromptTemplate.render`.
+    """
+
+    __slots__ = ("source", "variables", "_segments")
+
+    def __init__(self, source: str):
+        self.source = source
+        self._segments = _parse(source)
+        self.variables = frozenset(
+            name for seg in self._segments if not isinstance(seg, str) for name in _field_variables(seg)
+        )
+
+    def render(self, **kwargs: Any) -> str:
+        return self.render_map(kwargs)
+
+    def render_map(self, values: Mapping[str, Any]) -> str:
+        """Render with variables taken from ``values``."""
+        if not self.variables <= values.keys():
+            raise ConfigurationError(f"Missing template variables: {sorted(self.variables.difference(values))}")
+        return self.source.format_map(values)
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]]) -> list[str]:
+        """Render once per mapping in ``rows``."""
+        variables, fmt = self.variables, self.source.format_map
+        out: list[str] = []
+        append = out.append
+        for values in rows:
+            if not variables <= values.keys():
+                raise ConfigurationError(f"Missing template variables: {sorted(variables.difference(values))}")
+            append(fmt(values))
+        return out
+
+    def partial(self, **kwargs: Any) -> CompiledTemplate:
+        """Return a template with ``kwargs`` rendered in and the remaining fields left open."""
+        parts: list[str] = []
+        for seg in self._segments:
+            if isinstance(seg, str):
+                parts.append(seg.replace("{", "{{").replace("}", "}}"))
+            else:
+                needed = _field_variables(seg)
+                if not needed & kwargs.keys():
+                    parts.append(_field_source(seg))
+                    continue
+                if not needed <= kwargs.keys():
+                    missing = sorted(needed.difference(kwargs))
+                    raise ConfigurationError(f"Cannot partially bind {_field_source(seg)}: missing {missing}")
+                try:
+                    rendered = _field_source(seg).format_map(kwargs)
+                except (KeyError, AttributeError, IndexError, TypeError, ValueError) as exc:
+                    raise ConfigurationError(f"Cannot render {_field_source(seg)}: {exc!r}") from exc
+                parts.append(rendered.replace("{", "{{").replace("}", "}}"))
+        return compile_template("".join(parts))
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.source!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_template(source: str) -> CompiledTemplate:
+    """Return the process-wide compiled form of ``source``."""
+    return CompiledTemplate(source)
+
 
 @dataclass(slots=True)
 class PromptTemplate:
@@ -12,16 +89,47 @@ class PromptTemplate:
 
     template: str
 
+    @property
+    def compiled(self) -> CompiledTemplate:
+        return compile_template(self.template)
+
     def variables(self) -> set[str]:
-        vars_: set[str] = set()
-        for _, field_name, _, _ in Formatter().parse(self.template):
-            if field_name:
-                vars_.add(field_name)
-        return vars_
+        return set(self.compiled.variables)
 
     def render(self, **kwargs: str) -> str:
-        required = self.variables()
-        missing = sorted(required.difference(kwargs))
-        if missing:
-            raise ConfigurationError(f"Missing template variables: {missing}")
-        return self.template.format(**kwargs)
+        return self.compiled.render_map(kwargs)
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]]) -> list[str]:
+        """Render the template once per mapping in ``rows``."""
+        return self.compiled.render_many(rows)
+
+    def partial(self, **kwargs: str) -> PromptTemplate:
+        """Pre-bind some variables, returning a template for the rest."""
+        return PromptTemplate(self.compiled.partial(**kwargs).source)
+
+
+def _parse(source: str) -> tuple[str | _Field, ...]:
+    segments: list[str | _Field] = []
+    for literal, field_name, spec, conversion in Formatter().parse(source):
+        if literal:
+            segments.append(literal)
+        if field_name is not None:
+            segments.append((field_name, conversion, spec or ""))
+    return tuple(segments)
+
+
+def _field_variables(field: _Field) -> frozenset[str]:
+    """Names a field reads: its base name plus any fields nested in its spec.
+
+    ``{user.name}`` reads ``user``; ``{a:{w}}`` reads ``a`` and ``w``.
+    """
+    name, _, spec = field
+    names = {_ACCESSOR.split(name, 1)[0]}
+    names.update(n for seg in _parse(spec) if not isinstance(seg, str) for n in _field_variables(seg))
+    names.discard("")
+    return frozenset(names)
+
+
+def _field_source(field: _Field) -> str:
+    name, conversion, spec = field
+    return "{" + name + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}"
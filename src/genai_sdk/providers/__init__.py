@@ -1,12 +1,25 @@
 """Provider adapters.
 
-This module keeps optional dependencies lazy so importing `genai_sdk`
-does not require all provider extras to be installed.
+Adapters are imported on first access, so importing `genai_sdk` does not
+load httpx or require any provider extras to be installed.
 """
 
-try:
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
     from .openai_compatible import OpenAICompatibleProvider
-except ImportError:  # pragma: no cover - optional dependency guard
-    OpenAICompatibleProvider = None  # type: ignore[assignment]
+    from .scheduler import ScheduledProvider, SchedulerStats
+
+_EXPORTS = {
+    "OpenAICompatibleProvider": ".openai_compatible",
+    "ScheduledProvider": ".scheduler",
+    "SchedulerStats": ".scheduler",
+}
+
+__all__ = ["OpenAICompatibleProvider", "ScheduledProvider", "SchedulerStats"]
 
-__all__ = ["OpenAICompatibleProvider"]
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
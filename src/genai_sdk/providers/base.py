@@ -11,12 +11,22 @@ from ..types import Message, ToolCall, Usage
 
 @dataclass(slots=True)
 class ProviderRequest:
-    """Request envelope passed from SDK runtime to a provider adapter."""
+    """Request envelope passed from SDK runtime to a provider adapter.
+
+    ``timeout`` is the time left on the caller's deadline in seconds;
+    providers should not wait on the network for longer than that.
+    ``user_id`` and ``priority`` are used by
+    :class:`~genai_sdk.providers.scheduler.ScheduledProvider` for fair
+    queuing and priority classes.
+    """
 
     model: str
     messages: list[Message]
     generation: GenerationConfig
     tools: list[dict[str, Any]] = field(default_factory=list)
+    timeout: float | None = None
+    user_id: str | None = None
+    priority: str | None = None
 
 
 @dataclass(slots=True)
@@ -65,3 +75,7 @@ class Provider:
     async def embed(self, request: EmbeddingRequest) -> EmbeddingResponse:
         """Generate embeddings for one or more input strings."""
         raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Release pooled connections. The default holds none."""
+        return None
@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
+from collections import OrderedDict
 from typing import Any, AsyncIterator
 
 import httpx
 
+from .. import _json
 from ..errors import ProviderError
 from ..types import Message, ToolCall, Usage
 from .base import EmbeddingRequest, EmbeddingResponse, Provider, ProviderEvent, ProviderRequest, ProviderResponse
@@ -25,6 +30,38 @@ class OpenAICompatibleProvider(Provider):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.timeout = timeout
+        self._clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._closing: set[asyncio.Task[None]] = set()
+        self._tool_blocks: OrderedDict[int, tuple[dict[str, Any], bytes]] = OrderedDict()
+
+    def _http(self) -> httpx.AsyncClient:
+        """Return the pooled client for the running loop, creating it on first use.
+
+        An ``httpx.AsyncClient`` is bound to the loop it first ran on, so each
+        loop gets its own client. Clients left behind by closed loops are shut
+        down here so they do not accumulate.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            for stale in [other for other in self._clients if other.is_closed()]:
+                task = loop.create_task(_close_client(self._clients.pop(stale)))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+            client = self._clients[loop] = httpx.AsyncClient(timeout=self.timeout)
+        return client
+
+    async def aclose(self) -> None:
+        """Close pooled connections, each client on the loop it belongs to."""
+        clients, self._clients = self._clients, {}
+        current = asyncio.get_running_loop()
+        for loop, client in clients.items():
+            if loop is not current and loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_close_client(client), loop))
+            else:
+                await _close_client(client)
+        if self._closing:
+            await asyncio.gather(*self._closing)
 
     def _headers(self) -> dict[str, str]:
         return {
@@ -32,28 +69,76 @@ class OpenAICompatibleProvider(Provider):
             "Content-Type": "application/json",
         }
 
+    def _timeout(self, request: ProviderRequest) -> float:
+        return self.timeout if request.timeout is None else min(self.timeout, request.timeout)
+
     @staticmethod
-    def _messages_payload(messages: list[Message]) -> list[dict[str, Any]]:
-        payload: list[dict[str, Any]] = []
-        for m in messages:
-            msg: dict[str, Any] = {"role": m.role, "content": m.content}
-            if m.name:
-                msg["name"] = m.name
-            if m.tool_call_id:
-                msg["tool_call_id"] = m.tool_call_id
-            tool_calls = m.metadata.get("tool_calls")
-            if tool_calls:
-                msg["tool_calls"] = tool_calls
-                if not m.content:
-                    msg["content"] = None
-            payload.append(msg)
+    def _message_dict(m: Message) -> dict[str, Any]:
+        msg: dict[str, Any] = {"role": m.role, "content": m.content}
+        if m.name:
+            msg["name"] = m.name
+        if m.tool_call_id:
+            msg["tool_call_id"] = m.tool_call_id
+        tool_calls = m.metadata.get("tool_calls")
+        if tool_calls:
+            msg["tool_calls"] = tool_calls
+            if not m.content:
+                msg["content"] = None
+        return msg
+
+    @classmethod
+    def _messages_payload(cls, messages: list[Message]) -> list[dict[str, Any]]:
+        return [cls._message_dict(m) for m in messages]
+
+    def _payload(self, request: ProviderRequest) -> dict[str, Any]:
+        payload = self._options(request)
+        payload["messages"] = self._messages_payload(request.messages)
+        if request.tools:
+            payload["tools"] = request.tools
         return payload
 
-    async def generate(self, request: ProviderRequest) -> ProviderResponse:
-        """Execute a chat completion request and normalize the response."""
+    def _encode(self, request: ProviderRequest, **extra: Any) -> bytes:
+        """Serialize a request body, reusing encodings of unchanged messages and tool schemas.
+
+        Equivalent to encoding :meth:`_payload`, but each message is encoded
+        once and cached on the :class:`Message`, and each tool schema dict is
+        encoded once per provider, so later tool iterations only encode what
+        is new.
+        """
+        head = _json.dumps_bytes({**self._options(request), **extra})
+        parts = [head[:-1], b',"messages":[', b",".join(self._encoded_message(m) for m in request.messages), b"]"]
+        if request.tools:
+            parts += [b',"tools":[', b",".join(self._encoded_tool(t) for t in request.tools), b"]"]
+        parts.append(b"}")
+        return b"".join(parts)
+
+    def _encoded_message(self, m: Message) -> bytes:
+        # Key on every field _message_dict encodes, so any edit re-encodes.
+        tool_calls = m.metadata.get("tool_calls")
+        key = ("openai", m.role, m.content, m.name, m.tool_call_id, tuple(tool_calls) if tool_calls else None)
+        cached = m.payload_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        encoded = _json.dumps_bytes(self._message_dict(m))
+        m.payload_cache = (key, encoded)
+        return encoded
+
+    def _encoded_tool(self, schema: dict[str, Any]) -> bytes:
+        key = id(schema)
+        cached = self._tool_blocks.get(key)
+        if cached is not None and cached[0] is schema:
+            self._tool_blocks.move_to_end(key)
+            return cached[1]
+        encoded = _json.dumps_bytes(schema)
+        # The dict is kept alive alongside its encoding so its id cannot be reused.
+        self._tool_blocks[key] = (schema, encoded)
+        if len(self._tool_blocks) > _TOOL_BLOCK_CACHE_SIZE:
+            self._tool_blocks.popitem(last=False)
+        return encoded
+
+    def _options(self, request: ProviderRequest) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "model": request.model,
-            "messages": self._messages_payload(request.messages),
             "temperature": request.generation.temperature,
             "top_p": request.generation.top_p,
         }
@@ -69,27 +154,30 @@ class OpenAICompatibleProvider(Provider):
             payload["frequency_penalty"] = request.generation.frequency_penalty
         if request.generation.response_format is not None:
             payload["response_format"] = request.generation.response_format
-        if request.tools:
-            payload["tools"] = request.tools
+        return payload
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers=self._headers(),
-                json=payload,
-            )
+    async def generate(self, request: ProviderRequest) -> ProviderResponse:
+        """Execute a chat completion request and normalize the response."""
+        response = await self._http().post(
+            f"{self.base_url}/chat/completions",
+            headers=self._headers(),
+            content=self._encode(request),
+            timeout=self._timeout(request),
+        )
         if response.status_code >= 400:
             raise ProviderError(f"Provider returned {response.status_code}: {response.text}")
 
-        data = response.json()
+        data = _json.loads(response.content)
         choice = data["choices"][0]["message"]
         tool_calls = []
         for tc in choice.get("tool_calls", []):
+            arguments, error = _decode_tool_arguments(tc["function"].get("arguments", "{}"))
             tool_calls.append(
                 ToolCall(
                     name=tc["function"]["name"],
-                    arguments=_parse_tool_arguments(tc["function"].get("arguments", "{}")),
+                    arguments=arguments,
                     call_id=tc.get("id", ""),
+                    arguments_error=error,
                 )
             )
 
@@ -97,47 +185,146 @@ class OpenAICompatibleProvider(Provider):
         return ProviderResponse(
             content=choice.get("content") or "",
             tool_calls=tool_calls,
-            usage=Usage(
-                input_tokens=usage.get("prompt_tokens"),
-                output_tokens=usage.get("completion_tokens"),
-                total_tokens=usage.get("total_tokens"),
-            ),
+            usage=_parse_usage(usage),
         )
 
     async def stream(self, request: ProviderRequest) -> AsyncIterator[ProviderEvent]:
-        """Yield a minimal stream from a non-streaming provider call.
+        """Stream a chat completion over server-sent events.
 
-        This keeps the SDK streaming shape stable while remaining simple in v0.
+        Yields ``content`` events with text deltas, a ``tool_call`` event for
+        each tool call as soon as its arguments are complete (while later
+        calls and text may still be arriving), and a final ``done`` event
+        carrying :class:`Usage`.
         """
-        response = await self.generate(request)
-        yield ProviderEvent(type="content", data=response.content)
-        if response.tool_calls:
-            yield ProviderEvent(type="tool_calls", data=response.tool_calls)
-        yield ProviderEvent(type="done", data=response.usage)
+        body = self._encode(request, stream=True, stream_options={"include_usage": True})
+        usage = Usage()
+        calls = _ToolCallAccumulator()
+        async with self._http().stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            headers=self._headers(),
+            content=body,
+            timeout=self._timeout(request),
+        ) as response:
+            if response.status_code >= 400:
+                body = await response.aread()
+                raise ProviderError(f"Provider returned {response.status_code}: {body.decode(errors='replace')}")
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                chunk = _json.loads(data)
+                if chunk.get("usage"):
+                    usage = _parse_usage(chunk["usage"])
+                for choice in chunk.get("choices") or []:
+                    delta = choice.get("delta") or {}
+                    if delta.get("content"):
+                        yield ProviderEvent(type="content", data=delta["content"])
+                    for fragment in delta.get("tool_calls") or []:
+                        for call in calls.feed(fragment):
+                            yield ProviderEvent(type="tool_call", data=call)
+                    if choice.get("finish_reason"):
+                        for call in calls.flush():
+                            yield ProviderEvent(type="tool_call", data=call)
+        for call in calls.flush():
+            yield ProviderEvent(type="tool_call", data=call)
+        yield ProviderEvent(type="done", data=usage)
 
     async def embed(self, request: EmbeddingRequest) -> EmbeddingResponse:
         """Call the embeddings endpoint and return vectors."""
         payload = {"model": request.model, "input": request.texts}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/embeddings",
-                headers=self._headers(),
-                json=payload,
-            )
+        response = await self._http().post(
+            f"{self.base_url}/embeddings",
+            headers=self._headers(),
+            json=payload,
+        )
         if response.status_code >= 400:
             raise ProviderError(f"Embedding endpoint returned {response.status_code}: {response.text}")
-        data = response.json()
+        data = _json.loads(response.content)
         vectors = [item["embedding"] for item in data.get("data", [])]
         return EmbeddingResponse(vectors=vectors)
 
 
+_TOOL_BLOCK_CACHE_SIZE = 256
+
+
+class _ToolCallAccumulator:
+    """Reassemble streamed tool-call fragments and release each call once complete.
+
+    A call is complete when its arguments parse as a JSON object, when a
+    fragment for a later call index arrives, or when the choice finishes.
+    """
+
+    def __init__(self) -> None:
+        self._parts: dict[int, dict[str, Any]] = {}
+        self._emitted: set[int] = set()
+
+    def feed(self, fragment: dict[str, Any]) -> list[ToolCall]:
+        index = fragment.get("index", 0)
+        ready = [i for i in sorted(self._parts) if i < index and i not in self._emitted]
+        if index in self._emitted:
+            return self._release(ready)
+        part = self._parts.setdefault(index, {"id": "", "name": "", "arguments": []})
+        if fragment.get("id"):
+            part["id"] = fragment["id"]
+        function = fragment.get("function") or {}
+        if function.get("name"):
+            part["name"] += function["name"]
+        if function.get("arguments"):
+            part["arguments"].append(function["arguments"])
+            if function["arguments"].rstrip().endswith("}") and part["name"]:
+                try:
+                    complete = isinstance(json.loads("".join(part["arguments"])), dict)
+                except json.JSONDecodeError:
+                    complete = False
+                if complete:
+                    ready.append(index)
+        return self._release(ready)
+
+    def flush(self) -> list[ToolCall]:
+        return self._release([i for i in sorted(self._parts) if i not in self._emitted])
+
+    def _release(self, indices: list[int]) -> list[ToolCall]:
+        out = []
+        for index in indices:
+            self._emitted.add(index)
+            part = self._parts[index]
+            arguments, error = _decode_tool_arguments("".join(part["arguments"]))
+            out.append(ToolCall(name=part["name"], arguments=arguments, call_id=part["id"], arguments_error=error))
+        return out
+
+
+async def _close_client(client: httpx.AsyncClient) -> None:
+    # Connections owned by a closed loop cannot be shut down cleanly; closing
+    # the client still releases the pool and marks it closed.
+    with contextlib.suppress(Exception):
+        await client.aclose()
+
+
+def _parse_usage(usage: dict[str, Any]) -> Usage:
+    details = usage.get("prompt_tokens_details") or {}
+    return Usage(
+        input_tokens=usage.get("prompt_tokens"),
+        output_tokens=usage.get("completion_tokens"),
+        total_tokens=usage.get("total_tokens"),
+        cached_input_tokens=details.get("cached_tokens"),
+    )
+
+
 def _parse_tool_arguments(raw: str) -> dict[str, Any]:
-    import json
+    return _decode_tool_arguments(raw)[0]
+
 
+def _decode_tool_arguments(raw: str | None) -> tuple[dict[str, Any], str | None]:
+    """Decode tool arguments, returning ``({}, reason)`` when they are unusable."""
+    if not raw:
+        return {}, None
     try:
         data = json.loads(raw)
-    except json.JSONDecodeError:
-        data = {}
+    except json.JSONDecodeError as exc:
+        return {}, f"arguments are not valid JSON: {exc}"
     if isinstance(data, dict):
-        return data
-    return {}
+        return data, None
+    return {}, f"arguments must be a JSON object, got {type(data).__name__}"
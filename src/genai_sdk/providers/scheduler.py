@@ -0,0 +1,224 @@
+"""Priority scheduling and admission control in front of a shared provider."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+from ..errors import ConfigurationError, DeadlineExceededError, ProviderOverloadedError
+from .base import EmbeddingRequest, EmbeddingResponse, Provider, ProviderEvent, ProviderRequest, ProviderResponse
+
+
+@dataclass(slots=True)
+class SchedulerStats:
+    """Counters and queue-time figures for a :class:`ScheduledProvider`."""
+
+    in_flight: int = 0
+    queued: dict[str, int] = field(default_factory=dict)
+    admitted: dict[str, int] = field(default_factory=dict)
+    shed: dict[str, int] = field(default_factory=dict)
+    wait_ms_total: dict[str, float] = field(default_factory=dict)
+    wait_ms_max: dict[str, float] = field(default_factory=dict)
+
+    def mean_wait_ms(self, priority: str) -> float:
+        admitted = self.admitted.get(priority, 0)
+        return self.wait_ms_total.get(priority, 0.0) / admitted if admitted else 0.0
+
+
+@dataclass(slots=True, order=True)
+class _Waiter:
+    start_tag: float
+    seq: int
+    future: asyncio.Future[None] = field(compare=False)
+    priority: str = field(compare=False)
+    enqueued: float = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class ScheduledProvider(Provider):
+    """Wrap a provider with priority classes, per-user fair queuing and load shedding.
+
+    At most ``max_in_flight`` calls reach the wrapped provider at once. Waiting
+    calls are served strictly by priority class (in the order given by
+    ``priorities``), and within a class by start-time fair queuing over
+    ``ProviderRequest.user_id``, so one user's burst cannot starve the others.
+    A call that waits longer than its class's ``max_queue_wait`` (or finds
+    ``max_queue_length`` calls already queued) fails fast with
+    :class:`ProviderOverloadedError` instead of queueing indefinitely.
+    """
+
+    def __init__(
+        self,
+        provider: Provider,
+        max_in_flight: int = 8,
+        priorities: tuple[str, ...] = ("interactive", "batch"),
+        weights: dict[str, float] | None = None,
+        max_queue_wait: float | dict[str, float] | None = None,
+        max_queue_length: int | None = None,
+        wait_samples: int = 1024,
+    ):
+        """Create a scheduler.
+
+        Args:
+            provider: Provider that receives admitted calls.
+            max_in_flight: Global limit on concurrent upstream calls.
+            priorities: Priority classes, highest first. Requests without a
+                ``priority`` use the first class.
+            weights: Per-user fair-share weights (default 1.0).
+            max_queue_wait: Seconds a call may wait for a slot before it is
+                shed, either for all classes or per class.
+            max_queue_length: Calls allowed to wait at once; more are shed.
+            wait_samples: Recent queue waits kept per class for percentiles.
+        """
+        if max_in_flight < 1:
+            raise ConfigurationError("max_in_flight must be at least 1")
+        self.provider = provider
+        self.max_in_flight = max_in_flight
+        self.priorities = priorities
+        self.weights = weights or {}
+        self.max_queue_wait = max_queue_wait
+        self.max_queue_length = max_queue_length
+        self._in_flight = 0
+        self._queues: dict[str, list[_Waiter]] = {p: [] for p in priorities}
+        self._virtual_time: dict[str, float] = dict.fromkeys(priorities, 0.0)
+        self._finish_tags: dict[tuple[str, str | None], float] = {}
+        self._seq = itertools.count()
+        self._queued = 0
+        self._stats = SchedulerStats(
+            admitted=dict.fromkeys(priorities, 0),
+            shed=dict.fromkeys(priorities, 0),
+            wait_ms_total=dict.fromkeys(priorities, 0.0),
+            wait_ms_max=dict.fromkeys(priorities, 0.0),
+        )
+        self._recent_waits: dict[str, deque[float]] = {p: deque(maxlen=wait_samples) for p in priorities}
+
+    async def generate(self, request: ProviderRequest) -> ProviderResponse:
+        async with self._slot(request.priority, request.user_id, request.timeout):
+            return await self.provider.generate(request)
+
+    async def stream(self, request: ProviderRequest) -> AsyncIterator[ProviderEvent]:
+        async with self._slot(request.priority, request.user_id, request.timeout):
+            async for event in self.provider.stream(request):
+                yield event
+
+    async def embed(self, request: EmbeddingRequest) -> EmbeddingResponse:
+        async with self._slot(None, None, None):
+            return await self.provider.embed(request)
+
+    async def aclose(self) -> None:
+        await self.provider.aclose()
+
+    def stats(self) -> SchedulerStats:
+        """Return a snapshot of scheduler counters."""
+        s = self._stats
+        return SchedulerStats(
+            in_flight=self._in_flight,
+            queued={p: sum(1 for w in q if not w.cancelled) for p, q in self._queues.items()},
+            admitted=dict(s.admitted),
+            shed=dict(s.shed),
+            wait_ms_total=dict(s.wait_ms_total),
+            wait_ms_max=dict(s.wait_ms_max),
+        )
+
+    def wait_percentile(self, priority: str, q: float) -> float:
+        """Queue wait in ms at quantile ``q`` (0-1) over recent admitted calls."""
+        samples = sorted(self._recent_waits[priority])
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    @asynccontextmanager
+    async def _slot(self, priority: str | None, user_id: str | None, timeout: float | None) -> AsyncIterator[None]:
+        priority = priority or self.priorities[0]
+        if priority not in self._queues:
+            raise ConfigurationError(f"Unknown priority class {priority!r}; expected one of {list(self.priorities)}")
+        await self._acquire(priority, user_id, timeout)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: str, user_id: str | None, timeout: float | None) -> None:
+        if self._in_flight < self.max_in_flight and not self._queued:
+            self._in_flight += 1
+            self._record_wait(priority, 0.0)
+            return
+        if self.max_queue_length is not None and self._queued >= self.max_queue_length:
+            self._stats.shed[priority] += 1
+            raise ProviderOverloadedError(f"Provider queue is full ({self._queued} waiting)")
+
+        waiter = self._enqueue(priority, user_id)
+        limit = self.max_queue_wait.get(priority) if isinstance(self.max_queue_wait, dict) else self.max_queue_wait
+        # The caller's own deadline running out first is not load shedding.
+        deadline_bound = timeout is not None and (limit is None or timeout < limit)
+        if deadline_bound:
+            limit = timeout
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=limit)
+        except asyncio.TimeoutError:
+            if self._abandon(waiter):
+                if deadline_bound:
+                    raise DeadlineExceededError("Deadline exceeded while waiting for a provider slot") from None
+                self._stats.shed[priority] += 1
+                raise ProviderOverloadedError(
+                    f"Waited more than {limit:.3f}s for a provider slot ({priority} priority)"
+                ) from None
+        except BaseException:
+            if not self._abandon(waiter):
+                self._release()
+            raise
+        self._record_wait(priority, (time.perf_counter() - waiter.enqueued) * 1000)
+
+    def _enqueue(self, priority: str, user_id: str | None) -> _Waiter:
+        # Start-time fair queuing: a user's next request starts where their last one finished.
+        key = (priority, user_id)
+        start = max(self._virtual_time[priority], self._finish_tags.get(key, 0.0))
+        self._finish_tags[key] = start + 1.0 / self.weights.get(user_id or "", 1.0)
+        waiter = _Waiter(
+            start_tag=start,
+            seq=next(self._seq),
+            future=asyncio.get_running_loop().create_future(),
+            priority=priority,
+            enqueued=time.perf_counter(),
+        )
+        heapq.heappush(self._queues[priority], waiter)
+        self._queued += 1
+        return waiter
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Drop a waiter that gave up; return ``False`` if it had already been granted a slot."""
+        if waiter.future.done():
+            return False
+        waiter.cancelled = True
+        waiter.future.cancel()
+        self._queued -= 1
+        return True
+
+    def _release(self) -> None:
+        for priority in self.priorities:
+            queue = self._queues[priority]
+            while queue:
+                waiter = heapq.heappop(queue)
+                if waiter.cancelled:
+                    continue
+                self._queued -= 1
+                self._virtual_time[priority] = waiter.start_tag
+                waiter.future.set_result(None)
+                return
+        self._in_flight -= 1
+        if not self._queued:
+            self._finish_tags.clear()
+
+    def _record_wait(self, priority: str, wait_ms: float) -> None:
+        s = self._stats
+        s.admitted[priority] += 1
+        s.wait_ms_total[priority] += wait_ms
+        s.wait_ms_max[priority] = max(s.wait_ms_max[priority], wait_ms)
+        self._recent_waits[priority].append(wait_ms)
+
@@ -1,4 +1,44 @@
-from .base import Document, RetrievedChunk
-from .simple_vector import SimpleVectorRetriever
+from __future__ import annotations
 
-__all__ = ["Document", "RetrievedChunk", "SimpleVectorRetriever"]
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import Document, DocumentSource, RetrievedChunk
+    from .cache import CachedRetriever, RetrievalCacheStats
+    from .ingest import IngestProgress
+    from .packing import PackedPassage, pack_context
+    from .quantization import IndexFootprint
+    from .sharded import ShardedVectorRetriever
+    from .simple_vector import SimpleVectorRetriever
+
+_EXPORTS = {
+    "Document": ".base",
+    "DocumentSource": ".base",
+    "RetrievedChunk": ".base",
+    "CachedRetriever": ".cache",
+    "RetrievalCacheStats": ".cache",
+    "IngestProgress": ".ingest",
+    "PackedPassage": ".packing",
+    "pack_context": ".packing",
+    "IndexFootprint": ".quantization",
+    "ShardedVectorRetriever": ".sharded",
+    "SimpleVectorRetriever": ".simple_vector",
+}
+
+__all__ = [
+    "Document",
+    "DocumentSource",
+    "RetrievedChunk",
+    "CachedRetriever",
+    "RetrievalCacheStats",
+    "IngestProgress",
+    "IndexFootprint",
+    "PackedPassage",
+    "pack_context",
+    "ShardedVectorRetriever",
+    "SimpleVectorRetriever",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Protocol
+from typing import TYPE_CHECKING, Any, AsyncIterable, Iterable, Protocol, Union
+
+if TYPE_CHECKING:
+    from .ingest import IngestProgress
 
 
 @dataclass(slots=True)
@@ -23,15 +26,36 @@ class RetrievedChunk:
     text: str
     score: float
     metadata: dict[str, Any] = field(default_factory=dict)
+    start: int | None = None
+
+    @property
+    def end(self) -> int | None:
+        """Character offset just past the chunk in its document, if known."""
+        return None if self.start is None else self.start + len(self.text)
+
+
+DocumentSource = Union[Iterable[Document], AsyncIterable[Document]]
 
 
 class Retriever(Protocol):
     """Protocol for pluggable retrieval backends."""
 
-    async def add_documents(self, docs: list[Document]) -> None:
-        """Index documents for future retrieval."""
+    async def add_documents(self, docs: DocumentSource) -> IngestProgress:
+        """Index documents from a sync or async iterable and report ingest progress."""
         ...
 
     async def retrieve(self, query: str, k: int = 5) -> list[RetrievedChunk]:
         """Return top-k chunks relevant to the query."""
         ...
+
+
+class MutableRetriever(Retriever, Protocol):
+    """Retriever whose indexed documents can be replaced or removed by id."""
+
+    async def upsert_documents(self, docs: DocumentSource) -> IngestProgress:
+        """Index documents, replacing previously indexed content with the same id."""
+        ...
+
+    async def delete_documents(self, ids: Iterable[str]) -> int:
+        """Remove documents by id and return how many were indexed."""
+        ...
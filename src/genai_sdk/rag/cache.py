@@ -0,0 +1,132 @@
+"""Versioned LRU cache for query embeddings and retrieval results."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from .base import DocumentSource, RetrievedChunk, Retriever
+
+
+@dataclass(slots=True)
+class RetrievalCacheStats:
+    """Counters for sizing a :class:`CachedRetriever`."""
+
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    evictions: int = 0
+    embedding_hits: int = 0
+    embedding_misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def embedding_hit_rate(self) -> float:
+        total = self.embedding_hits + self.embedding_misses
+        return self.embedding_hits / total if total else 0.0
+
+
+class CachedRetriever:
+    """Wrap any :class:`Retriever` with LRU caches keyed by index version.
+
+    Results are cached per ``(query, k)`` together with the index version
+    they were computed at. The version combines the wrapped retriever's
+    ``version`` attribute (when it has one) with a local counter bumped by
+    writes made through this wrapper, so entries go stale automatically
+    after ``add_documents``, ``upsert_documents`` or ``delete_documents``;
+    the latter two need a :class:`MutableRetriever`.
+    When the wrapped retriever exposes ``embed_query`` and
+    ``retrieve_by_vector``, query embeddings are cached too; they do not
+    depend on the index and survive version changes.
+    """
+
+    def __init__(self, retriever: Retriever, max_results: int = 1024, max_embeddings: int = 4096):
+        self.retriever = retriever
+        self.max_results = max_results
+        self.max_embeddings = max_embeddings
+        self.stats = RetrievalCacheStats()
+        self._writes = 0
+        self._results: OrderedDict[tuple[str, int], tuple[Any, list[RetrievedChunk]]] = OrderedDict()
+        self._embeddings: OrderedDict[str, list[float]] = OrderedDict()
+
+    @property
+    def version(self) -> tuple[Any, int]:
+        """Current index version used to validate cached results."""
+        return (getattr(self.retriever, "version", None), self._writes)
+
+    async def add_documents(self, docs: DocumentSource, **kwargs: Any) -> Any:
+        try:
+            return await self.retriever.add_documents(docs, **kwargs)
+        finally:
+            self._writes += 1
+
+    async def upsert_documents(self, docs: DocumentSource, **kwargs: Any) -> Any:
+        upsert = self._mutation("upsert_documents")
+        try:
+            return await upsert(docs, **kwargs)
+        finally:
+            self._writes += 1
+
+    async def delete_documents(self, ids: Iterable[str]) -> int:
+        delete = self._mutation("delete_documents")
+        try:
+            return await delete(ids)
+        finally:
+            self._writes += 1
+
+    async def retrieve(self, query: str, k: int = 5) -> list[RetrievedChunk]:
+        key = (query, k)
+        version = self.version
+        entry = self._results.get(key)
+        if entry is not None:
+            if entry[0] == version:
+                self._results.move_to_end(key)
+                self.stats.hits += 1
+                return list(entry[1])
+            del self._results[key]
+            self.stats.stale += 1
+        self.stats.misses += 1
+
+        embed = getattr(self.retriever, "embed_query", None)
+        by_vector = getattr(self.retriever, "retrieve_by_vector", None)
+        if embed is not None and by_vector is not None:
+            results = await by_vector(self._embedding(query, embed), k=k)
+        else:
+            results = await self.retriever.retrieve(query, k=k)
+
+        # Only cache if the index did not change while we were awaiting.
+        if self.version == version:
+            self._results[key] = (version, results)
+            if len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+                self.stats.evictions += 1
+        return list(results)
+
+    def clear(self) -> None:
+        """Drop all cached results and embeddings."""
+        self._results.clear()
+        self._embeddings.clear()
+
+    def _mutation(self, name: str) -> Any:
+        method = getattr(self.retriever, name, None)
+        if method is None:
+            raise TypeError(f"{type(self.retriever).__name__} is not a MutableRetriever; it has no {name}()")
+        return method
+
+    def _embedding(self, query: str, embed: Any) -> list[float]:
+        vector = self._embeddings.get(query)
+        if vector is not None:
+            self._embeddings.move_to_end(query)
+            self.stats.embedding_hits += 1
+            return vector
+        self.stats.embedding_misses += 1
+        vector = embed(query)
+        self._embeddings[query] = vector
+        if len(self._embeddings) > self.max_embeddings:
+            self._embeddings.popitem(last=False)
+        return vector
@@ -0,0 +1,117 @@
+"""Streaming ingestion pipeline shared by local retrievers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from .base import Document, DocumentSource
+
+ChunkFn = Callable[[str], Iterable[tuple[int, str]]]
+EmbedBatchFn = Callable[[list[str]], list[list[float]]]
+
+
+@dataclass(slots=True)
+class PendingChunk:
+    """Chunk text waiting for its embedding, tagged with its source document."""
+
+    document_id: str
+    text: str
+    metadata: dict[str, Any]
+    sequence: int
+    start: int = 0
+
+
+@dataclass(slots=True)
+class IngestProgress:
+    """Running counters reported while documents are ingested."""
+
+    documents: int = 0
+    chunks: int = 0
+    batches: int = 0
+
+
+CommitFn = Callable[[list[PendingChunk], list[list[float]]], None]
+ProgressFn = Callable[[IngestProgress], None]
+
+
+async def aiter_documents(docs: DocumentSource) -> AsyncIterator[Document]:
+    """Iterate a sync or async document source without materializing it."""
+    if hasattr(docs, "__aiter__"):
+        async for doc in docs:  # type: ignore[union-attr]
+            yield doc
+    else:
+        for doc in docs:  # type: ignore[union-attr]
+            yield doc
+
+
+async def run_ingest_pipeline(
+    docs: DocumentSource,
+    *,
+    chunk: ChunkFn,
+    embed: EmbedBatchFn,
+    commit: CommitFn,
+    batch_size: int = 64,
+    max_in_flight: int = 4,
+    executor: Executor | None = None,
+    progress: ProgressFn | None = None,
+) -> IngestProgress:
+    """Chunk, embed, and commit documents as a bounded streaming pipeline.
+
+    Documents are pulled lazily, chunked with a generator yielding
+    ``(offset, text)`` spans, and grouped into batches of ``batch_size``
+    chunks. At most ``max_in_flight`` batches are being embedded at any
+    time, so memory stays bounded regardless of corpus size. With an
+    ``executor`` (thread or process pool) embedding runs off the event
+    loop; ``embed`` must then be picklable for process pools. Batches are
+    committed in source order.
+    """
+    if batch_size < 1 or max_in_flight < 1:
+        raise ValueError("batch_size and max_in_flight must be >= 1")
+
+    loop = asyncio.get_running_loop()
+    stats = IngestProgress()
+    in_flight: deque[tuple[list[PendingChunk], asyncio.Future[list[list[float]]]]] = deque()
+
+    def submit(batch: list[PendingChunk]) -> None:
+        texts = [item.text for item in batch]
+        if executor is not None:
+            future = loop.run_in_executor(executor, embed, texts)
+        else:
+            future = loop.create_future()
+            future.set_result(embed(texts))
+        in_flight.append((batch, future))
+
+    async def drain_one() -> None:
+        batch, future = in_flight.popleft()
+        vectors = await future
+        commit(batch, vectors)
+        stats.chunks += len(batch)
+        stats.batches += 1
+        if progress is not None:
+            progress(stats)
+
+    batch: list[PendingChunk] = []
+    try:
+        async for doc in aiter_documents(docs):
+            stats.documents += 1
+            for start, text in chunk(doc.text):
+                batch.append(PendingChunk(doc.id, text, doc.metadata, stats.documents, start))
+                if len(batch) >= batch_size:
+                    submit(batch)
+                    batch = []
+                    if len(in_flight) >= max_in_flight:
+                        await drain_one()
+                    elif executor is None:
+                        await asyncio.sleep(0)
+        if batch:
+            submit(batch)
+        while in_flight:
+            await drain_one()
+    finally:
+        for _, future in in_flight:
+            future.cancel()
+    return stats
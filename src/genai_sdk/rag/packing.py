@@ -0,0 +1,113 @@
+"""Pack retrieved chunks into a compact, token-bounded prompt context."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+from ..tokens import estimate_tokens
+from .base import RetrievedChunk
+
+TokenCounter = Callable[[str], int]
+
+
+@dataclass(slots=True)
+class PackedPassage:
+    """A contiguous passage built from one or more retrieved chunks."""
+
+    document_id: str
+    text: str
+    score: float
+    start: int | None = None
+    chunks: int = 1
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+def pack_context(
+    chunks: Sequence[RetrievedChunk],
+    token_budget: int | None = None,
+    *,
+    count_tokens: TokenCounter = estimate_tokens,
+    dedupe_threshold: float = 0.9,
+) -> list[PackedPassage]:
+    """Merge, de-duplicate, and budget retrieved chunks.
+
+    Chunks from the same document whose character spans touch or overlap are
+    merged into one passage scored by its best chunk. Passages whose word
+    shingles are at least ``dedupe_threshold`` similar (Jaccard) to a better
+    passage are dropped. The rest are added in score order while they fit in
+    ``token_budget``; passages that do not fit are skipped so smaller ones
+    further down can still use the space.
+    """
+    passages = _merge_spans(chunks)
+    passages.sort(key=lambda p: p.score, reverse=True)
+
+    packed: list[PackedPassage] = []
+    kept_shingles: list[set[tuple[str, ...]]] = []
+    used = 0
+    for passage in passages:
+        shingles = _shingles(passage.text)
+        if dedupe_threshold < 1.0 and any(_jaccard(shingles, other) >= dedupe_threshold for other in kept_shingles):
+            continue
+        if token_budget is not None:
+            cost = count_tokens(passage.text)
+            if used + cost > token_budget:
+                continue
+            used += cost
+        packed.append(passage)
+        kept_shingles.append(shingles)
+    return packed
+
+
+def format_context(passages: Sequence[PackedPassage]) -> str:
+    """Render passages in the agent's citation-tagged context format."""
+    return "\n\n".join(f"[doc:{p.document_id} score={p.score:.3f}] {p.text}" for p in passages)
+
+
+def _merge_spans(chunks: Sequence[RetrievedChunk]) -> list[PackedPassage]:
+    by_doc: dict[str, list[RetrievedChunk]] = {}
+    passages: list[PackedPassage] = []
+    for chunk in chunks:
+        if chunk.start is None:
+            passages.append(_passage(chunk))
+        else:
+            by_doc.setdefault(chunk.document_id, []).append(chunk)
+
+    for doc_chunks in by_doc.values():
+        doc_chunks.sort(key=lambda c: c.start or 0)
+        current = _passage(doc_chunks[0])
+        for chunk in doc_chunks[1:]:
+            end = (current.start or 0) + len(current.text)
+            start = chunk.start or 0
+            if start <= end:
+                current.text += chunk.text[end - start :]
+                current.score = max(current.score, chunk.score)
+                current.chunks += 1
+            else:
+                passages.append(current)
+                current = _passage(chunk)
+        passages.append(current)
+    return passages
+
+
+def _passage(chunk: RetrievedChunk) -> PackedPassage:
+    return PackedPassage(
+        document_id=chunk.document_id,
+        text=chunk.text,
+        score=chunk.score,
+        start=chunk.start,
+        metadata=chunk.metadata,
+    )
+
+
+def _shingles(text: str, size: int = 3) -> set[tuple[str, ...]]:
+    words = text.lower().split()
+    if len(words) <= size:
+        return {tuple(words)}
+    return {tuple(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def _jaccard(a: set[tuple[str, ...]], b: set[tuple[str, ...]]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
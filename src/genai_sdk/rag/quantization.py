@@ -0,0 +1,190 @@
+"""Compact vector storage modes for local retrievers."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from operator import mul
+from typing import Iterable, Literal, Protocol
+
+VectorStorage = Literal["float32", "int8", "binary"]
+
+
+@dataclass(slots=True)
+class IndexFootprint:
+    """Approximate memory used by stored vectors."""
+
+    storage: str
+    vectors: int
+    vector_bytes: int
+
+    @property
+    def bytes_per_vector(self) -> float:
+        return self.vector_bytes / self.vectors if self.vectors else 0.0
+
+
+class VectorStore(Protocol):
+    """Row-addressable vector storage with approximate scoring."""
+
+    dimensions: int
+
+    def __len__(self) -> int:
+        ...
+
+    def append(self, vector: list[float]) -> None:
+        """Store one vector as the next row."""
+        ...
+
+    def scores(self, query: list[float]) -> list[float]:
+        """Return an approximate similarity score for every stored row."""
+        ...
+
+    def take(self, rows: Iterable[int]) -> VectorStore:
+        """Return a new store holding only ``rows``, in order."""
+        ...
+
+    @property
+    def nbytes(self) -> int:
+        ...
+
+
+class Float32VectorStore:
+    """Contiguous float32 rows scored by dot product."""
+
+    storage = "float32"
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self._data = array("f")
+
+    def __len__(self) -> int:
+        return len(self._data) // self.dimensions
+
+    def append(self, vector: list[float]) -> None:
+        self._data.extend(_fit(vector, self.dimensions))
+
+    def scores(self, query: list[float]) -> list[float]:
+        d = self.dimensions
+        data = self._data
+        return [sum(map(mul, query, data[i : i + d])) for i in range(0, len(data), d)]
+
+    def take(self, rows: Iterable[int]) -> Float32VectorStore:
+        out = Float32VectorStore(self.dimensions)
+        d = self.dimensions
+        for row in rows:
+            out._data.extend(self._data[row * d : (row + 1) * d])
+        return out
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data) * self._data.itemsize
+
+    def tobytes(self) -> bytes:
+        """Return the raw row-major float32 matrix."""
+        return self._data.tobytes()
+
+
+class Int8VectorStore:
+    """Per-row symmetric int8 scalar quantization."""
+
+    storage = "int8"
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self._codes = array("b")
+        self._scales = array("f")
+
+    def __len__(self) -> int:
+        return len(self._scales)
+
+    def append(self, vector: list[float]) -> None:
+        vector = _fit(vector, self.dimensions)
+        peak = max((abs(v) for v in vector), default=0.0)
+        scale = peak / 127.0 if peak else 1.0
+        self._codes.extend(max(-127, min(127, round(v / scale))) for v in vector)
+        self._scales.append(scale)
+
+    def scores(self, query: list[float]) -> list[float]:
+        d = self.dimensions
+        codes = self._codes
+        return [
+            sum(map(mul, query, codes[row * d : (row + 1) * d])) * scale
+            for row, scale in enumerate(self._scales)
+        ]
+
+    def take(self, rows: Iterable[int]) -> Int8VectorStore:
+        out = Int8VectorStore(self.dimensions)
+        d = self.dimensions
+        for row in rows:
+            out._codes.extend(self._codes[row * d : (row + 1) * d])
+            out._scales.append(self._scales[row])
+        return out
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._codes) * self._codes.itemsize + len(self._scales) * self._scales.itemsize
+
+
+class BinaryVectorStore:
+    """Sign-bit quantization scored by Hamming similarity."""
+
+    storage = "binary"
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self._words_per_row = (dimensions + 63) // 64
+        self._words = array("Q")
+
+    def __len__(self) -> int:
+        return len(self._words) // self._words_per_row
+
+    def append(self, vector: list[float]) -> None:
+        self._words.extend(self._pack(_fit(vector, self.dimensions)))
+
+    def scores(self, query: list[float]) -> list[float]:
+        q = self._pack(query)
+        w = self._words_per_row
+        words = self._words
+        d = self.dimensions
+        if w == 1:
+            qw = q[0]
+            return [1.0 - 2.0 * (qw ^ word).bit_count() / d for word in words]
+        return [
+            1.0 - 2.0 * sum((a ^ b).bit_count() for a, b in zip(q, words[i : i + w])) / d
+            for i in range(0, len(words), w)
+        ]
+
+    def take(self, rows: Iterable[int]) -> BinaryVectorStore:
+        out = BinaryVectorStore(self.dimensions)
+        w = self._words_per_row
+        for row in rows:
+            out._words.extend(self._words[row * w : (row + 1) * w])
+        return out
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._words) * self._words.itemsize
+
+    def _pack(self, vector: list[float]) -> list[int]:
+        words = [0] * self._words_per_row
+        for i, v in enumerate(vector[: self.dimensions]):
+            if v > 0:
+                words[i >> 6] |= 1 << (i & 63)
+        return words
+
+
+def make_vector_store(storage: VectorStorage, dimensions: int) -> VectorStore:
+    """Create an empty vector store for the given storage mode."""
+    if storage == "float32":
+        return Float32VectorStore(dimensions)
+    if storage == "int8":
+        return Int8VectorStore(dimensions)
+    if storage == "binary":
+        return BinaryVectorStore(dimensions)
+    raise ValueError(f"Unknown vector storage mode: {storage!r}")
+
+
+def _fit(vector: list[float], dimensions: int) -> list[float]:
+    if len(vector) == dimensions:
+        return vector
+    return (list(vector) + [0.0] * dimensions)[:dimensions]
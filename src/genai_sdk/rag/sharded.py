@@ -0,0 +1,182 @@
+"""Process-parallel retriever that scores shards of a shared-memory matrix."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from operator import mul
+
+from .base import RetrievedChunk
+from .simple_vector import SimpleVectorRetriever
+
+_WORKER_SEGMENTS: dict[str, shared_memory.SharedMemory] = {}
+_WORKER_SEGMENT_LIMIT = 8
+
+
+@dataclass(slots=True)
+class _Segment:
+    shm: shared_memory.SharedMemory
+    rows: int
+    version: int
+    users: int = 0
+    retired: bool = False
+
+
+class ShardedVectorRetriever(SimpleVectorRetriever):
+    """:class:`SimpleVectorRetriever` whose scoring runs across a process pool.
+
+    The float32 vector matrix is published to one shared-memory segment after
+    each index change. Every query splits the rows into contiguous shards,
+    scores each shard in a worker process, and merges the per-shard top-k.
+    The event loop only embeds the query and merges results.
+    """
+
+    def __init__(
+        self,
+        dimensions: int = 64,
+        chunk_size: int = 500,
+        overlap: int = 50,
+        compaction_threshold: float = 0.25,
+        shards: int | None = None,
+        executor: Executor | None = None,
+        min_shard_rows: int = 1024,
+    ):
+        """Create an empty sharded index.
+
+        Args:
+            dimensions: Embedding vector size.
+            chunk_size: Maximum characters per chunk.
+            overlap: Characters shared between consecutive chunks.
+            compaction_threshold: Fraction of tombstoned chunks that triggers
+                a background compaction.
+            shards: Maximum shards per query. Defaults to the CPU count.
+            executor: Process pool used for scoring. One is created (and
+                owned) on first use when omitted.
+            min_shard_rows: Minimum rows per shard, so small indexes do not
+                pay for fan-out they cannot use.
+        """
+        super().__init__(
+            dimensions=dimensions,
+            chunk_size=chunk_size,
+            overlap=overlap,
+            compaction_threshold=compaction_threshold,
+        )
+        self.shards = shards or os.cpu_count() or 1
+        self.min_shard_rows = max(1, min_shard_rows)
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._segment: _Segment | None = None
+
+    async def retrieve_by_vector(self, q: list[float], k: int = 5) -> list[RetrievedChunk]:
+        if len(self._chunks) == len(self._tombstones):
+            return []
+        segment = self._publish()
+        chunks = self._chunks
+        segment.users += 1
+        try:
+            shard_count = max(1, min(self.shards, math.ceil(segment.rows / self.min_shard_rows)))
+            step = math.ceil(segment.rows / shard_count)
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            partials = await asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        executor,
+                        _score_shard,
+                        segment.shm.name,
+                        self.dimensions,
+                        start,
+                        min(start + step, segment.rows),
+                        q,
+                        k,
+                    )
+                    for start in range(0, segment.rows, step)
+                ]
+            )
+        finally:
+            segment.users -= 1
+            if segment.retired and segment.users == 0:
+                _release(segment.shm)
+
+        top = heapq.nlargest(k, (hit for shard in partials for hit in shard), key=lambda x: x[0])
+        return [
+            RetrievedChunk(
+                document_id=chunks[row].document_id,
+                text=chunks[row].text,
+                score=score,
+                metadata=chunks[row].metadata,
+                start=chunks[row].start,
+            )
+            for score, row in top
+        ]
+
+    def close(self) -> None:
+        """Release the shared-memory segment and any owned process pool."""
+        if self._segment is not None:
+            self._retire(self._segment)
+            self._segment = None
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.shards)
+        return self._executor
+
+    def _publish(self) -> _Segment:
+        if self._segment is not None and self._segment.version == self.version:
+            return self._segment
+        self.compact()
+        payload = self._vectors.tobytes()  # type: ignore[attr-defined]
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(payload)))
+        shm.buf[: len(payload)] = payload
+        if self._segment is not None:
+            self._retire(self._segment)
+        self._segment = _Segment(shm=shm, rows=len(self._chunks), version=self.version)
+        return self._segment
+
+    @staticmethod
+    def _retire(segment: _Segment) -> None:
+        segment.retired = True
+        if segment.users == 0:
+            _release(segment.shm)
+
+
+def _release(shm: shared_memory.SharedMemory) -> None:
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    shm = _WORKER_SEGMENTS.get(name)
+    if shm is not None:
+        return shm
+    while len(_WORKER_SEGMENTS) >= _WORKER_SEGMENT_LIMIT:
+        _WORKER_SEGMENTS.pop(next(iter(_WORKER_SEGMENTS))).close()
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:  # Python < 3.13 always tracks; the tracker is shared with the parent.
+        shm = shared_memory.SharedMemory(name=name)
+    _WORKER_SEGMENTS[name] = shm
+    return shm
+
+
+def _score_shard(name: str, dimensions: int, start: int, stop: int, query: list[float], k: int) -> list[tuple[float, int]]:
+    matrix = _attach(name).buf.cast("f")
+    try:
+        d = dimensions
+        scored = (
+            (sum(map(mul, query, matrix[row * d : (row + 1) * d])), row) for row in range(start, stop)
+        )
+        return heapq.nlargest(k, scored, key=lambda x: x[0])
+    finally:
+        matrix.release()
@@ -2,70 +2,244 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 import math
+from concurrent.futures import Executor
 from dataclasses import dataclass
+from functools import partial
 from hashlib import sha256
+from typing import Iterable, Iterator
 
-from .base import Document, RetrievedChunk
+from .base import DocumentSource, RetrievedChunk
+from .ingest import IngestProgress, PendingChunk, ProgressFn, run_ingest_pipeline
+from .quantization import IndexFootprint, VectorStorage, make_vector_store
 
 
 @dataclass(slots=True)
 class _IndexedChunk:
     document_id: str
     text: str
-    vector: list[float]
     metadata: dict
+    start: int = 0
 
 
 class SimpleVectorRetriever:
     """Lightweight retriever with no external vector database dependency."""
 
-    def __init__(self, dimensions: int = 64, chunk_size: int = 500, overlap: int = 50):
+    def __init__(
+        self,
+        dimensions: int = 64,
+        chunk_size: int = 500,
+        overlap: int = 50,
+        compaction_threshold: float = 0.25,
+        storage: VectorStorage = "float32",
+        rerank_candidates: int | None = None,
+    ):
+        """Create an empty index.
+
+        Args:
+            dimensions: Embedding vector size.
+            chunk_size: Maximum characters per chunk.
+            overlap: Characters shared between consecutive chunks.
+            compaction_threshold: Fraction of tombstoned chunks that triggers
+                a background compaction.
+            storage: Vector storage mode: ``"float32"``, ``"int8"`` scalar
+                quantization, or ``"binary"`` sign bits with Hamming scoring.
+            rerank_candidates: When set, re-score this many top candidates
+                with exact float embeddings recomputed from chunk text.
+        """
         self.dimensions = dimensions
         self.chunk_size = chunk_size
         self.overlap = overlap
+        self.compaction_threshold = compaction_threshold
+        self.storage = storage
+        self.rerank_candidates = rerank_candidates
         self._chunks: list[_IndexedChunk] = []
+        self._vectors = make_vector_store(storage, dimensions)
+        self._doc_slots: dict[str, list[int]] = {}
+        self._tombstones: set[int] = set()
+        self._compaction_task: asyncio.Task[None] | None = None
+        self.version = 0
+
+    async def add_documents(
+        self,
+        docs: DocumentSource,
+        *,
+        batch_size: int = 64,
+        max_in_flight: int = 4,
+        executor: Executor | None = None,
+        progress: ProgressFn | None = None,
+    ) -> IngestProgress:
+        """Stream documents into the index.
+
+        Chunks are appended even if a document id is already indexed; use
+        :meth:`upsert_documents` to replace existing content.
+
+        Args:
+            docs: Sync or async iterable of documents; consumed lazily.
+            batch_size: Number of chunks embedded per batch.
+            max_in_flight: Maximum batches being embedded concurrently.
+            executor: Optional thread/process pool used for embedding.
+            progress: Optional callback invoked after each committed batch.
+        """
+        return await run_ingest_pipeline(
+            docs,
+            chunk=partial(_iter_chunks, chunk_size=self.chunk_size, overlap=self.overlap),
+            embed=partial(_embed_batch, dimensions=self.dimensions),
+            commit=self._commit,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            executor=executor,
+            progress=progress,
+        )
+
+    async def upsert_documents(
+        self,
+        docs: DocumentSource,
+        *,
+        batch_size: int = 64,
+        max_in_flight: int = 4,
+        executor: Executor | None = None,
+        progress: ProgressFn | None = None,
+    ) -> IngestProgress:
+        """Stream documents into the index, replacing any existing chunks per id.
+
+        Old chunks are tombstoned rather than removed, so the cost is
+        proportional to the changed documents. Accepts the same options as
+        :meth:`add_documents`.
+        """
+        versions: dict[str, int] = {}
+        return await run_ingest_pipeline(
+            docs,
+            chunk=partial(_iter_chunks, chunk_size=self.chunk_size, overlap=self.overlap),
+            embed=partial(_embed_batch, dimensions=self.dimensions),
+            commit=partial(self._commit, versions=versions),
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            executor=executor,
+            progress=progress,
+        )
 
-    async def add_documents(self, docs: list[Document]) -> None:
-        for doc in docs:
-            for chunk in _chunk_text(doc.text, self.chunk_size, self.overlap):
-                self._chunks.append(
-                    _IndexedChunk(
-                        document_id=doc.id,
-                        text=chunk,
-                        vector=_hash_embed(chunk, self.dimensions),
-                        metadata=doc.metadata,
-                    )
+    async def delete_documents(self, ids: Iterable[str]) -> int:
+        """Remove documents by id and return how many were indexed."""
+        removed = sum(1 for doc_id in ids if self._tombstone(doc_id))
+        self._maybe_schedule_compaction()
+        return removed
+
+    def compact(self) -> None:
+        """Drop tombstoned chunks and rebuild slot positions."""
+        if not self._tombstones:
+            return
+        rows = [i for i in range(len(self._chunks)) if i not in self._tombstones]
+        live = [self._chunks[i] for i in rows]
+        self._vectors = self._vectors.take(rows)
+        self._chunks = live
+        self._tombstones = set()
+        self._doc_slots = {}
+        for i, item in enumerate(live):
+            self._doc_slots.setdefault(item.document_id, []).append(i)
+        self.version += 1
+
+    def _commit(
+        self,
+        batch: list[PendingChunk],
+        vectors: list[list[float]],
+        versions: dict[str, int] | None = None,
+    ) -> None:
+        for item, vector in zip(batch, vectors):
+            if versions is not None and versions.get(item.document_id) != item.sequence:
+                self._tombstone(item.document_id)
+                versions[item.document_id] = item.sequence
+            self._doc_slots.setdefault(item.document_id, []).append(len(self._chunks))
+            self._vectors.append(vector)
+            self._chunks.append(
+                _IndexedChunk(
+                    document_id=item.document_id,
+                    text=item.text,
+                    metadata=item.metadata,
+                    start=item.start,
                 )
+            )
+        self.version += 1
+        if versions is not None:
+            self._maybe_schedule_compaction()
+
+    def _tombstone(self, document_id: str) -> bool:
+        slots = self._doc_slots.pop(document_id, None)
+        if not slots:
+            return False
+        self._tombstones.update(slots)
+        self.version += 1
+        return True
+
+    def _maybe_schedule_compaction(self) -> None:
+        if not self._chunks or len(self._tombstones) <= self.compaction_threshold * len(self._chunks):
+            return
+        if self._compaction_task is not None and not self._compaction_task.done():
+            return
+        self._compaction_task = asyncio.get_running_loop().create_task(self._compact_later())
+
+    async def _compact_later(self) -> None:
+        await asyncio.sleep(0)
+        self.compact()
 
     async def retrieve(self, query: str, k: int = 5) -> list[RetrievedChunk]:
-        if not self._chunks:
+        return await self.retrieve_by_vector(self.embed_query(query), k=k)
+
+    def embed_query(self, query: str) -> list[float]:
+        """Embed a query string with the index embedder."""
+        return _hash_embed(query, self.dimensions)
+
+    async def retrieve_by_vector(self, q: list[float], k: int = 5) -> list[RetrievedChunk]:
+        """Return top-k chunks for an already embedded query."""
+        if len(self._chunks) == len(self._tombstones):
             return []
-        q = _hash_embed(query, self.dimensions)
+        tombstones = self._tombstones
         scored = [
-            (
-                _cosine_similarity(q, item.vector),
-                item,
-            )
-            for item in self._chunks
+            (score, item)
+            for i, (score, item) in enumerate(zip(self._vectors.scores(q), self._chunks))
+            if not tombstones or i not in tombstones
         ]
-        scored.sort(key=lambda x: x[0], reverse=True)
+        if self.rerank_candidates:
+            candidates = heapq.nlargest(max(k, self.rerank_candidates), scored, key=lambda x: x[0])
+            scored = [
+                (_cosine_similarity(q, _hash_embed(item.text, self.dimensions)), item) for _, item in candidates
+            ]
+        top = heapq.nlargest(k, scored, key=lambda x: x[0])
         return [
-            RetrievedChunk(document_id=item.document_id, text=item.text, score=score, metadata=item.metadata)
-            for score, item in scored[:k]
+            RetrievedChunk(
+                document_id=item.document_id,
+                text=item.text,
+                score=score,
+                metadata=item.metadata,
+                start=item.start,
+            )
+            for score, item in top
         ]
 
+    def memory_footprint(self) -> IndexFootprint:
+        """Report how much memory the stored vectors use."""
+        return IndexFootprint(storage=self.storage, vectors=len(self._vectors), vector_bytes=self._vectors.nbytes)
+
 
 def _chunk_text(text: str, chunk_size: int, overlap: int) -> list[str]:
+    return [chunk for _, chunk in _iter_chunks(text, chunk_size, overlap)]
+
+
+def _iter_chunks(text: str, chunk_size: int, overlap: int) -> Iterator[tuple[int, str]]:
     if len(text) <= chunk_size:
-        return [text]
-    chunks: list[str] = []
+        yield 0, text
+        return
     i = 0
     step = max(1, chunk_size - overlap)
     while i < len(text):
-        chunks.append(text[i : i + chunk_size])
+        yield i, text[i : i + chunk_size]
         i += step
-    return chunks
+
+
+def _embed_batch(texts: list[str], dimensions: int) -> list[list[float]]:
+    return [_hash_embed(text, dimensions) for text in texts]
 
 
 def _hash_embed(text: str, dimensions: int) -> list[float]:
@@ -0,0 +1,111 @@
+"""Long-lived background event loop used by the synchronous API."""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import threading
+import weakref
+from typing import Any, Awaitable, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_runner: "BackgroundLoopRunner | None" = None
+
+
+class BackgroundLoopRunner:
+    """Run coroutines from any thread on one event loop owned by a daemon thread.
+
+    Keeping a single loop alive lets connection pools, caches and locks bound
+    to the loop be reused across synchronous calls.
+    """
+
+    def __init__(self, name: str = "genai-loop"):
+        self._loop = asyncio.new_event_loop()
+        self._closeables: weakref.WeakSet[Any] = weakref.WeakSet()
+        self._closed = False
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, args=(ready,), name=name, daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run ``coro`` on the background loop and block until it finishes.
+
+        Raises ``RuntimeError`` when called from the loop thread itself, which
+        would otherwise deadlock.
+        """
+        if self._closed:
+            coro.close()
+            raise RuntimeError("Background loop runner is shut down")
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("run() called from the runner's own event loop; await the coroutine instead")
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def register_closeable(self, obj: Any) -> None:
+        """Await ``obj.aclose()`` on shutdown if ``obj`` is still alive then."""
+        self._closeables.add(obj)
+
+    def shutdown(self, timeout: float | None = 5.0) -> None:
+        """Close registered resources, cancel leftover tasks and stop the loop."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            asyncio.run_coroutine_threadsafe(self._drain(), self._loop).result(timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self._loop.close()
+
+    def _serve(self, ready: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(ready.set)
+        self._loop.run_forever()
+
+    async def _drain(self) -> None:
+        closers: list[Awaitable[Any]] = [obj.aclose() for obj in list(self._closeables)]
+        await asyncio.gather(*closers, return_exceptions=True)
+        current = asyncio.current_task()
+        tasks = [t for t in asyncio.all_tasks() if t is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._loop.shutdown_asyncgens()
+
+
+def get_runner() -> BackgroundLoopRunner:
+    """Return the process-wide runner, starting it on first use."""
+    global _runner
+    with _lock:
+        if _runner is None or _runner.closed:
+            _runner = BackgroundLoopRunner()
+        return _runner
+
+
+def shutdown_runner(timeout: float | None = 5.0) -> None:
+    """Shut down the process-wide runner; a new one starts on next use."""
+    global _runner
+    with _lock:
+        runner, _runner = _runner, None
+    if runner is not None:
+        runner.shutdown(timeout)
+
+
+atexit.register(shutdown_runner)
@@ -0,0 +1,111 @@
+"""Per-session serialization of agent turns."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from .deadline import Deadline, within
+from .errors import SessionBusyError
+
+
+@dataclass(slots=True)
+class SessionStats:
+    """Counters and lock-wait figures for a :class:`SessionExecutor`."""
+
+    active_sessions: int = 0
+    acquired: int = 0
+    contended: int = 0
+    rejected: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+
+    @property
+    def mean_wait_ms(self) -> float:
+        return self.wait_ms_total / self.acquired if self.acquired else 0.0
+
+
+class _Entry:
+    __slots__ = ("lock", "users", "waiters")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.users = 0
+        self.waiters = 0
+
+
+class SessionExecutor:
+    """Run at most one turn per session at a time; different sessions run in parallel.
+
+    Locks live in a table keyed by session id and are dropped as soon as no
+    turn holds or waits for them, so the table only grows with the number of
+    sessions that are active right now. Each session's queue is bounded by
+    ``max_waiters``; further turns fail fast with :class:`SessionBusyError`.
+    """
+
+    def __init__(self, max_waiters: int | None = 16):
+        """Create an executor.
+
+        Args:
+            max_waiters: Turns allowed to wait behind the running one for the
+                same session, or ``None`` for no limit.
+        """
+        self.max_waiters = max_waiters
+        self._entries: dict[str, _Entry] = {}
+        self._stats = SessionStats()
+
+    @asynccontextmanager
+    async def hold(self, session_id: str, deadline: Deadline | None = None) -> AsyncIterator[float]:
+        """Hold ``session_id`` exclusively; yields the time spent waiting in ms.
+
+        Waiting for the lock counts against ``deadline``.
+        """
+        entry = self._entries.get(session_id)
+        if entry is None:
+            entry = self._entries[session_id] = _Entry()
+        if self.max_waiters is not None and entry.waiters >= self.max_waiters:
+            self._stats.rejected += 1
+            raise SessionBusyError(f"Session {session_id!r} already has {entry.waiters} turns waiting")
+
+        entry.users += 1
+        contended = entry.lock.locked()
+        started = time.perf_counter()
+        entry.waiters += 1
+        try:
+            await within(deadline, entry.lock.acquire(), "session lock")
+        except BaseException:
+            self._leave(session_id, entry)
+            raise
+        finally:
+            entry.waiters -= 1
+        wait_ms = (time.perf_counter() - started) * 1000
+        stats = self._stats
+        stats.acquired += 1
+        stats.contended += contended
+        stats.wait_ms_total += wait_ms
+        stats.wait_ms_max = max(stats.wait_ms_max, wait_ms)
+        try:
+            yield wait_ms
+        finally:
+            entry.lock.release()
+            self._leave(session_id, entry)
+
+    def stats(self) -> SessionStats:
+        """Return a snapshot of executor counters."""
+        s = self._stats
+        return SessionStats(
+            active_sessions=len(self._entries),
+            acquired=s.acquired,
+            contended=s.contended,
+            rejected=s.rejected,
+            wait_ms_total=s.wait_ms_total,
+            wait_ms_max=s.wait_ms_max,
+        )
+
+    def _leave(self, session_id: str, entry: _Entry) -> None:
+        entry.users -= 1
+        if entry.users == 0 and self._entries.get(session_id) is entry:
+            del self._entries[session_id]
@@ -0,0 +1,164 @@
+"""Structured-output validation: cached per-model validators and streaming JSON checks."""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Callable
+
+from .errors import StructuredOutputError
+
+_lock = threading.Lock()
+_validators: dict[type, "StructuredValidator"] = {}
+
+
+class StructuredValidator:
+    """Validates model output text against a response model, built once per model.
+
+    Pydantic models use ``model_validate_json``, which parses and validates in
+    a single pass. Other classes exposing ``model_validate`` go through
+    ``json.loads`` first. When the text is not bare JSON, the first fenced or
+    brace-delimited block is tried before giving up.
+    """
+
+    __slots__ = ("model", "_parse", "_dump")
+
+    def __init__(self, model: type):
+        self.model = model
+        if hasattr(model, "model_validate_json"):
+            self._parse: Callable[[str], Any] = model.model_validate_json
+        else:
+            self._parse = lambda text: model.model_validate(json.loads(text))
+        self._dump: Callable[[Any], str] = lambda obj: obj.model_dump_json()
+
+    def validate(self, text: str) -> Any:
+        """Return the validated model instance or raise :class:`StructuredOutputError`."""
+        try:
+            return self._parse(text)
+        except (ValueError, TypeError, AttributeError) as exc:
+            extracted = _extract_json(text)
+            if extracted is not None and extracted != text:
+                try:
+                    return self._parse(extracted)
+                except (ValueError, TypeError, AttributeError):
+                    pass
+            raise StructuredOutputError(f"Failed to validate structured output: {exc}") from exc
+
+    def validate_json(self, text: str) -> str:
+        """Validate ``text`` and return the model's canonical JSON."""
+        return self._dump(self.validate(text))
+
+
+def get_validator(model: type) -> StructuredValidator:
+    """Return the cached validator for ``model``."""
+    validator = _validators.get(model)
+    if validator is None:
+        with _lock:
+            validator = _validators.setdefault(model, StructuredValidator(model))
+    return validator
+
+
+class IncrementalJSONParser:
+    """Track a JSON object as it streams in, without re-parsing the whole prefix.
+
+    ``feed`` scans only the new characters, keeping the bracket stack and
+    string/escape state. Leading prose and code fences are skipped up to the
+    first ``{``, matching how :class:`StructuredValidator` extracts JSON from
+    a reply. When the object closes it is validated with ``validator`` if
+    one is given; ``failed`` turns true when brackets mismatch or that
+    validation fails, so callers can abort the stream and re-ask early.
+    """
+
+    __slots__ = (
+        "expect",
+        "validator",
+        "_parts",
+        "_size",
+        "_begin",
+        "_end",
+        "_stack",
+        "_in_string",
+        "_escape",
+        "complete",
+        "failed",
+        "error",
+    )
+
+    def __init__(self, expect: str = "{", validator: StructuredValidator | None = None):
+        self.expect = expect
+        self.validator = validator
+        self._parts: list[str] = []
+        self._size = 0
+        self._begin: int | None = None
+        self._end: int | None = None
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self.complete = False
+        self.failed = False
+        self.error: StructuredOutputError | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next piece of streamed text."""
+        if self.failed or self.complete or not chunk:
+            return
+        offset = self._size
+        self._parts.append(chunk)
+        self._size += len(chunk)
+        for i, ch in enumerate(chunk):
+            if self._begin is None:
+                if ch != self.expect:
+                    continue
+                self._begin = offset + i
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._stack.append("}" if ch == "{" else "]")
+            elif ch in "}]":
+                if not self._stack or self._stack.pop() != ch:
+                    self.failed = True
+                    return
+                if not self._stack:
+                    self.complete = True
+                    self._end = offset + i + 1
+                    self._check()
+                    return
+
+    def _check(self) -> None:
+        if self.validator is None:
+            return
+        try:
+            self.validator.validate(self.document())
+        except StructuredOutputError as exc:
+            self.failed = True
+            self.error = exc
+
+    def document(self) -> str:
+        """The JSON text seen so far, without any surrounding prose or fence."""
+        if self._begin is None:
+            return ""
+        return self.text[self._begin : self._end]
+
+
+def _extract_json(text: str) -> str | None:
+    fence = text.find("```")
+    if fence != -1:
+        start = text.find("\n", fence)
+        end = text.find("```", start + 1)
+        if start != -1 and end != -1:
+            return text[start + 1 : end].strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        return text[start : end + 1]
+    return None
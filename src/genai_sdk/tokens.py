@@ -0,0 +1,104 @@
+"""Token counting and token-budget helpers for prompt assembly."""
+
+from __future__ import annotations
+
+import json
+import math
+from typing import Any, Callable, Protocol, Sequence
+
+from .types import Message
+
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class Tokenizer(Protocol):
+    """Counts tokens for budget decisions.
+
+    ``name`` identifies the tokenizer in per-message count caches, so two
+    tokenizers with different vocabularies must use different names.
+    """
+
+    name: str
+
+    def count(self, text: str) -> int:
+        """Return the number of tokens in ``text``."""
+        ...
+
+
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """Cheap token estimate (~4 characters per token by default)."""
+    return math.ceil(len(text) / chars_per_token)
+
+
+class ApproximateTokenizer:
+    """Fast local estimate based on characters per token (no vocabulary)."""
+
+    def __init__(self, chars_per_token: float = 4.0):
+        self.chars_per_token = chars_per_token
+        self.name = f"approx:{chars_per_token}"
+
+    def count(self, text: str) -> int:
+        return estimate_tokens(text, self.chars_per_token)
+
+
+class CallableTokenizer:
+    """Exact tokenizer backed by an ``encode`` function.
+
+    Example: ``CallableTokenizer("cl100k", tiktoken.get_encoding("cl100k_base").encode)``.
+    """
+
+    def __init__(self, name: str, encode: Callable[[str], Sequence[Any]]):
+        self.name = name
+        self._encode = encode
+
+    def count(self, text: str) -> int:
+        return len(self._encode(text))
+
+
+def count_message_tokens(message: Message, tokenizer: Tokenizer) -> int:
+    """Count a message's tokens, reusing the count cached on the message."""
+    tool_calls = message.metadata.get("tool_calls")
+    key = (tokenizer.name, message.content, tuple(tool_calls) if tool_calls else None)
+    cached = message.token_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    tokens = tokenizer.count(message.content) + MESSAGE_OVERHEAD_TOKENS
+    if tool_calls:
+        tokens += tokenizer.count(json.dumps(tool_calls))
+    message.token_cache = (key, tokens)
+    return tokens
+
+
+def count_messages_tokens(messages: Sequence[Message], tokenizer: Tokenizer) -> int:
+    """Total tokens for a message list."""
+    return sum(count_message_tokens(m, tokenizer) for m in messages)
+
+
+def fit_history(history: Sequence[Message], budget: int, tokenizer: Tokenizer) -> list[Message]:
+    """Keep the most recent messages that fit in ``budget`` tokens.
+
+    A leading system summary is reserved first when it fits, and the window
+    never starts on an orphaned ``tool`` message.
+    """
+    if budget <= 0 or not history:
+        return []
+    summary = history[0] if history[0].role == "system" else None
+    if summary is not None:
+        summary_cost = count_message_tokens(summary, tokenizer)
+        if summary_cost <= budget:
+            budget -= summary_cost
+        else:
+            summary = None
+        history = history[1:]
+    kept: list[Message] = []
+    used = 0
+    for message in reversed(history):
+        cost = count_message_tokens(message, tokenizer)
+        if used + cost > budget:
+            break
+        kept.append(message)
+        used += cost
+    kept.reverse()
+    while kept and kept[0].role == "tool":
+        kept.pop(0)
+    return [summary, *kept] if summary is not None else kept
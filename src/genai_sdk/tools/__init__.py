@@ -1,4 +1,40 @@
-from .function import FunctionTool
-from .mcp import MCPToolset
+from __future__ import annotations
 
-__all__ = ["FunctionTool", "MCPToolset"]
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .artifacts import ArtifactStore
+    from .cache import ToolCache
+    from .executors import configure_tool_executors, shutdown_tool_executors
+    from .function import FunctionTool
+    from .mcp import MCPToolset
+    from .mcp_stdio import MCPClientPool, StdioMCPClient
+    from .routing import ToolRouter
+
+_EXPORTS = {
+    "ArtifactStore": ".artifacts",
+    "ToolCache": ".cache",
+    "configure_tool_executors": ".executors",
+    "shutdown_tool_executors": ".executors",
+    "FunctionTool": ".function",
+    "MCPToolset": ".mcp",
+    "MCPClientPool": ".mcp_stdio",
+    "StdioMCPClient": ".mcp_stdio",
+    "ToolRouter": ".routing",
+}
+
+__all__ = [
+    "ArtifactStore",
+    "FunctionTool",
+    "MCPToolset",
+    "MCPClientPool",
+    "StdioMCPClient",
+    "ToolCache",
+    "ToolRouter",
+    "configure_tool_executors",
+    "shutdown_tool_executors",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
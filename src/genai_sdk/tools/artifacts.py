@@ -0,0 +1,176 @@
+"""Local artifact store for tool outputs too large to inline in prompts."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import secrets
+from typing import Any
+
+from .base import ToolContext
+from .function import FunctionTool
+
+READ_ARTIFACT_TOOL = "read_artifact"
+_HANDLE = re.compile(r"^art_[0-9a-f]{16}$")
+
+
+class ArtifactStore:
+    """Store large payloads as files and serve them back in pages.
+
+    Handles are opaque ``art_<hex>`` strings; nothing outside ``root`` can be
+    read through them.
+    """
+
+    def __init__(self, root: str | None = None):
+        """Create a store.
+
+        Args:
+            root: Directory for artifact files. A private temporary directory
+                is created when omitted and removed again by :meth:`close`.
+        """
+        self._owns_root = root is None
+        if root is None:
+            import tempfile
+
+            root = tempfile.mkdtemp(prefix="genai-artifacts-")
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def close(self) -> None:
+        """Remove the private temporary directory, if this store created one."""
+        if self._owns_root:
+            import shutil
+
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    def put(self, content: str) -> str:
+        """Persist ``content`` and return its handle."""
+        handle = f"art_{secrets.token_hex(8)}"
+        with open(self._path(handle), "w", encoding="utf-8") as f:
+            f.write(content)
+        return handle
+
+    def read(self, handle: str, offset: int = 0, length: int = 4000) -> str:
+        """Return up to ``length`` characters starting at character ``offset``.
+
+        A negative ``offset`` is treated as 0.
+        """
+        offset = max(0, offset)
+        with open(self._path(handle), encoding="utf-8") as f:
+            if offset:
+                f.read(offset)
+            return f.read(max(0, length))
+
+    def size(self, handle: str) -> int:
+        """Return the artifact length in characters."""
+        with open(self._path(handle), encoding="utf-8") as f:
+            return sum(len(block) for block in iter(lambda: f.read(1 << 16), ""))
+
+    def delete(self, handle: str) -> None:
+        try:
+            os.unlink(self._path(handle))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, handle: str) -> str:
+        if not _HANDLE.match(handle):
+            raise KeyError(f"Unknown artifact handle: {handle!r}")
+        return os.path.join(self.root, handle)
+
+
+def truncate_output(text: str, max_chars: int, handle: str | None = None) -> str:
+    """Shrink ``text`` to about ``max_chars`` while keeping it useful to a model.
+
+    JSON payloads are prefixed with a short structural summary. The rest of
+    the budget is split between the head and tail of the text, cut at line
+    boundaries where possible, with a note saying how to page through the
+    full artifact when ``handle`` is given. Under very small limits the
+    summary is dropped first, then the text, then the end of the note.
+    """
+    if len(text) <= max_chars:
+        return text
+    summary = _json_summary(text)
+    notice = f"[Output truncated: showing part of {len(text)} characters."
+    if handle:
+        notice += (
+            f" Full output stored as artifact {handle}; call {READ_ARTIFACT_TOOL} with "
+            f'{{"handle": "{handle}", "offset": <int>}} to page through it.'
+        )
+    notice += "]"
+    if len(notice) + len(summary) + 16 > max_chars:
+        summary = ""
+    if len(notice) + 16 > max_chars:
+        # No room for any of the text: keep as much of the notice as fits.
+        return notice[: max_chars - 1] + "]" if max_chars > 1 else notice[:max_chars]
+    budget = max(0, max_chars - len(notice) - len(summary) - 16)
+    head = _cut_at_line(text[: budget * 2 // 3], from_end=False)
+    tail = _cut_at_line(text[len(text) - budget // 3 :] if budget // 3 else "", from_end=True)
+    parts = [p for p in (summary, head, "...", tail, notice) if p]
+    return "\n".join(parts)
+
+
+def make_artifact_reader_tool(store: ArtifactStore, page_chars: int = 4000) -> FunctionTool:
+    """Build the tool the model uses to page through spilled outputs."""
+
+    def read_artifact(args: dict[str, Any], ctx: ToolContext) -> str:
+        handle = args["handle"]
+        offset = max(0, int(args.get("offset", 0)))
+        length = min(int(args.get("length", page_chars)), page_chars)
+        try:
+            total = store.size(handle)
+            page = store.read(handle, offset, length)
+        except (KeyError, FileNotFoundError):
+            return f"Unknown artifact handle: {handle}"
+        end = offset + len(page)
+        more = f" Next offset: {end}." if end < total else " End of artifact."
+        return f"[{handle} characters {offset}-{end} of {total}.{more}]\n{page}"
+
+    return FunctionTool(
+        name=READ_ARTIFACT_TOOL,
+        description="Read a page of a large tool output that was stored as an artifact.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string", "description": "Artifact handle from a truncated tool output."},
+                "offset": {"type": "integer", "minimum": 0, "description": "Character offset to start from."},
+                "length": {"type": "integer", "minimum": 1, "maximum": page_chars},
+            },
+            "required": ["handle"],
+        },
+        fn=read_artifact,
+    )
+
+
+def _json_summary(text: str) -> str:
+    stripped = text.lstrip()
+    if not stripped or stripped[0] not in "[{":
+        return ""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return ""
+    if isinstance(data, list):
+        kinds = sorted({type(item).__name__ for item in data})
+        keys = sorted({k for item in data[:50] if isinstance(item, dict) for k in item})[:20]
+        summary = f"[JSON array of {len(data)} items ({', '.join(kinds)})"
+        if keys:
+            summary += f"; item keys: {', '.join(keys)}"
+        return summary + "]"
+    if isinstance(data, dict):
+        fields = []
+        for key, value in list(data.items())[:20]:
+            size = f"[{len(value)}]" if isinstance(value, (list, dict, str)) else ""
+            fields.append(f"{key}: {type(value).__name__}{size}")
+        return f"[JSON object with {len(data)} keys: {', '.join(fields)}]"
+    return ""
+
+
+def _cut_at_line(text: str, from_end: bool) -> str:
+    if not text:
+        return ""
+    if from_end:
+        newline = text.find("\n")
+        return text[newline + 1 :] if 0 <= newline < len(text) // 2 else text
+    newline = text.rfind("\n")
+    return text[:newline] if newline > len(text) // 2 else text
@@ -2,17 +2,29 @@
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
-from typing import Any, Protocol
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from ..deadline import Deadline
 
 
 @dataclass(slots=True)
 class ToolContext:
-    """Execution context passed to tools."""
+    """Execution context passed to tools.
+
+    ``cancel_event`` is set when a tool running in a worker thread is
+    cancelled or times out, so long-running synchronous tools can stop early.
+    ``deadline`` is the run's deadline, if any; tools that make their own
+    network calls should bound them by ``deadline.remaining()``.
+    """
 
     session_id: str | None = None
     user_id: str | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
+    cancel_event: threading.Event | None = None
+    deadline: Deadline | None = None
 
 
 class Tool(Protocol):
@@ -0,0 +1,130 @@
+"""TTL result cache for idempotent tools."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Literal
+
+from .base import ToolContext
+
+CacheScope = Literal["global", "user", "session"]
+
+
+@dataclass(slots=True)
+class ToolCacheStats:
+    """Counters for a :class:`ToolCache`."""
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+
+class ToolCache:
+    """Cache tool outputs by tool name and arguments for ``ttl_seconds``.
+
+    ``scope`` partitions entries: ``"global"`` shares results across all
+    callers, ``"user"`` and ``"session"`` key them by ``ToolContext.user_id``
+    or ``session_id`` (calls without that id bypass the cache). Concurrent
+    identical calls are collapsed into one execution. The outcome of each
+    call is recorded in ``ctx.metadata["tool_cache"]`` as ``"hit"``,
+    ``"coalesced"``, ``"miss"``, or ``"bypass"``.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 1024, scope: CacheScope = "global"):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.scope = scope
+        self.stats = ToolCacheStats()
+        self._entries: OrderedDict[tuple[str, str | None, str], tuple[float, str]] = OrderedDict()
+        self._in_flight: dict[tuple[str, str | None, str], asyncio.Future[str]] = {}
+
+    async def get_or_call(
+        self,
+        tool_name: str,
+        args: dict[str, Any],
+        ctx: ToolContext | None,
+        call: Callable[[], Awaitable[str]],
+    ) -> str:
+        """Return a cached result or run ``call`` and cache its output."""
+        key = self._key(tool_name, args, ctx)
+        if key is None:
+            _mark(ctx, "bypass")
+            return await call()
+
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    _mark(ctx, "hit")
+                    return entry[1]
+                del self._entries[key]
+
+            pending = self._in_flight.get(key)
+            if pending is None:
+                break
+            try:
+                result = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if pending.cancelled():
+                    continue  # The leading call was cancelled; try again ourselves.
+                raise
+            self.stats.coalesced += 1
+            _mark(ctx, "coalesced")
+            return result
+
+        self.stats.misses += 1
+        _mark(ctx, "miss")
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await call()
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # Mark retrieved when nobody is waiting.
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        future.set_result(result)
+        return result
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+
+    def _key(self, tool_name: str, args: dict[str, Any], ctx: ToolContext | None) -> tuple[str, str | None, str] | None:
+        if self.scope == "global":
+            partition = None
+        else:
+            partition = getattr(ctx, "user_id" if self.scope == "user" else "session_id", None)
+            if partition is None:
+                return None
+        try:
+            encoded = json.dumps(args, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            encoded = repr(sorted(args.items()))
+        return (tool_name, partition, encoded)
+
+
+def _mark(ctx: ToolContext | None, outcome: str) -> None:
+    if ctx is not None:
+        ctx.metadata["tool_cache"] = outcome
@@ -0,0 +1,67 @@
+"""Shared executors used to run synchronous tools off the event loop."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+ExecutorKind = Literal["inline", "thread", "process"]
+
+_lock = threading.Lock()
+_max_threads: int | None = None
+_max_processes: int | None = None
+_thread_pool: ThreadPoolExecutor | None = None
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def configure_tool_executors(max_threads: int | None = None, max_processes: int | None = None) -> None:
+    """Set pool sizes for the shared tool executors.
+
+    Existing pools are shut down (without waiting) and recreated lazily with
+    the new sizes on next use. ``None`` keeps the standard library default.
+    """
+    global _max_threads, _max_processes
+    with _lock:
+        _max_threads = max_threads
+        _max_processes = max_processes
+    shutdown_tool_executors(wait=False)
+
+
+def get_tool_executor(kind: Literal["thread", "process"]) -> Executor:
+    """Return the shared thread or process pool, creating it on first use."""
+    global _thread_pool, _process_pool
+    with _lock:
+        if kind == "thread":
+            if _thread_pool is None:
+                _thread_pool = ThreadPoolExecutor(max_workers=_max_threads, thread_name_prefix="genai-tool")
+            return _thread_pool
+        if kind == "process":
+            if _process_pool is None:
+                # Imported here: multiprocessing is slow to import and most tools never need it.
+                from concurrent.futures import ProcessPoolExecutor
+
+                _process_pool = ProcessPoolExecutor(max_workers=_max_processes)
+            return _process_pool
+    raise ValueError(f"Unknown tool executor kind: {kind!r}")
+
+
+def is_process_pool(executor: Executor) -> bool:
+    """Return whether ``executor`` runs work in other processes."""
+    process = sys.modules.get("concurrent.futures.process")
+    return process is not None and isinstance(executor, process.ProcessPoolExecutor)
+
+
+def shutdown_tool_executors(wait: bool = True) -> None:
+    """Shut down the shared pools; they are recreated on next use."""
+    global _thread_pool, _process_pool
+    with _lock:
+        pools = [p for p in (_thread_pool, _process_pool) if p is not None]
+        _thread_pool = None
+        _process_pool = None
+    for pool in pools:
+        pool.shutdown(wait=wait, cancel_futures=True)
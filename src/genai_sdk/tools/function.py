@@ -3,28 +3,59 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
+import functools
+import inspect
+import threading
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from typing import Any, Awaitable, Callable
 
 from ..errors import ToolExecutionError
 from .base import ToolContext
+from .cache import ToolCache
+from .executors import ExecutorKind, get_tool_executor, is_process_pool
 
 ToolCallable = Callable[[dict[str, Any], ToolContext], str | dict[str, Any] | Awaitable[str | dict[str, Any]]]
 
 
 @dataclass(slots=True)
 class FunctionTool:
-    """Tool implementation backed by a Python function/coroutine."""
+    """Tool implementation backed by a Python function/coroutine.
+
+    Coroutine functions run on the event loop. Synchronous callables run in
+    the shared tool thread pool by default so blocking or CPU-heavy work does
+    not stall other turns; set ``executor`` to ``"inline"`` to call them on
+    the loop, ``"process"`` to use the shared process pool (the callable,
+    arguments, and result must be picklable), or pass any
+    :class:`concurrent.futures.Executor`.
+
+    Idempotent tools can set ``cache`` to a :class:`ToolCache` to reuse
+    results for identical arguments. ``max_output_chars`` overrides the
+    agent's inline output limit for this tool.
+    """
 
     name: str
     description: str
     input_schema: dict[str, Any]
     fn: ToolCallable
+    executor: ExecutorKind | Executor | None = None
+    cache: ToolCache | None = None
+    max_output_chars: int | None = None
 
     async def call(self, args: dict[str, Any], ctx: ToolContext) -> str:
         """Invoke the user function and coerce output to a string payload."""
+        if self.cache is not None:
+            return await self.cache.get_or_call(self.name, args, ctx, lambda: self._invoke(args, ctx))
+        return await self._invoke(args, ctx)
+
+    async def _invoke(self, args: dict[str, Any], ctx: ToolContext) -> str:
         try:
-            result = self.fn(args, ctx)
+            executor = self._resolve_executor()
+            if executor is None:
+                result = self.fn(args, ctx)
+            else:
+                result = await self._run_in_executor(executor, args, ctx)
             if asyncio.iscoroutine(result):
                 result = await result
         except Exception as exc:
@@ -46,3 +77,34 @@ class FunctionTool:
                 "parameters": self.input_schema,
             },
         }
+
+    def _resolve_executor(self) -> Executor | None:
+        if isinstance(self.executor, Executor):
+            return self.executor
+        if self.executor == "inline":
+            return None
+        if self.executor is None:
+            if _is_async_callable(self.fn):
+                return None
+            return get_tool_executor("thread")
+        return get_tool_executor(self.executor)
+
+    async def _run_in_executor(self, executor: Executor, args: dict[str, Any], ctx: ToolContext) -> Any:
+        if ctx is not None and is_process_pool(executor):
+            # Events cannot cross process boundaries; processes are cancelled only before they start.
+            ctx = dataclasses.replace(ctx, cancel_event=None)
+        elif ctx is not None and ctx.cancel_event is None:
+            ctx.cancel_event = threading.Event()
+        future = asyncio.get_running_loop().run_in_executor(executor, self.fn, args, ctx)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if ctx is not None and ctx.cancel_event is not None:
+                ctx.cancel_event.set()
+            raise
+
+
+def _is_async_callable(fn: Any) -> bool:
+    while isinstance(fn, functools.partial):
+        fn = fn.func
+    return inspect.iscoroutinefunction(fn) or inspect.iscoroutinefunction(getattr(fn, "__call__", None))
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from typing import Any, Protocol
 
 from .base import ToolContext
+from .cache import ToolCache
 
 
 class MCPClient(Protocol):
@@ -26,8 +27,12 @@ class MCPBoundTool:
     description: str
     input_schema: dict[str, Any]
     client: MCPClient
+    cache: ToolCache | None = None
+    max_output_chars: int | None = None
 
     async def call(self, args: dict[str, Any], ctx: ToolContext) -> str:
+        if self.cache is not None:
+            return await self.cache.get_or_call(self.name, args, ctx, lambda: self.client.call_tool(self.name, args))
         return await self.client.call_tool(self.name, args)
 
     def to_provider_schema(self) -> dict[str, Any]:
@@ -44,8 +49,16 @@ class MCPBoundTool:
 class MCPToolset:
     """Loader that converts MCP-discovered tools into SDK-compatible tools."""
 
-    def __init__(self, client: MCPClient):
+    def __init__(self, client: MCPClient, caches: dict[str, ToolCache] | None = None):
+        """Create a loader.
+
+        Args:
+            client: MCP client used for discovery and calls.
+            caches: Optional result caches keyed by tool name, for tools
+                known to be idempotent.
+        """
         self.client = client
+        self.caches = caches or {}
 
     async def load(self) -> list[MCPBoundTool]:
         """Discover tools from MCP and return bound wrappers."""
@@ -56,6 +69,7 @@ class MCPToolset:
                 description=t.get("description", ""),
                 input_schema=t.get("input_schema", {"type": "object", "properties": {}}),
                 client=self.client,
+                cache=self.caches.get(t["name"]),
             )
             for t in tools
         ]
@@ -0,0 +1,361 @@
+"""MCP client speaking newline-delimited JSON-RPC over a subprocess's stdio."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+from typing import Any, Callable, Mapping, Sequence
+
+from ..errors import ToolExecutionError
+from .mcp import MCPClient
+
+PROTOCOL_VERSION = "2024-11-05"
+
+logger = logging.getLogger(__name__)
+
+ToolsChangedListener = Callable[[], Any]
+
+
+class StdioMCPClient:
+    """Multiplexed MCP client bound to one server subprocess.
+
+    Requests are tagged with JSON-RPC ids and written to the server's stdin;
+    a single reader task resolves the matching futures as responses arrive
+    on stdout, so any number of ``call_tool`` requests can be in flight on
+    one pipe. ``list_tools`` results are cached until the server sends
+    ``notifications/tools/list_changed``. If the server exits, pending
+    requests fail and the next request restarts it when ``restart`` is set.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        args: Sequence[str] = (),
+        env: Mapping[str, str] | None = None,
+        cwd: str | None = None,
+        request_timeout: float | None = 30.0,
+        restart: bool = True,
+        stderr: int | None = None,
+        client_name: str = "genai-sdk",
+    ):
+        """Configure the server command; the process starts on first use.
+
+        Args:
+            command: Server executable.
+            args: Server arguments.
+            env: Extra environment variables for the server.
+            cwd: Working directory for the server.
+            request_timeout: Per-request timeout in seconds, or ``None``.
+            restart: Restart the server on the next request after it exits.
+            stderr: Where server stderr goes (inherited by default).
+            client_name: Name reported in the ``initialize`` handshake.
+        """
+        self.command = command
+        self.args = list(args)
+        self.env = dict(env) if env is not None else None
+        self.cwd = cwd
+        self.request_timeout = request_timeout
+        self.restart = restart
+        self.stderr = stderr
+        self.client_name = client_name
+        self.restarts = 0
+        self.server_info: dict[str, Any] = {}
+        self._proc: asyncio.subprocess.Process | None = None
+        self._reader: asyncio.Task[None] | None = None
+        self._pending: dict[int, asyncio.Future[Any]] = {}
+        self._ids = itertools.count(1)
+        self._start_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._tools: list[dict[str, Any]] | None = None
+        self._listeners: list[ToolsChangedListener] = []
+        self._listener_tasks: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests awaiting a response."""
+        return len(self._pending)
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None and self._reader is not None
+
+    def add_tools_changed_listener(self, listener: ToolsChangedListener) -> None:
+        """Register a callback invoked when the server's tool list changes.
+
+        Each callback runs in its own task, so it may call back into the
+        client (e.g. ``list_tools``); exceptions are logged, not raised.
+        """
+        self._listeners.append(listener)
+
+    async def start(self) -> None:
+        """Start the server and complete the MCP handshake if not running."""
+        async with self._start_lock:
+            if self.running:
+                return
+            if self._closed:
+                raise ToolExecutionError("MCP client is closed")
+            if self._proc is not None:
+                if not self.restart:
+                    raise ToolExecutionError(f"MCP server {self.command!r} exited")
+                if self._proc.returncode is None:
+                    self._proc.kill()
+                await self._proc.wait()
+                self.restarts += 1
+            env = {**os.environ, **self.env} if self.env is not None else None
+            self._proc = await asyncio.create_subprocess_exec(
+                self.command,
+                *self.args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=self.stderr,
+                env=env,
+                cwd=self.cwd,
+                limit=16 * 1024 * 1024,
+            )
+            self._tools = None
+            self._reader = asyncio.get_running_loop().create_task(self._read_loop(self._proc))
+            try:
+                result = await self._send_request(
+                    "initialize",
+                    {
+                        "protocolVersion": PROTOCOL_VERSION,
+                        "capabilities": {},
+                        "clientInfo": {"name": self.client_name, "version": "0"},
+                    },
+                )
+                self.server_info = result.get("serverInfo", {}) if isinstance(result, dict) else {}
+                await self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+            except BaseException:
+                # Never leave a server that missed the handshake looking "running".
+                await self._abort_start()
+                raise
+
+    async def _abort_start(self) -> None:
+        proc, self._proc = self._proc, None
+        reader, self._reader = self._reader, None
+        if reader is not None:
+            reader.cancel()
+        if proc is not None:
+            if proc.returncode is None:
+                proc.kill()
+            await proc.wait()
+
+    async def close(self) -> None:
+        """Terminate the server and fail any pending requests."""
+        self._closed = True
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.returncode is None:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=2.0)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+        for task in list(self._listener_tasks):
+            task.cancel()
+        self._fail_pending(ToolExecutionError("MCP client closed"))
+
+    async def list_tools(self) -> list[dict[str, Any]]:
+        """Return the server's tools, following pagination, from cache if valid."""
+        if self._tools is not None and self.running:
+            return self._tools
+        tools: list[dict[str, Any]] = []
+        cursor: str | None = None
+        while True:
+            result = await self.request("tools/list", {"cursor": cursor} if cursor else {})
+            for tool in result.get("tools", []):
+                tools.append(
+                    {
+                        "name": tool["name"],
+                        "description": tool.get("description", ""),
+                        "input_schema": tool.get("inputSchema") or {"type": "object", "properties": {}},
+                    }
+                )
+            cursor = result.get("nextCursor")
+            if not cursor:
+                break
+        self._tools = tools
+        return tools
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> str:
+        """Invoke a tool and return its text content."""
+        result = await self.request("tools/call", {"name": name, "arguments": arguments})
+        return _content_text(result)
+
+    async def request(self, method: str, params: dict[str, Any] | None = None) -> Any:
+        """Send a JSON-RPC request, starting or restarting the server if needed."""
+        if not self.running:
+            await self.start()
+        return await self._send_request(method, params)
+
+    async def _send_request(self, method: str, params: dict[str, Any] | None) -> Any:
+        request_id = next(self._ids)
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message: dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        try:
+            await self._send(message)
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.request_timeout)
+        except asyncio.TimeoutError as exc:
+            await self._cancel_remote(request_id, "timeout")
+            raise ToolExecutionError(f"MCP request {method} timed out") from exc
+        except asyncio.CancelledError:
+            await asyncio.shield(self._cancel_remote(request_id, "cancelled"))
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _cancel_remote(self, request_id: int, reason: str) -> None:
+        if self._pending.pop(request_id, None) is None or not self.running:
+            return
+        try:
+            await self._send(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "notifications/cancelled",
+                    "params": {"requestId": request_id, "reason": reason},
+                }
+            )
+        except ToolExecutionError:
+            pass
+
+    async def _send(self, message: dict[str, Any]) -> None:
+        proc = self._proc
+        if proc is None or proc.stdin is None:
+            raise ToolExecutionError("MCP server is not running")
+        data = json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+        async with self._write_lock:
+            try:
+                proc.stdin.write(data)
+                await proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as exc:
+                raise ToolExecutionError(f"MCP server {self.command!r} is not accepting input") from exc
+
+    async def _read_loop(self, proc: asyncio.subprocess.Process) -> None:
+        assert proc.stdout is not None
+        try:
+            while True:
+                line = await proc.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(message, dict):
+                    await self._dispatch(message)
+        finally:
+            if self._proc is proc:
+                self._reader = None
+            self._fail_pending(ToolExecutionError(f"MCP server {self.command!r} exited"))
+
+    async def _dispatch(self, message: dict[str, Any]) -> None:
+        method = message.get("method")
+        if method is None:
+            future = self._pending.get(message.get("id"))  # type: ignore[arg-type]
+            if future is None or future.done():
+                return
+            if "error" in message:
+                error = message["error"] or {}
+                future.set_exception(ToolExecutionError(f"MCP error {error.get('code')}: {error.get('message')}"))
+            else:
+                future.set_result(message.get("result"))
+            return
+
+        if method == "notifications/tools/list_changed":
+            self._tools = None
+            # Callbacks run outside the reader task so they cannot stall or kill it.
+            for listener in list(self._listeners):
+                task = asyncio.get_running_loop().create_task(self._notify(listener))
+                self._listener_tasks.add(task)
+                task.add_done_callback(self._listener_tasks.discard)
+        elif "id" in message:
+            # Server-to-client request: answer pings, reject everything else.
+            if method == "ping":
+                reply: dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+            else:
+                reply = {
+                    "jsonrpc": "2.0",
+                    "id": message["id"],
+                    "error": {"code": -32601, "message": f"Method not found: {method}"},
+                }
+            try:
+                await self._send(reply)
+            except ToolExecutionError:
+                pass
+
+    async def _notify(self, listener: ToolsChangedListener) -> None:
+        try:
+            outcome = listener()
+            if asyncio.iscoroutine(outcome):
+                await outcome
+        except Exception:
+            logger.exception("MCP tools_changed listener %r failed", listener)
+
+    def _fail_pending(self, exc: Exception) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self._pending.clear()
+
+
+class MCPClientPool:
+    """Spread MCP calls over several server processes.
+
+    Useful for CPU-bound servers that handle one request at a time. Calls go
+    to the client with the fewest requests in flight; tool discovery uses
+    the first client.
+    """
+
+    def __init__(self, factory: Callable[[], MCPClient], size: int = 2):
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self.clients = [factory() for _ in range(size)]
+        self._load = [0] * size
+
+    async def list_tools(self) -> list[dict[str, Any]]:
+        return await self.clients[0].list_tools()
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> str:
+        index = min(range(len(self.clients)), key=self._load.__getitem__)
+        self._load[index] += 1
+        try:
+            return await self.clients[index].call_tool(name, arguments)
+        finally:
+            self._load[index] -= 1
+
+    def add_tools_changed_listener(self, listener: ToolsChangedListener) -> None:
+        add = getattr(self.clients[0], "add_tools_changed_listener", None)
+        if add is not None:
+            add(listener)
+
+    async def close(self) -> None:
+        for client in self.clients:
+            close = getattr(client, "close", None)
+            if close is not None:
+                await close()
+
+
+def _content_text(result: Any) -> str:
+    if not isinstance(result, dict):
+        return "" if result is None else str(result)
+    parts = []
+    for item in result.get("content", []):
+        if item.get("type") == "text":
+            parts.append(item.get("text", ""))
+        else:
+            parts.append(json.dumps(item))
+    text = "\n".join(parts)
+    if result.get("isError"):
+        return f"Error: {text}"
+    return text
@@ -0,0 +1,121 @@
+"""Lexical relevance routing for agents with large tool catalogs."""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections import Counter
+from typing import Any, Iterable, Sequence
+
+from .base import Tool, ToolContext
+from .function import FunctionTool
+
+FIND_TOOLS_TOOL = "find_tools"
+_TOKEN = re.compile(r"[a-z0-9]+")
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+class ToolRouter:
+    """Rank tools against the current input and return the most relevant ones.
+
+    Each tool is indexed by the words in its name, description, and input
+    schema (property names and descriptions). Queries are scored with a
+    BM25-style sum over shared terms, so no embedding calls are needed.
+    """
+
+    def __init__(self, tools: Sequence[Tool], pinned: Iterable[str] = (), k1: float = 1.2, b: float = 0.75):
+        self.tools = list(tools)
+        self.pinned = [t for t in self.tools if t.name in set(pinned)]
+        self.k1 = k1
+        self.b = b
+        self._docs = [Counter(_tool_terms(t)) for t in self.tools]
+        self._lengths = [sum(doc.values()) for doc in self._docs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        df: Counter[str] = Counter()
+        for doc in self._docs:
+            df.update(doc.keys())
+        n = len(self._docs)
+        self._idf = {term: math.log(1 + (n - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+
+    def scores(self, query: str) -> list[float]:
+        """Return one relevance score per indexed tool."""
+        terms = set(_tokenize(query))
+        out = []
+        for doc, length in zip(self._docs, self._lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length) if self._avg_length else self.k1
+            for term in terms:
+                tf = doc.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            out.append(score)
+        return out
+
+    def select(self, query: str, top_n: int) -> list[Tool]:
+        """Return pinned tools plus the ``top_n`` best-matching others.
+
+        Tools with no term overlap are never selected, so small-talk turns
+        only carry the pinned set.
+        """
+        pinned = {t.name for t in self.pinned}
+        ranked = sorted(
+            (
+                (score, i)
+                for i, score in enumerate(self.scores(query))
+                if score > 0 and self.tools[i].name not in pinned
+            ),
+            key=lambda x: (-x[0], x[1]),
+        )
+        return self.pinned + [self.tools[i] for _, i in ranked[:top_n]]
+
+
+def make_tool_finder_tool(router: ToolRouter, top_n: int) -> FunctionTool:
+    """Build the tool the model calls when none of the offered tools fits.
+
+    It returns the names of the best matches for the stated need; the agent
+    offers those tools from the next model call on.
+    """
+
+    def find_tools(args: dict[str, Any], ctx: ToolContext) -> str:
+        need = args.get("need")
+        if not isinstance(need, str) or not need.strip():
+            return json.dumps({"error": "missing_need", "message": 'Describe the missing capability in "need".'})
+        pinned = {t.name for t in router.pinned}
+        names = [t.name for t in router.select(need, top_n) if t.name not in pinned]
+        if not names:
+            return json.dumps({"tools": [], "message": "No matching tools."})
+        return json.dumps({"tools": names, "message": "These tools are now available."})
+
+    return FunctionTool(
+        name=FIND_TOOLS_TOOL,
+        description="Find more tools when none of the available tools can do what is needed.",
+        input_schema={
+            "type": "object",
+            "properties": {"need": {"type": "string", "description": "The capability that is missing."}},
+            "required": ["need"],
+        },
+        fn=find_tools,
+    )
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(_CAMEL.sub(" ", text).lower())
+
+
+def _tool_terms(tool: Tool) -> list[str]:
+    terms = _tokenize(tool.name.replace("_", " ").replace("-", " "))
+    terms += _tokenize(tool.description or "")
+    terms += _schema_terms(tool.input_schema or {})
+    return terms
+
+
+def _schema_terms(schema: dict[str, Any]) -> list[str]:
+    terms: list[str] = []
+    for name, prop in (schema.get("properties") or {}).items():
+        terms += _tokenize(name.replace("_", " "))
+        if isinstance(prop, dict):
+            terms += _tokenize(str(prop.get("description", "")))
+            if prop.get("type") == "object":
+                terms += _schema_terms(prop)
+    return terms
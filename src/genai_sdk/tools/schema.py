@@ -0,0 +1,250 @@
+"""Compile tool ``input_schema`` definitions into fast argument validators."""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable
+
+Validator = Callable[[Any, str, list[str]], None]
+
+_TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+    or (isinstance(v, float) and v.is_integer()),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+}
+
+
+class SchemaValidator:
+    """Validator compiled once from a JSON schema.
+
+    Supports the subset of JSON Schema used for tool parameters: ``type``,
+    ``enum``, ``const``, ``properties``, ``required``,
+    ``additionalProperties``, ``items``, string/array length bounds,
+    numeric bounds, ``pattern``, and ``anyOf``/``oneOf``/``allOf``. Unknown
+    keywords (including ``$ref``) are ignored rather than rejected.
+    """
+
+    __slots__ = ("schema", "_validate")
+
+    def __init__(self, schema: dict[str, Any]):
+        self.schema = schema
+        self._validate = _compile(schema or {})
+
+    def errors(self, value: Any) -> list[str]:
+        """Return human-readable errors; an empty list means valid."""
+        out: list[str] = []
+        self._validate(value, "$", out)
+        return out
+
+
+def compile_schema(schema: dict[str, Any]) -> SchemaValidator:
+    """Compile ``schema`` into a reusable :class:`SchemaValidator`."""
+    return SchemaValidator(schema)
+
+
+def _compile(schema: Any) -> Validator:
+    if schema is False:
+        return _reject
+    if not isinstance(schema, dict):
+        return _accept
+
+    checks: list[Validator] = []
+
+    types = schema.get("type")
+    if types is not None:
+        names = [types] if isinstance(types, str) else list(types)
+        tests = [_TYPE_CHECKS[t] for t in names if t in _TYPE_CHECKS]
+        if tests:
+            expected = " or ".join(names)
+
+            def check_type(v: Any, path: str, out: list[str]) -> None:
+                if not any(test(v) for test in tests):
+                    out.append(f"{path}: expected {expected}, got {_type_name(v)}")
+
+            checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(v: Any, path: str, out: list[str]) -> None:
+            if v not in allowed:
+                out.append(f"{path}: must be one of {allowed}")
+
+        checks.append(check_enum)
+
+    if "const" in schema:
+        const = schema["const"]
+
+        def check_const(v: Any, path: str, out: list[str]) -> None:
+            if v != const:
+                out.append(f"{path}: must equal {const!r}")
+
+        checks.append(check_const)
+
+    checks.extend(_compile_object(schema))
+    checks.extend(_compile_array(schema))
+    checks.extend(_compile_string(schema))
+    checks.extend(_compile_number(schema))
+    checks.extend(_compile_combinators(schema))
+
+    if not checks:
+        return _accept
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate(v: Any, path: str, out: list[str]) -> None:
+        for check in checks:
+            check(v, path, out)
+
+    return validate
+
+
+def _compile_object(schema: dict[str, Any]) -> list[Validator]:
+    checks: list[Validator] = []
+    properties = {name: _compile(sub) for name, sub in (schema.get("properties") or {}).items()}
+    required = list(schema.get("required") or [])
+    additional = schema.get("additionalProperties", True)
+    additional_check = None if additional is True else _compile(additional)
+
+    if required:
+
+        def check_required(v: Any, path: str, out: list[str]) -> None:
+            if isinstance(v, dict):
+                for name in required:
+                    if name not in v:
+                        out.append(f"{path}: missing required property {name!r}")
+
+        checks.append(check_required)
+
+    if properties or additional_check is not None:
+
+        def check_properties(v: Any, path: str, out: list[str]) -> None:
+            if not isinstance(v, dict):
+                return
+            for name, item in v.items():
+                sub = properties.get(name)
+                if sub is not None:
+                    sub(item, f"{path}.{name}", out)
+                elif additional is False:
+                    out.append(f"{path}: unexpected property {name!r}")
+                elif additional_check is not None:
+                    additional_check(item, f"{path}.{name}", out)
+
+        checks.append(check_properties)
+    return checks
+
+
+def _compile_array(schema: dict[str, Any]) -> list[Validator]:
+    checks: list[Validator] = []
+    if isinstance(schema.get("items"), dict):
+        item_check = _compile(schema["items"])
+
+        def check_items(v: Any, path: str, out: list[str]) -> None:
+            if isinstance(v, list):
+                for i, item in enumerate(v):
+                    item_check(item, f"{path}[{i}]", out)
+
+        checks.append(check_items)
+    min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+    if min_items is not None or max_items is not None:
+
+        def check_length(v: Any, path: str, out: list[str]) -> None:
+            if isinstance(v, list):
+                if min_items is not None and len(v) < min_items:
+                    out.append(f"{path}: expected at least {min_items} items")
+                if max_items is not None and len(v) > max_items:
+                    out.append(f"{path}: expected at most {max_items} items")
+
+        checks.append(check_length)
+    return checks
+
+
+def _compile_string(schema: dict[str, Any]) -> list[Validator]:
+    checks: list[Validator] = []
+    min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+    if min_length is not None or max_length is not None:
+
+        def check_length(v: Any, path: str, out: list[str]) -> None:
+            if isinstance(v, str):
+                if min_length is not None and len(v) < min_length:
+                    out.append(f"{path}: expected at least {min_length} characters")
+                if max_length is not None and len(v) > max_length:
+                    out.append(f"{path}: expected at most {max_length} characters")
+
+        checks.append(check_length)
+    if "pattern" in schema:
+        pattern = re.compile(schema["pattern"])
+
+        def check_pattern(v: Any, path: str, out: list[str]) -> None:
+            if isinstance(v, str) and not pattern.search(v):
+                out.append(f"{path}: does not match pattern {pattern.pattern!r}")
+
+        checks.append(check_pattern)
+    return checks
+
+
+def _compile_number(schema: dict[str, Any]) -> list[Validator]:
+    bounds = [
+        (schema.get("minimum"), lambda v, b: v >= b, "minimum"),
+        (schema.get("maximum"), lambda v, b: v <= b, "maximum"),
+        (schema.get("exclusiveMinimum"), lambda v, b: v > b, "exclusiveMinimum"),
+        (schema.get("exclusiveMaximum"), lambda v, b: v < b, "exclusiveMaximum"),
+    ]
+    active = [(b, test, name) for b, test, name in bounds if isinstance(b, (int, float)) and not isinstance(b, bool)]
+    if not active:
+        return []
+
+    def check_bounds(v: Any, path: str, out: list[str]) -> None:
+        if isinstance(v, (int, float)) and not isinstance(v, bool):
+            for bound, test, name in active:
+                if not test(v, bound):
+                    out.append(f"{path}: violates {name} {bound}")
+
+    return [check_bounds]
+
+
+def _compile_combinators(schema: dict[str, Any]) -> list[Validator]:
+    checks: list[Validator] = []
+    for keyword in ("anyOf", "oneOf", "allOf"):
+        options = schema.get(keyword)
+        if not isinstance(options, list) or not options:
+            continue
+        compiled = [_compile(option) for option in options]
+
+        def check(v: Any, path: str, out: list[str], keyword: str = keyword, compiled: list[Validator] = compiled) -> None:
+            results = []
+            for option in compiled:
+                errors: list[str] = []
+                option(v, path, errors)
+                results.append(errors)
+            passing = sum(1 for errors in results if not errors)
+            if keyword == "allOf":
+                for errors in results:
+                    out.extend(errors)
+            elif keyword == "anyOf" and passing == 0:
+                out.append(f"{path}: does not match any allowed schema")
+            elif keyword == "oneOf" and passing != 1:
+                out.append(f"{path}: must match exactly one schema, matched {passing}")
+
+        checks.append(check)
+    return checks
+
+
+def _accept(v: Any, path: str, out: list[str]) -> None:
+    return None
+
+
+def _reject(v: Any, path: str, out: list[str]) -> None:
+    out.append(f"{path}: no value is allowed here")
+
+
+def _type_name(v: Any) -> str:
+    for name in ("null", "boolean", "integer", "number", "string", "array", "object"):
+        if _TYPE_CHECKS[name](v):
+            return name
+    return type(v).__name__
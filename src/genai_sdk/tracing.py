@@ -0,0 +1,129 @@
+"""Lightweight span hooks for timing agent runs.
+
+The :class:`Tracer` protocol matches the subset of the OpenTelemetry tracer
+API the agent uses, so an ``opentelemetry.trace.get_tracer(...)`` instance can
+be passed directly. :class:`RecordingTracer` keeps spans in memory for tests
+and local profiling without any external service.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Protocol
+
+from .types import TimingBreakdown
+
+
+class Span(Protocol):
+    def set_attribute(self, key: str, value: Any) -> None:
+        ...
+
+
+class Tracer(Protocol):
+    def start_as_current_span(
+        self, name: str, context: Any = None, kind: Any = None, attributes: dict[str, Any] | None = None
+    ) -> AbstractContextManager[Span]:
+        ...
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class NoopTracer:
+    """Tracer that records nothing; the default for :class:`~genai_sdk.agent.Agent`."""
+
+    def start_as_current_span(
+        self, name: str, context: Any = None, kind: Any = None, attributes: dict[str, Any] | None = None
+    ) -> _NoopSpan:
+        return _NOOP_SPAN
+
+
+@dataclass(slots=True)
+class SpanRecord:
+    """A finished span captured by :class:`RecordingTracer`."""
+
+    name: str
+    start: float
+    end: float = 0.0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    parent: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+_current: contextvars.ContextVar[SpanRecord | None] = contextvars.ContextVar("genai_sdk_span", default=None)
+
+
+class RecordingTracer:
+    """In-process tracer that keeps finished spans in :attr:`spans`."""
+
+    def __init__(self) -> None:
+        self.spans: list[SpanRecord] = []
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, context: Any = None, kind: Any = None, attributes: dict[str, Any] | None = None
+    ) -> Iterator[SpanRecord]:
+        parent = _current.get()
+        span = SpanRecord(
+            name=name,
+            start=time.perf_counter(),
+            attributes=dict(attributes or {}),
+            parent=parent.name if parent else None,
+        )
+        token = _current.set(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            _current.reset(token)
+            self.spans.append(span)
+
+    def named(self, name: str) -> list[SpanRecord]:
+        """Return finished spans called ``name``."""
+        return [s for s in self.spans if s.name == name]
+
+
+class RunTimer:
+    """Times the phases of one agent run and mirrors them as tracer spans."""
+
+    __slots__ = ("tracer", "timings", "_enabled")
+
+    def __init__(self, tracer: Tracer, timings: TimingBreakdown):
+        self.tracer = tracer
+        self.timings = timings
+        self._enabled = not isinstance(tracer, NoopTracer)
+
+    @contextmanager
+    def phase(self, name: str, call: str | None = None, **attributes: Any) -> Iterator[Span]:
+        """Time ``name`` into the breakdown; ``call`` also records a per-call entry."""
+        span_cm = (
+            self.tracer.start_as_current_span(f"genai.{name}", attributes=attributes) if self._enabled else _NOOP_SPAN
+        )
+        started = time.perf_counter()
+        with span_cm as span:
+            try:
+                yield span
+            finally:
+                self.timings.add(name, (time.perf_counter() - started) * 1000, call)
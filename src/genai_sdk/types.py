@@ -12,7 +12,12 @@ Role = Literal["system", "user", "assistant", "tool"]
 
 @dataclass(slots=True)
 class Message:
-    """One chat turn exchanged between user, assistant, system, or tool."""
+    """One chat turn exchanged between user, assistant, system, or tool.
+
+    ``token_cache`` and ``payload_cache`` hold derived token counts and
+    provider encodings; they are keyed on the fields they were derived from
+    and are not part of equality.
+    """
 
     role: Role
     content: str
@@ -20,15 +25,22 @@ class Message:
     tool_call_id: str | None = None
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     metadata: dict[str, Any] = field(default_factory=dict)
+    token_cache: tuple[tuple[Any, ...], int] | None = field(default=None, init=False, repr=False, compare=False)
+    payload_cache: tuple[tuple[Any, ...], bytes] | None = field(default=None, init=False, repr=False, compare=False)
 
 
 @dataclass(slots=True)
 class ToolCall:
-    """A model request to execute a named tool with arguments."""
+    """A model request to execute a named tool with arguments.
+
+    ``arguments_error`` is set when the provider could not decode the
+    model's arguments into a JSON object.
+    """
 
     name: str
     arguments: dict[str, Any]
     call_id: str
+    arguments_error: str | None = None
 
 
 @dataclass(slots=True)
@@ -48,6 +60,46 @@ class Usage:
     input_tokens: int | None = None
     output_tokens: int | None = None
     total_tokens: int | None = None
+    cached_input_tokens: int | None = None
+
+    def add(self, other: "Usage") -> "Usage":
+        """Return the field-wise sum of two usages, keeping ``None`` where both are unknown."""
+
+        def _sum(a: int | None, b: int | None) -> int | None:
+            return None if a is None and b is None else (a or 0) + (b or 0)
+
+        return Usage(
+            input_tokens=_sum(self.input_tokens, other.input_tokens),
+            output_tokens=_sum(self.output_tokens, other.output_tokens),
+            total_tokens=_sum(self.total_tokens, other.total_tokens),
+            cached_input_tokens=_sum(self.cached_input_tokens, other.cached_input_tokens),
+        )
+
+
+@dataclass(slots=True)
+class CallTiming:
+    """Duration of one provider or tool call within a run."""
+
+    phase: str
+    name: str
+    duration_ms: float
+
+
+@dataclass(slots=True)
+class TimingBreakdown:
+    """Per-phase wall-clock totals (milliseconds) for one agent run.
+
+    Tool calls dispatched concurrently overlap, so phase totals can exceed
+    the run's ``latency_ms``.
+    """
+
+    phases: dict[str, float] = field(default_factory=dict)
+    calls: list[CallTiming] = field(default_factory=list)
+
+    def add(self, phase: str, duration_ms: float, call: str | None = None) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration_ms
+        if call is not None:
+            self.calls.append(CallTiming(phase=phase, name=call, duration_ms=duration_ms))
 
 
 @dataclass(slots=True)
@@ -61,3 +113,6 @@ class AgentResult:
     latency_ms: int = 0
     session_id: str | None = None
     citations: list[dict[str, Any]] = field(default_factory=list)
+    tool_results: list[ToolResult] = field(default_factory=list)
+    timings: TimingBreakdown = field(default_factory=TimingBreakdown)
+    stop_reason: str = "completed"
@@ -0,0 +1,28 @@
+"""Provider fakes shared by the agent tests."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+from genai_sdk.providers.base import Provider, ProviderRequest, ProviderResponse
+
+
+class ScriptedProvider(Provider):
+    """Answer with queued responses in order, then ``default``.
+
+    Each request is recorded with a copy of its message list, because the
+    agent keeps appending to the list it sent.
+    """
+
+    def __init__(self, responses=(), default: ProviderResponse | None = None):
+        self.responses = list(responses)
+        self.default = default
+        self.requests: list[ProviderRequest] = []
+
+    async def generate(self, request: ProviderRequest) -> ProviderResponse:
+        self.requests.append(replace(request, messages=list(request.messages)))
+        if self.responses:
+            return self.responses.pop(0)
+        if self.default is None:
+            raise AssertionError("No scripted response left")
+        return self.default
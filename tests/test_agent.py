@@ -1,13 +1,19 @@
 import asyncio
 import json
+import time
 import unittest
 
 from genai_sdk.agent import Agent
 from genai_sdk.config import AgentConfig, ModelConfig
-from genai_sdk.providers.base import Provider, ProviderRequest, ProviderResponse
+from genai_sdk.errors import DeadlineExceededError
+from genai_sdk.providers.base import Provider, ProviderEvent, ProviderRequest, ProviderResponse
+from genai_sdk.tools.cache import ToolCache
 from genai_sdk.tools.function import FunctionTool
+from genai_sdk.tracing import RecordingTracer
 from genai_sdk.types import ToolCall, Usage
 
+from fakes import ScriptedProvider
+
 
 class FakeProvider(Provider):
     def __init__(self):
@@ -71,3 +77,362 @@ class TestAgent(unittest.TestCase):
             self.assertEqual(result.session_id, "s1")
 
         asyncio.run(_run())
+
+
+class TestTracing(unittest.TestCase):
+    def test_run_reports_phase_timings_spans_and_accumulated_usage(self) -> None:
+        async def _run() -> None:
+            async def echo(args, ctx):
+                return args["text"]
+
+            tool = FunctionTool(
+                name="echo",
+                description="Echo input text",
+                input_schema={"type": "object", "properties": {"text": {"type": "string"}}},
+                fn=echo,
+            )
+            tracer = RecordingTracer()
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="gpt-test")),
+                provider=FakeProvider(),
+                tools=[tool],
+                tracer=tracer,
+            )
+            result = await agent.run("hi")
+
+            self.assertEqual(result.usage.total_tokens, 30)
+            for phase in ("memory_load", "context", "model", "tool", "persistence", "agent.run"):
+                self.assertIn(phase, result.timings.phases)
+            calls = [(c.phase, c.name) for c in result.timings.calls]
+            self.assertEqual(calls, [("model", "gpt-test"), ("tool", "echo"), ("model", "gpt-test")])
+            self.assertEqual(len(tracer.named("genai.model")), 2)
+            (tool_span,) = tracer.named("genai.tool")
+            self.assertEqual(tool_span.attributes["tool"], "echo")
+            self.assertEqual(tool_span.parent, "genai.agent.run")
+
+            untraced = await Agent(config=AgentConfig(model=ModelConfig(model="m")), provider=FakeProvider()).run("hi")
+            self.assertIn("model", untraced.timings.phases)
+
+        asyncio.run(_run())
+
+    def test_attributes_are_passed_by_keyword_like_opentelemetry(self) -> None:
+        class OTelStyleTracer(RecordingTracer):
+            # OpenTelemetry takes ``context`` and ``kind`` before ``attributes``.
+            def start_as_current_span(self, name, context=None, kind=None, attributes=None, links=None):
+                assert context is None and kind is None
+                return super().start_as_current_span(name, attributes=attributes)
+
+        async def _run() -> None:
+            tracer = OTelStyleTracer()
+            agent = Agent(config=AgentConfig(model=ModelConfig(model="gpt-test")), provider=FakeProvider(), tracer=tracer)
+            await agent.run("hi")
+            await agent.run("hi", session_id="s1")
+            self.assertEqual(tracer.named("genai.agent.run")[-1].attributes, {"session_id": "s1"})
+
+        asyncio.run(_run())
+
+
+def _tool(name: str, description: str) -> FunctionTool:
+    async def fn(args, ctx):
+        return name
+
+    return FunctionTool(name=name, description=description, input_schema={"type": "object", "properties": {}}, fn=fn)
+
+
+class TestToolRouting(unittest.TestCase):
+    def test_routes_relevant_tools_and_widens_when_the_model_asks(self) -> None:
+        async def _run() -> None:
+            tools = [
+                _tool("get_weather", "Current weather forecast for a city"),
+                _tool("get_stock_price", "Latest stock price for a ticker"),
+                _tool("send_email", "Send an email message"),
+                _tool("help", "List capabilities"),
+            ]
+            provider = ScriptedProvider(
+                [
+                    ProviderResponse(
+                        content="",
+                        tool_calls=[ToolCall(name="find_tools", arguments={"need": "send an email"}, call_id="c1")],
+                    ),
+                    ProviderResponse(content="", tool_calls=[ToolCall(name="send_email", arguments={}, call_id="c2")]),
+                    ProviderResponse(content="done"),
+                ]
+            )
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="m"), tool_routing_top_n=1, pinned_tools=["help"]),
+                provider=provider,
+                tools=tools,
+            )
+
+            result = await agent.run("what is the weather forecast in Paris? Let Bob know.")
+            offered = [[t["function"]["name"] for t in r.tools] for r in provider.requests]
+            self.assertEqual(offered[0], ["help", "find_tools", "get_weather"])
+            self.assertEqual(offered[1], ["help", "find_tools", "get_weather", "send_email"])
+            self.assertEqual(json.loads(result.tool_results[0].output)["tools"], ["send_email"])
+            self.assertEqual(result.tool_results[1].output, "send_email")
+            self.assertEqual(result.output_text, "done")
+
+        asyncio.run(_run())
+
+    def test_find_tools_without_a_need_returns_a_tool_error(self) -> None:
+        async def _run() -> None:
+            tools = [_tool("get_weather", "Current weather forecast for a city"), _tool("send_email", "Send an email")]
+            provider = ScriptedProvider(
+                [
+                    ProviderResponse(content="", tool_calls=[ToolCall(name="find_tools", arguments={}, call_id="c1")]),
+                    ProviderResponse(content="done"),
+                ]
+            )
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="m"), tool_routing_top_n=1, validate_tool_arguments=False),
+                provider=provider,
+                tools=tools,
+            )
+
+            result = await agent.run("what is the weather in Paris?")
+            offered = [[t["function"]["name"] for t in r.tools] for r in provider.requests]
+            self.assertEqual(offered[0], offered[1])
+            self.assertEqual(json.loads(result.tool_results[0].output)["error"], "missing_need")
+            self.assertEqual(result.output_text, "done")
+
+        asyncio.run(_run())
+
+
+class LoopingProvider(Provider):
+    def __init__(self, calls_per_turn=1, tokens=100):
+        self.calls_per_turn = calls_per_turn
+        self.tokens = tokens
+        self.requests: list[ProviderRequest] = []
+
+    async def generate(self, request: ProviderRequest) -> ProviderResponse:
+        self.requests.append(request)
+        n = len(self.requests)
+        if not request.tools:
+            return ProviderResponse(content="final", usage=Usage(total_tokens=self.tokens))
+        calls = [ToolCall(name="noop", arguments={}, call_id=f"c{n}-{i}") for i in range(self.calls_per_turn)]
+        return ProviderResponse(content="", tool_calls=calls, usage=Usage(total_tokens=self.tokens))
+
+
+class TestRunBudgets(unittest.TestCase):
+    def test_tool_call_budget_forces_final_answer(self) -> None:
+        async def _run() -> None:
+            provider = LoopingProvider(calls_per_turn=2)
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="m"), max_tool_calls=3, max_tool_iterations=10),
+                provider=provider,
+                tools=[_tool("noop", "Does nothing")],
+            )
+            result = await agent.run("loop")
+            self.assertEqual(result.stop_reason, "tool_call_budget")
+            self.assertEqual(result.output_text, "final")
+            self.assertEqual(sum(1 for r in result.tool_results if not r.metadata.get("skipped")), 3)
+            self.assertEqual(len(provider.requests), 3)
+            self.assertEqual(provider.requests[-1].tools, [])
+
+        asyncio.run(_run())
+
+    def test_token_budget_and_iteration_limit(self) -> None:
+        async def _run() -> None:
+            provider = LoopingProvider(tokens=100)
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="m"), max_run_tokens=250),
+                provider=provider,
+                tools=[_tool("noop", "Does nothing")],
+            )
+            result = await agent.run("loop")
+            self.assertEqual(result.stop_reason, "token_budget")
+            self.assertEqual(result.usage.total_tokens, 400)
+            self.assertEqual(result.output_text, "final")
+
+            provider = LoopingProvider()
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="m"), max_tool_iterations=2),
+                provider=provider,
+                tools=[_tool("noop", "Does nothing")],
+            )
+            result = await agent.run("loop")
+            self.assertEqual(result.stop_reason, "max_tool_iterations")
+            self.assertEqual(len(provider.requests), 3)
+            self.assertEqual(result.output_text, "final")
+
+        asyncio.run(_run())
+
+    def test_time_budget_skips_a_slow_final_call(self) -> None:
+        class SlowFinalProvider(LoopingProvider):
+            async def generate(self, request: ProviderRequest) -> ProviderResponse:
+                if not request.tools:
+                    await asyncio.sleep(1.0)
+                return await super().generate(request)
+
+        async def _run() -> None:
+            async def slow(args, ctx):
+                await asyncio.sleep(0.1)
+                return "done"
+
+            provider = SlowFinalProvider()
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="m"), max_run_seconds=0.05),
+                provider=provider,
+                tools=[FunctionTool(name="noop", description="Slow", input_schema={"type": "object"}, fn=slow)],
+            )
+            started = time.perf_counter()
+            result = await agent.run("loop")
+            self.assertLess(time.perf_counter() - started, 0.5)
+            self.assertEqual(result.stop_reason, "time_budget")
+            self.assertEqual(len(provider.requests), 1)
+            self.assertEqual(result.output_text, "")
+            self.assertEqual(result.tool_results[0].output, "done")
+
+            structured = await agent.run("loop", session_id="timed", response_model=Out)
+            self.assertEqual(structured.stop_reason, "time_budget")
+            self.assertEqual(structured.output_text, "")
+            self.assertEqual(await agent.memory.load("timed"), [])
+
+        asyncio.run(_run())
+
+    def test_zero_tool_iterations_still_offers_tools_once(self) -> None:
+        async def _run() -> None:
+            provider = LoopingProvider()
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="m"), max_tool_iterations=0),
+                provider=provider,
+                tools=[_tool("noop", "Does nothing")],
+            )
+            result = await agent.run("loop")
+            self.assertEqual(result.stop_reason, "completed")
+            self.assertEqual(len(provider.requests), 1)
+            self.assertEqual(len(provider.requests[0].tools), 1)
+            self.assertEqual(result.tool_results[0].output, "noop")
+
+        asyncio.run(_run())
+
+
+class TestDeadlines(unittest.TestCase):
+    def test_deadline_cancels_slow_tools_and_bounds_provider_calls(self) -> None:
+        async def _run() -> None:
+            stopped = []
+
+            def slow(args, ctx):
+                ctx.cancel_event.wait(5)
+                stopped.append(ctx.cancel_event.is_set())
+                return "late"
+
+            provider = LoopingProvider()
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="m")),
+                provider=provider,
+                tools=[FunctionTool(name="noop", description="Slow", input_schema={"type": "object"}, fn=slow)],
+            )
+            started = time.perf_counter()
+            with self.assertRaises(DeadlineExceededError):
+                await agent.run("loop", timeout=0.2)
+            self.assertLess(time.perf_counter() - started, 1.0)
+            self.assertLessEqual(provider.requests[0].timeout, 0.2)
+            for _ in range(50):
+                if stopped:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(stopped, [True])
+
+        asyncio.run(_run())
+
+
+class TestToolCaching(unittest.TestCase):
+    def test_cache_hits_are_reported_in_tool_results(self) -> None:
+        async def _run() -> None:
+            async def price(args, ctx):
+                return "42"
+
+            tool = FunctionTool(name="price", description="", input_schema={}, fn=price, cache=ToolCache())
+            call = ToolCall(name="price", arguments={"sku": "a"}, call_id="c1")
+            provider = ScriptedProvider(
+                [
+                    ProviderResponse(content="", tool_calls=[call]),
+                    ProviderResponse(content="", tool_calls=[ToolCall(name="price", arguments={"sku": "a"}, call_id="c2")]),
+                    ProviderResponse(content="done"),
+                ]
+            )
+            agent = Agent(config=AgentConfig(model=ModelConfig(model="m")), provider=provider, tools=[tool])
+
+            result = await agent.run("price?")
+            self.assertEqual([r.metadata["cache"] for r in result.tool_results], ["miss", "hit"])
+            self.assertEqual([r.output for r in result.tool_results], ["42", "42"])
+
+        asyncio.run(_run())
+
+
+class TestToolArgumentValidation(unittest.TestCase):
+    def test_invalid_arguments_are_returned_to_model_without_running_tool(self) -> None:
+        async def _run() -> None:
+            ran = []
+
+            async def echo(args, ctx):
+                ran.append(args)
+                return args["text"]
+
+            tool = FunctionTool(
+                name="echo",
+                description="",
+                input_schema={"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]},
+                fn=echo,
+            )
+            provider = ScriptedProvider(
+                [
+                    ProviderResponse(content="", tool_calls=[ToolCall(name="echo", arguments={"text": 5}, call_id="c1")]),
+                    ProviderResponse(content="done"),
+                ]
+            )
+            agent = Agent(config=AgentConfig(model=ModelConfig(model="m")), provider=provider, tools=[tool])
+
+            result = await agent.run("hi")
+            self.assertEqual(ran, [])
+            error = json.loads(result.tool_results[0].output)
+            self.assertEqual(error["error"], "invalid_arguments")
+            self.assertEqual(error["details"], ["$.text: expected string, got integer"])
+            self.assertIn("validation_us", result.tool_results[0].metadata)
+
+        asyncio.run(_run())
+
+
+class StreamingProvider(Provider):
+    def __init__(self):
+        self.calls = 0
+        self.finished_at: float | None = None
+
+    async def stream(self, request: ProviderRequest):
+        self.calls += 1
+        if self.calls == 1:
+            yield ProviderEvent(type="tool_call", data=ToolCall(name="slow", arguments={}, call_id="c1"))
+            await asyncio.sleep(0.05)
+            yield ProviderEvent(type="tool_call", data=ToolCall(name="slow", arguments={}, call_id="c2"))
+            self.finished_at = time.perf_counter()
+            yield ProviderEvent(type="done", data=Usage(total_tokens=5))
+        else:
+            yield ProviderEvent(type="content", data="all ")
+            yield ProviderEvent(type="content", data="done")
+            yield ProviderEvent(type="done", data=Usage(total_tokens=7))
+
+
+class TestStreamingToolDispatch(unittest.TestCase):
+    def test_tools_start_before_stream_completes(self) -> None:
+        async def _run() -> None:
+            started: list[float] = []
+
+            async def slow(args, ctx):
+                started.append(time.perf_counter())
+                await asyncio.sleep(0.05)
+                return "ok"
+
+            provider = StreamingProvider()
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="m"), stream_tool_dispatch=True),
+                provider=provider,
+                tools=[FunctionTool(name="slow", description="", input_schema={}, fn=slow)],
+            )
+
+            result = await agent.run("go")
+            self.assertEqual(result.output_text, "all done")
+            self.assertEqual([r.call_id for r in result.tool_results], ["c1", "c2"])
+            self.assertLess(started[0], provider.finished_at)
+
+        asyncio.run(_run())
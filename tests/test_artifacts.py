@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from genai_sdk.agent import Agent
+from genai_sdk.config import AgentConfig, ModelConfig
+from genai_sdk.providers.base import ProviderResponse
+from genai_sdk.tools.artifacts import ArtifactStore, truncate_output
+from genai_sdk.tools.function import FunctionTool
+from genai_sdk.types import ToolCall
+
+from fakes import ScriptedProvider
+
+
+class TestArtifacts(unittest.TestCase):
+    def test_truncate_summarizes_json_and_keeps_head_and_tail(self) -> None:
+        rows = [{"id": i, "name": f"row{i}"} for i in range(500)]
+        text = json.dumps(rows, indent=1)
+        out = truncate_output(text, 600, "art_0123456789abcdef")
+        self.assertLess(len(out), 700)
+        self.assertTrue(out.startswith("[JSON array of 500 items (dict); item keys: id, name]"))
+        self.assertIn("art_0123456789abcdef", out)
+        self.assertIn('"row0"', out)
+        self.assertIn("]", out.rstrip().splitlines()[-2])
+
+    def test_truncate_respects_limits_smaller_than_the_notice(self) -> None:
+        text = json.dumps([{"id": i} for i in range(200)])
+        handle = "art_0123456789abcdef"
+        no_summary = truncate_output(text, 200, handle)
+        self.assertLessEqual(len(no_summary), 200)
+        self.assertFalse(no_summary.startswith("[JSON array"))
+        self.assertIn(handle, no_summary)
+        for limit in (1, 10, 60):
+            out = truncate_output(text, limit, handle)
+            self.assertLessEqual(len(out), limit)
+            self.assertTrue(out.startswith("[Output truncated"[: limit - 1]))
+
+    def test_default_store_is_removed_on_close(self) -> None:
+        async def _run() -> None:
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="m"), tool_output_max_chars=500),
+                provider=ScriptedProvider([]),
+            )
+            agent.artifacts.put("payload")
+            root = agent.artifacts.root
+            self.assertTrue(os.path.isdir(root))
+            await agent.aclose()
+            self.assertFalse(os.path.exists(root))
+
+            with tempfile.TemporaryDirectory() as own:
+                store = ArtifactStore(own)
+                store.put("payload")
+                shared = Agent(
+                    config=AgentConfig(model=ModelConfig(model="m"), tool_output_max_chars=500),
+                    provider=ScriptedProvider([]),
+                    artifacts=store,
+                )
+                await shared.aclose()
+                store.close()
+                self.assertEqual(len(os.listdir(own)), 1)
+
+        asyncio.run(_run())
+
+    def test_agent_spills_large_output_and_model_can_page_it(self) -> None:
+        async def _run() -> None:
+            big = "\n".join(f"line {i}" for i in range(2000))
+
+            async def dump(args, ctx):
+                return big
+
+            provider = ScriptedProvider(
+                [
+                    ProviderResponse(content="", tool_calls=[ToolCall(name="dump", arguments={}, call_id="c1")]),
+                    ProviderResponse(content="done"),
+                ]
+            )
+            with tempfile.TemporaryDirectory() as root:
+                agent = Agent(
+                    config=AgentConfig(model=ModelConfig(model="m"), tool_output_max_chars=500),
+                    provider=provider,
+                    tools=[FunctionTool(name="dump", description="", input_schema={}, fn=dump)],
+                    artifacts=ArtifactStore(root),
+                )
+                result = await agent.run("dump it")
+
+                spilled = result.tool_results[0]
+                self.assertLessEqual(len(spilled.output), 500)
+                handle = spilled.metadata["artifact"]
+                self.assertEqual(spilled.metadata["output_chars"], len(big))
+                self.assertIn("read_artifact", [t["function"]["name"] for t in provider.requests[0].tools])
+
+                page = await agent.tools["read_artifact"].call({"handle": handle, "offset": 7, "length": 6}, None)
+                self.assertTrue(page.endswith("\nline 1"))
+                self.assertIn("Next offset: 13", page)
+
+                page = await agent.tools["read_artifact"].call({"handle": handle, "offset": -5, "length": 6}, None)
+                self.assertTrue(page.startswith(f"[{handle} characters 0-6 of {len(big)}."))
+                self.assertTrue(page.endswith("\nline 0"))
+
+        asyncio.run(_run())
+
+    def test_zero_tool_limit_overrides_agent_limit(self) -> None:
+        async def _run() -> None:
+            async def dump(args, ctx):
+                return "x" * 100
+
+            provider = ScriptedProvider(
+                [
+                    ProviderResponse(content="", tool_calls=[ToolCall(name="dump", arguments={}, call_id="c1")]),
+                    ProviderResponse(content="done"),
+                ]
+            )
+            with tempfile.TemporaryDirectory() as root:
+                agent = Agent(
+                    config=AgentConfig(model=ModelConfig(model="m"), tool_output_max_chars=500),
+                    provider=provider,
+                    tools=[FunctionTool(name="dump", description="", input_schema={}, fn=dump, max_output_chars=0)],
+                    artifacts=ArtifactStore(root),
+                )
+                result = await agent.run("dump it")
+
+                spilled = result.tool_results[0]
+                self.assertEqual(spilled.output, "")
+                self.assertEqual(agent.artifacts.read(spilled.metadata["artifact"], -3, 200), "x" * 100)
+
+        asyncio.run(_run())
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from genai_sdk.tools.base import ToolContext
+from genai_sdk.tools.cache import ToolCache
+from genai_sdk.tools.function import FunctionTool
+
+
+def square(args, ctx):
+    return {"value": args["x"] * args["x"]}
+
+
+class TestFunctionTool(unittest.TestCase):
+    def test_sync_tool_runs_off_loop_and_can_be_cancelled(self) -> None:
+        async def _run() -> None:
+            stopped = threading.Event()
+
+            def blocking(args, ctx):
+                ctx.cancel_event.wait(5)
+                stopped.set()
+                return "late"
+
+            tool = FunctionTool(name="block", description="", input_schema={}, fn=blocking)
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            tick_task = asyncio.create_task(ticker())
+            started = time.perf_counter()
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(tool.call({}, ToolContext()), timeout=0.2)
+            tick_task.cancel()
+
+            self.assertLess(time.perf_counter() - started, 1.0)
+            self.assertGreater(ticks, 5)
+            self.assertTrue(await asyncio.to_thread(stopped.wait, 1))
+
+        asyncio.run(_run())
+
+    def test_process_executor_runs_picklable_tool(self) -> None:
+        async def _run() -> None:
+            tool = FunctionTool(name="square", description="", input_schema={}, fn=square, executor="process")
+            self.assertEqual(await tool.call({"x": 7}, ToolContext(session_id="s")), '{"value": 49}')
+
+        asyncio.run(_run())
+
+    def test_cached_tool_collapses_concurrent_calls_and_scopes_by_user(self) -> None:
+        async def _run() -> None:
+            calls = 0
+
+            async def price(args, ctx):
+                nonlocal calls
+                calls += 1
+                await asyncio.sleep(0.05)
+                return f"{args['sku']}:{calls}"
+
+            tool = FunctionTool(
+                name="price",
+                description="",
+                input_schema={},
+                fn=price,
+                cache=ToolCache(ttl_seconds=60, scope="user"),
+            )
+            ctxs = [ToolContext(user_id="u1") for _ in range(3)]
+            outputs = await asyncio.gather(*[tool.call({"sku": "a"}, ctx) for ctx in ctxs])
+            self.assertEqual(outputs, ["a:1"] * 3)
+            self.assertEqual(sorted(c.metadata["tool_cache"] for c in ctxs), ["coalesced", "coalesced", "miss"])
+
+            hit_ctx = ToolContext(user_id="u1")
+            self.assertEqual(await tool.call({"sku": "a"}, hit_ctx), "a:1")
+            self.assertEqual(hit_ctx.metadata["tool_cache"], "hit")
+            self.assertEqual(await tool.call({"sku": "a"}, ToolContext(user_id="u2")), "a:2")
+            self.assertEqual(await tool.call({"sku": "a"}, ToolContext()), "a:3")
+
+        asyncio.run(_run())
@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import genai_sdk
+
+SRC = os.path.dirname(os.path.dirname(genai_sdk.__file__))
+HEAVY = ("pydantic", "httpx", "sqlite3", "multiprocessing", "genai_sdk.rag.simple_vector", "genai_sdk.tools.mcp_stdio")
+# Cold-start budget for a bare ``import genai_sdk``; it currently takes a few milliseconds.
+IMPORT_BUDGET_SECONDS = 0.25
+
+
+def _probe(statement: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY!r} if m in sys.modules]}}))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": SRC}
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+class TestImportTime(unittest.TestCase):
+    def test_bare_import_is_cheap(self) -> None:
+        result = _probe("import genai_sdk")
+        self.assertEqual(result["loaded"], [])
+        self.assertLess(result["elapsed"], IMPORT_BUDGET_SECONDS)
+
+    def test_agent_import_defers_optional_dependencies(self) -> None:
+        self.assertEqual(_probe("from genai_sdk import Agent, AgentConfig, Message")["loaded"], [])
+        self.assertIn("httpx", _probe("from genai_sdk.providers import OpenAICompatibleProvider")["loaded"])
+
+    def test_lazy_exports_resolve(self) -> None:
+        import genai_sdk.providers
+        import genai_sdk.rag
+        import genai_sdk.tools
+
+        self.assertIn("Agent", dir(genai_sdk))
+        self.assertIs(genai_sdk.Agent, __import__("genai_sdk.agent").agent.Agent)
+        self.assertEqual(genai_sdk.tools.FunctionTool.__name__, "FunctionTool")
+        self.assertEqual(genai_sdk.rag.SimpleVectorRetriever.__name__, "SimpleVectorRetriever")
+        self.assertEqual(genai_sdk.providers.ScheduledProvider.__name__, "ScheduledProvider")
+        self.assertIn("OpenAICompatibleProvider", dir(genai_sdk.providers))
+        with self.assertRaises(AttributeError):
+            genai_sdk.DoesNotExist
@@ -0,0 +1,142 @@
+import asyncio
+import os
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+
+from genai_sdk.errors import ToolExecutionError
+from genai_sdk.tools.mcp import MCPToolset
+from genai_sdk.tools.mcp_stdio import MCPClientPool, StdioMCPClient
+
+SERVER = textwrap.dedent(
+    """
+    import json, os, sys, threading
+
+    lock = threading.Lock()
+
+    def send(msg):
+        with lock:
+            sys.stdout.write(json.dumps(msg) + "\\n")
+            sys.stdout.flush()
+
+    def reply(req, text):
+        send({"jsonrpc": "2.0", "id": req["id"], "result": {"content": [{"type": "text", "text": text}]}})
+
+    for line in sys.stdin:
+        req = json.loads(line)
+        method = req.get("method")
+        if method == "initialize" and os.environ.get("FAIL_INIT"):
+            send({"jsonrpc": "2.0", "id": req["id"], "error": {"code": -32603, "message": "not ready"}})
+        elif method == "initialize":
+            send({"jsonrpc": "2.0", "id": req["id"], "result": {"serverInfo": {"name": "test"}}})
+        elif method == "tools/list":
+            tools = [{"name": "sleep", "description": "Sleep then echo", "inputSchema": {"type": "object"}}]
+            send({"jsonrpc": "2.0", "id": req["id"], "result": {"tools": tools}})
+        elif method == "tools/call":
+            args = req["params"]["arguments"]
+            if args.get("crash"):
+                os._exit(1)
+            if args.get("notify"):
+                send({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"})
+            text = f"{args.get('value')}@{os.getpid()}"
+            threading.Timer(args.get("delay", 0), reply, (req, text)).start()
+    """
+)
+
+
+class TestStdioMCPClient(unittest.TestCase):
+    def setUp(self) -> None:
+        handle, self.server = tempfile.mkstemp(suffix=".py")
+        with os.fdopen(handle, "w") as f:
+            f.write(SERVER)
+
+    def tearDown(self) -> None:
+        os.unlink(self.server)
+
+    def test_multiplexes_concurrent_calls_and_restarts(self) -> None:
+        async def _run() -> None:
+            client = StdioMCPClient(sys.executable, [self.server])
+            try:
+                tools = await MCPToolset(client).load()
+                self.assertEqual(tools[0].name, "sleep")
+                self.assertEqual(client.server_info["name"], "test")
+
+                started = time.perf_counter()
+                slow, fast = await asyncio.gather(
+                    tools[0].call({"value": "slow", "delay": 0.4}, None),
+                    tools[0].call({"value": "fast", "delay": 0.1}, None),
+                )
+                self.assertLess(time.perf_counter() - started, 0.7)
+                self.assertTrue(slow.startswith("slow@"))
+                self.assertTrue(fast.startswith("fast@"))
+
+                changed = []
+                client.add_tools_changed_listener(lambda: changed.append(True))
+                await client.call_tool("sleep", {"value": 1, "notify": True})
+                await asyncio.sleep(0)
+                self.assertEqual(changed, [True])
+                self.assertIsNone(client._tools)
+
+                with self.assertRaises(Exception):
+                    await client.call_tool("sleep", {"crash": True})
+                self.assertTrue((await client.call_tool("sleep", {"value": "back"})).startswith("back@"))
+                self.assertEqual(client.restarts, 1)
+            finally:
+                await client.close()
+
+        asyncio.run(_run())
+
+    def test_listeners_can_reenter_the_client_and_failures_are_contained(self) -> None:
+        async def _run() -> None:
+            client = StdioMCPClient(sys.executable, [self.server])
+            try:
+                await client.list_tools()
+                reloaded: asyncio.Future[list] = asyncio.get_running_loop().create_future()
+
+                def broken() -> None:
+                    raise RuntimeError("listener bug")
+
+                async def reload() -> None:
+                    reloaded.set_result(await client.list_tools())
+
+                client.add_tools_changed_listener(broken)
+                client.add_tools_changed_listener(reload)
+                with self.assertLogs("genai_sdk.tools.mcp_stdio", level="ERROR") as logs:
+                    await client.call_tool("sleep", {"value": 1, "notify": True})
+                    tools = await asyncio.wait_for(reloaded, timeout=2.0)
+                self.assertEqual(tools[0]["name"], "sleep")
+                self.assertIn("listener bug", logs.output[0])
+                self.assertTrue(client.running)
+                self.assertTrue((await client.call_tool("sleep", {"value": "ok"})).startswith("ok@"))
+            finally:
+                await client.close()
+
+        asyncio.run(_run())
+
+    def test_failed_handshake_leaves_the_client_stopped(self) -> None:
+        async def _run() -> None:
+            client = StdioMCPClient(sys.executable, [self.server], env={"FAIL_INIT": "1"})
+            try:
+                with self.assertRaises(ToolExecutionError):
+                    await client.start()
+                self.assertFalse(client.running)
+                self.assertIsNone(client._proc)
+                with self.assertRaises(ToolExecutionError):
+                    await client.list_tools()
+            finally:
+                await client.close()
+
+        asyncio.run(_run())
+
+    def test_pool_spreads_calls_across_processes(self) -> None:
+        async def _run() -> None:
+            pool = MCPClientPool(lambda: StdioMCPClient(sys.executable, [self.server]), size=2)
+            try:
+                outputs = await asyncio.gather(*[pool.call_tool("sleep", {"value": i, "delay": 0.2}) for i in range(4)])
+                self.assertEqual(len({out.split("@")[1] for out in outputs}), 2)
+            finally:
+                await pool.close()
+
+        asyncio.run(_run())
@@ -1,6 +1,11 @@
+import asyncio
+import json
 import unittest
 
-from genai_sdk.providers.openai_compatible import OpenAICompatibleProvider
+from genai_sdk.config import GenerationConfig
+from genai_sdk.providers.base import ProviderRequest
+from genai_sdk.providers.openai_compatible import OpenAICompatibleProvider, _ToolCallAccumulator, _parse_usage
+from genai_sdk.runner import BackgroundLoopRunner
 from genai_sdk.types import Message
 
 
@@ -36,3 +41,70 @@ class TestOpenAICompatibleProvider(unittest.TestCase):
         self.assertEqual(payload[1]["tool_call_id"], "call_1")
         self.assertEqual(payload[1]["name"], "echo")
 
+    def test_tool_call_accumulator_releases_calls_as_soon_as_complete(self) -> None:
+        acc = _ToolCallAccumulator()
+        self.assertEqual(acc.feed({"index": 0, "id": "a", "function": {"name": "echo", "arguments": '{"te'}}), [])
+        ready = acc.feed({"index": 0, "function": {"arguments": 'xt": "hi"}'}})
+        self.assertEqual([(c.call_id, c.arguments) for c in ready], [("a", {"text": "hi"})])
+
+        self.assertEqual(acc.feed({"index": 1, "id": "b", "function": {"name": "echo", "arguments": '{"text": "x'}}), [])
+        self.assertEqual(acc.feed({"index": 2, "id": "c", "function": {"name": "noop", "arguments": ""}})[0].call_id, "b")
+        flushed = acc.flush()
+        self.assertEqual([(c.call_id, c.arguments, c.arguments_error) for c in flushed], [("c", {}, None)])
+        self.assertEqual(acc.flush(), [])
+
+    def test_parse_usage_reports_cached_prompt_tokens(self) -> None:
+        usage = _parse_usage(
+            {"prompt_tokens": 1200, "completion_tokens": 20, "total_tokens": 1220, "prompt_tokens_details": {"cached_tokens": 1024}}
+        )
+        self.assertEqual(usage.cached_input_tokens, 1024)
+        self.assertIsNone(_parse_usage({"prompt_tokens": 5}).cached_input_tokens)
+
+    def test_encoded_body_matches_payload_and_reuses_cached_parts(self) -> None:
+        provider = OpenAICompatibleProvider(base_url="http://localhost/v1", api_key="k")
+        tools = [{"type": "function", "function": {"name": "echo", "description": "Echo", "parameters": {}}}]
+        messages = [Message(role="user", content="hi \u00e9"), Message(role="assistant", content="", name="bot")]
+        request = ProviderRequest(model="m", messages=messages, generation=GenerationConfig(max_tokens=5), tools=tools)
+
+        body = provider._encode(request, stream=True)
+        self.assertEqual(json.loads(body), {**provider._payload(request), "stream": True})
+        cached = messages[0].payload_cache[1]
+
+        messages.append(Message(role="user", content="more"))
+        body = provider._encode(request)
+        self.assertIs(messages[0].payload_cache[1], cached)
+        self.assertEqual(json.loads(body), provider._payload(request))
+
+        messages[0].content = "changed"
+        self.assertEqual(json.loads(provider._encode(request))["messages"][0]["content"], "changed")
+
+        # Every encoded field is part of the cache key, not just the content.
+        messages[1].name = "helper"
+        messages[1].metadata["tool_calls"] = [{"id": "c1", "type": "function"}]
+        messages[2].tool_call_id = "c1"
+        messages[2].role = "tool"
+        self.assertEqual(json.loads(provider._encode(request)), provider._payload(request))
+
+    def test_aclose_closes_clients_from_every_loop(self) -> None:
+        provider = OpenAICompatibleProvider(base_url="https://example.test/v1", api_key="k")
+
+        async def client():
+            return provider._http()
+
+        runner = BackgroundLoopRunner()
+        try:
+            background = runner.run(client())
+            stale = asyncio.run(client())
+
+            async def _run() -> None:
+                current = provider._http()
+                self.assertIsNot(current, stale)
+                await provider.aclose()
+                self.assertTrue(current.is_closed)
+
+            asyncio.run(_run())
+            self.assertTrue(stale.is_closed)
+            self.assertTrue(background.is_closed)
+            self.assertEqual(provider._clients, {})
+        finally:
+            runner.shutdown()
@@ -1,7 +1,7 @@
 import unittest
 
 from genai_sdk.errors import ConfigurationError
-from genai_sdk.prompting import PromptTemplate
+from genai_sdk.prompting import PromptTemplate, compile_template
 
 
 class TestPromptTemplate(unittest.TestCase):
@@ -13,3 +13,36 @@ class TestPromptTemplate(unittest.TestCase):
         t = PromptTemplate("Hello {name}")
         with self.assertRaises(ConfigurationError):
             t.render()
+
+    def test_compiled_template_matches_str_format(self) -> None:
+        source = "{{literal}} {name!r:>8} scored {score:.1f} on {item[0]} {name}"
+        compiled = compile_template(source)
+        self.assertIs(compile_template(source), compiled)
+        values = {"name": "Ada", "score": 9.25, "item": ["quiz"]}
+        self.assertEqual(compiled.variables, {"name", "score", "item"})
+        self.assertEqual(compiled.render_map(values), source.format(**values))
+
+    def test_partial_and_render_many(self) -> None:
+        t = PromptTemplate("You are {role}. Answer {{briefly}}: {question}")
+        bound = t.partial(role="a tutor")
+        self.assertEqual(bound.variables(), {"question"})
+        rows = [{"question": "why?"}, {"question": "how?"}]
+        self.assertEqual(
+            bound.render_many(rows),
+            ["You are a tutor. Answer {briefly}: why?", "You are a tutor. Answer {briefly}: how?"],
+        )
+        with self.assertRaises(ConfigurationError):
+            bound.render_many([{"question": "ok"}, {}])
+
+    def test_partial_handles_nested_specs_and_accessors(self) -> None:
+        nested = compile_template("{a:{w}} and {b}")
+        self.assertEqual(nested.variables, {"a", "b", "w"})
+        with self.assertRaises(ConfigurationError):
+            nested.partial(a="x")
+        self.assertEqual(nested.partial(a="x", w=3).render(b="y"), "x   and y")
+
+        accessor = compile_template("{user.name} asked about {topics[0]}")
+        self.assertEqual(accessor.variables, {"user", "topics"})
+        self.assertEqual(accessor.partial(topics=["tea"]).variables, {"user"})
+        with self.assertRaises(ConfigurationError):
+            accessor.partial(user=object())
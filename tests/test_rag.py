@@ -1,7 +1,11 @@
 import asyncio
 import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-from genai_sdk.rag.base import Document
+from genai_sdk.rag.base import Document, RetrievedChunk
+from genai_sdk.rag.cache import CachedRetriever
+from genai_sdk.rag.packing import pack_context
+from genai_sdk.rag.sharded import ShardedVectorRetriever
 from genai_sdk.rag.simple_vector import SimpleVectorRetriever
 
 
@@ -21,3 +25,164 @@ class TestSimpleVectorRetriever(unittest.TestCase):
             self.assertEqual(results[0].document_id, "d1")
 
         asyncio.run(_run())
+
+    def test_add_documents_streams_async_iterable_with_progress(self) -> None:
+        async def _run() -> None:
+            async def docs():
+                for i in range(10):
+                    yield Document(id=f"d{i}", text=f"topic{i} " * 40)
+
+            retriever = SimpleVectorRetriever(chunk_size=100, overlap=10)
+            seen: list[int] = []
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                stats = await retriever.add_documents(
+                    docs(),
+                    batch_size=4,
+                    max_in_flight=2,
+                    executor=pool,
+                    progress=lambda p: seen.append(p.chunks),
+                )
+
+            self.assertEqual(stats.documents, 10)
+            self.assertEqual(stats.chunks, len(retriever._chunks))
+            self.assertEqual(seen, sorted(seen))
+            self.assertEqual(seen[-1], stats.chunks)
+            results = await retriever.retrieve("topic7", k=1)
+            self.assertEqual(results[0].document_id, "d7")
+
+        asyncio.run(_run())
+
+    def test_upsert_replaces_and_delete_removes_documents(self) -> None:
+        async def _run() -> None:
+            retriever = SimpleVectorRetriever(compaction_threshold=0.0)
+            await retriever.add_documents(
+                [
+                    Document(id="d1", text="alpha beta"),
+                    Document(id="d2", text="gamma delta"),
+                ]
+            )
+            await retriever.upsert_documents([Document(id="d1", text="alpha beta refreshed")])
+
+            results = await retriever.retrieve("alpha", k=5)
+            self.assertEqual([r.text for r in results if r.document_id == "d1"], ["alpha beta refreshed"])
+
+            self.assertEqual(await retriever.delete_documents(["d2", "missing"]), 1)
+            results = await retriever.retrieve("gamma", k=5)
+            self.assertNotIn("d2", [r.document_id for r in results])
+
+            await asyncio.sleep(0.01)
+            self.assertEqual(len(retriever._chunks), 1)
+            self.assertEqual(retriever._tombstones, set())
+
+        asyncio.run(_run())
+
+    def test_quantized_storage_shrinks_footprint_and_reranks_exactly(self) -> None:
+        async def _run() -> None:
+            docs = [
+                Document(id="d1", text="Python SDK for agents and tools."),
+                Document(id="d2", text="Cooking recipes and kitchen planning."),
+            ]
+            full = SimpleVectorRetriever()
+            await full.add_documents(docs)
+            expected = await full.retrieve("python sdk for agents", k=1)
+
+            for storage in ("int8", "binary"):
+                retriever = SimpleVectorRetriever(storage=storage, rerank_candidates=2)
+                await retriever.add_documents(docs)
+                results = await retriever.retrieve("python sdk for agents", k=1)
+                self.assertEqual(results[0].document_id, "d1")
+                self.assertAlmostEqual(results[0].score, expected[0].score, places=5)
+                self.assertLess(
+                    retriever.memory_footprint().vector_bytes,
+                    full.memory_footprint().vector_bytes,
+                )
+
+        asyncio.run(_run())
+
+
+class TestShardedVectorRetriever(unittest.TestCase):
+    def test_sharded_retrieval_matches_simple_retriever(self) -> None:
+        async def _run() -> None:
+            docs = [Document(id=f"d{i}", text=f"word{i % 7} shared filler{i}") for i in range(40)]
+            simple = SimpleVectorRetriever()
+            await simple.add_documents(docs)
+
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                sharded = ShardedVectorRetriever(shards=4, executor=pool, min_shard_rows=5)
+                try:
+                    await sharded.add_documents(docs)
+                    expected = await simple.retrieve("word3 shared", k=3)
+                    results = await sharded.retrieve("word3 shared", k=3)
+                    self.assertEqual([r.document_id for r in results], [r.document_id for r in expected])
+
+                    await sharded.delete_documents([results[0].document_id])
+                    after = await sharded.retrieve("word3 shared", k=3)
+                    self.assertNotIn(results[0].document_id, [r.document_id for r in after])
+                finally:
+                    sharded.close()
+
+        asyncio.run(_run())
+
+
+class TestCachedRetriever(unittest.TestCase):
+    def test_cache_hits_until_index_version_changes(self) -> None:
+        async def _run() -> None:
+            inner = SimpleVectorRetriever()
+            await inner.add_documents([Document(id="d1", text="python sdk for agents")])
+            cached = CachedRetriever(inner)
+
+            first = await cached.retrieve("python agents", k=2)
+            second = await cached.retrieve("python agents", k=2)
+            self.assertEqual([r.document_id for r in first], [r.document_id for r in second])
+            self.assertEqual((cached.stats.hits, cached.stats.misses), (1, 1))
+
+            await inner.add_documents([Document(id="d2", text="python agents")])
+            third = await cached.retrieve("python agents", k=2)
+            self.assertEqual(third[0].document_id, "d2")
+            self.assertEqual(cached.stats.stale, 1)
+            self.assertEqual(cached.stats.embedding_hits, 1)
+
+            await cached.delete_documents(["d2"])
+            fourth = await cached.retrieve("python agents", k=2)
+            self.assertEqual([r.document_id for r in fourth], ["d1"])
+            self.assertAlmostEqual(cached.stats.hit_rate, 0.25)
+
+        asyncio.run(_run())
+
+    def test_mutations_need_a_mutable_retriever(self) -> None:
+        class ReadOnlyRetriever:
+            async def add_documents(self, docs):
+                return None
+
+            async def retrieve(self, query, k=5):
+                return []
+
+        async def _run() -> None:
+            cached = CachedRetriever(ReadOnlyRetriever())
+            with self.assertRaises(TypeError):
+                await cached.delete_documents(["d1"])
+            with self.assertRaises(TypeError):
+                await cached.upsert_documents([Document(id="d1", text="alpha")])
+            self.assertEqual(cached.version, (None, 0))
+
+        asyncio.run(_run())
+
+
+class TestPackContext(unittest.TestCase):
+    def test_merges_overlapping_chunks_and_drops_duplicates(self) -> None:
+        text = "alpha beta gamma delta epsilon zeta eta theta"
+        chunks = [
+            RetrievedChunk(document_id="d1", text=text[0:20], score=0.5, start=0),
+            RetrievedChunk(document_id="d1", text=text[15:35], score=0.9, start=15),
+            RetrievedChunk(document_id="d2", text=text[0:35], score=0.4, start=0),
+            RetrievedChunk(document_id="d3", text="unrelated words here " * 10, score=0.3, start=0),
+        ]
+
+        packed = pack_context(chunks)
+        self.assertEqual([p.document_id for p in packed], ["d1", "d3"])
+        self.assertEqual(packed[0].text, text[0:35])
+        self.assertEqual(packed[0].chunks, 2)
+        self.assertEqual(packed[0].score, 0.9)
+
+        budgeted = pack_context(chunks, token_budget=10)
+        self.assertEqual([p.document_id for p in budgeted], ["d1"])
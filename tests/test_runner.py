@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import unittest
+
+from genai_sdk.agent import Agent
+from genai_sdk.config import AgentConfig, ModelConfig
+from genai_sdk.providers.base import Provider, ProviderRequest, ProviderResponse
+from genai_sdk.runner import BackgroundLoopRunner, get_runner, shutdown_runner
+
+
+class LoopRecordingProvider(Provider):
+    def __init__(self):
+        self.loops: set[int] = set()
+        self.closed = False
+
+    async def generate(self, request: ProviderRequest) -> ProviderResponse:
+        self.loops.add(id(asyncio.get_running_loop()))
+        return ProviderResponse(content="ok")
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class TestBackgroundLoopRunner(unittest.TestCase):
+    def tearDown(self) -> None:
+        shutdown_runner()
+
+    def test_run_sync_reuses_one_loop_across_threads(self) -> None:
+        provider = LoopRecordingProvider()
+        agent = Agent(config=AgentConfig(model=ModelConfig(model="m")), provider=provider)
+        outputs: list[str] = []
+
+        def worker() -> None:
+            outputs.append(agent.run_sync("hi").output_text)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        async def inside_running_loop() -> str:
+            return agent.run_sync("hi").output_text
+
+        outputs.append(asyncio.run(inside_running_loop()))
+        self.assertEqual(outputs, ["ok"] * 5)
+        self.assertEqual(len(provider.loops), 1)
+
+        shutdown_runner()
+        self.assertTrue(provider.closed)
+        self.assertEqual(agent.run_sync("hi").output_text, "ok")
+        self.assertEqual(len(provider.loops), 2)
+
+    def test_run_from_loop_thread_is_rejected(self) -> None:
+        runner = BackgroundLoopRunner()
+        try:
+
+            async def nested() -> None:
+                runner.run(asyncio.sleep(0))
+
+            with self.assertRaises(RuntimeError):
+                runner.run(nested())
+        finally:
+            runner.shutdown()
+        self.assertTrue(runner.closed)
+        self.assertIsNot(get_runner(), runner)
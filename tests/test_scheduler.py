@@ -0,0 +1,101 @@
+import asyncio
+import time
+import unittest
+
+from genai_sdk.config import GenerationConfig
+from genai_sdk.errors import DeadlineExceededError, ProviderOverloadedError
+from genai_sdk.providers.base import Provider, ProviderRequest, ProviderResponse
+from genai_sdk.providers.scheduler import ScheduledProvider
+from genai_sdk.types import Message
+
+
+class GatedProvider(Provider):
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.order: list[str] = []
+
+    async def generate(self, request: ProviderRequest) -> ProviderResponse:
+        self.order.append(request.messages[0].content)
+        await self.gate.wait()
+        return ProviderResponse(content="ok")
+
+
+def _request(
+    tag: str, user_id: str | None = None, priority: str | None = None, timeout: float | None = None
+) -> ProviderRequest:
+    return ProviderRequest(
+        model="m",
+        messages=[Message(role="user", content=tag)],
+        generation=GenerationConfig(),
+        user_id=user_id,
+        priority=priority,
+        timeout=timeout,
+    )
+
+
+class TestScheduledProvider(unittest.TestCase):
+    def test_priority_then_fair_share_across_users(self) -> None:
+        async def _run() -> None:
+            inner = GatedProvider()
+            scheduler = ScheduledProvider(inner, max_in_flight=1)
+            tasks = [asyncio.ensure_future(scheduler.generate(_request("first", "a", "batch")))]
+            await asyncio.sleep(0)
+            for i in range(3):
+                tasks.append(asyncio.ensure_future(scheduler.generate(_request(f"a{i}", "a", "batch"))))
+            for i in range(2):
+                tasks.append(asyncio.ensure_future(scheduler.generate(_request(f"b{i}", "b", "batch"))))
+            tasks.append(asyncio.ensure_future(scheduler.generate(_request("urgent", "c", "interactive"))))
+            await asyncio.sleep(0)
+            self.assertEqual(scheduler.stats().queued, {"interactive": 1, "batch": 5})
+
+            inner.gate.set()
+            await asyncio.gather(*tasks)
+            self.assertEqual(inner.order, ["first", "urgent", "a0", "b0", "a1", "b1", "a2"])
+            stats = scheduler.stats()
+            self.assertEqual(stats.admitted, {"interactive": 1, "batch": 6})
+            self.assertEqual(stats.in_flight, 0)
+            self.assertGreater(scheduler.wait_percentile("batch", 0.9), 0.0)
+
+        asyncio.run(_run())
+
+    def test_sheds_requests_that_wait_too_long(self) -> None:
+        async def _run() -> None:
+            inner = GatedProvider()
+            scheduler = ScheduledProvider(inner, max_in_flight=1, max_queue_wait={"batch": 0.05}, max_queue_length=2)
+            holder = asyncio.ensure_future(scheduler.generate(_request("hold")))
+            await asyncio.sleep(0)
+
+            started = time.perf_counter()
+            with self.assertRaises(ProviderOverloadedError):
+                await scheduler.generate(_request("late", priority="batch"))
+            self.assertLess(time.perf_counter() - started, 0.5)
+
+            queued = [asyncio.ensure_future(scheduler.generate(_request(f"q{i}"))) for i in range(2)]
+            await asyncio.sleep(0)
+            with self.assertRaises(ProviderOverloadedError):
+                await scheduler.generate(_request("overflow"))
+
+            inner.gate.set()
+            await asyncio.gather(holder, *queued)
+            stats = scheduler.stats()
+            self.assertEqual(stats.shed, {"interactive": 1, "batch": 1})
+            self.assertEqual(stats.in_flight, 0)
+            self.assertEqual(inner.order, ["hold", "q0", "q1"])
+
+        asyncio.run(_run())
+
+    def test_request_deadline_is_not_counted_as_shedding(self) -> None:
+        async def _run() -> None:
+            inner = GatedProvider()
+            scheduler = ScheduledProvider(inner, max_in_flight=1, max_queue_wait=5.0)
+            holder = asyncio.ensure_future(scheduler.generate(_request("hold")))
+            await asyncio.sleep(0)
+
+            with self.assertRaises(DeadlineExceededError):
+                await scheduler.generate(_request("late", timeout=0.05))
+
+            inner.gate.set()
+            await holder
+            self.assertEqual(scheduler.stats().shed, {"interactive": 0, "batch": 0})
+
+        asyncio.run(_run())
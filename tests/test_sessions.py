@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+
+from genai_sdk.agent import Agent
+from genai_sdk.config import AgentConfig, ModelConfig
+from genai_sdk.errors import SessionBusyError
+from genai_sdk.providers.base import Provider, ProviderRequest, ProviderResponse
+from genai_sdk.sessions import SessionExecutor
+
+
+class SlowProvider(Provider):
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def generate(self, request: ProviderRequest) -> ProviderResponse:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        return ProviderResponse(content=f"reply to {request.messages[-1].content}")
+
+
+class TestSessionExecutor(unittest.TestCase):
+    def test_turns_on_one_session_are_serialized(self) -> None:
+        async def _run() -> None:
+            provider = SlowProvider()
+            agent = Agent(config=AgentConfig(model=ModelConfig(model="m")), provider=provider)
+            results = await asyncio.gather(*(agent.run(f"q{i}", session_id="s") for i in range(3)))
+            self.assertEqual(provider.peak, 1)
+
+            history = await agent.memory.load("s", limit=10)
+            self.assertEqual(
+                [m.content for m in history],
+                ["q0", "reply to q0", "q1", "reply to q1", "q2", "reply to q2"],
+            )
+            self.assertGreater(results[2].timings.phases["session_wait"], 0)
+            stats = agent.sessions.stats()
+            self.assertEqual((stats.acquired, stats.contended, stats.active_sessions), (3, 2, 0))
+
+            provider.peak = 0
+            await asyncio.gather(*(agent.run("hi", session_id=f"user-{i}") for i in range(3)))
+            self.assertEqual(provider.peak, 3)
+
+        asyncio.run(_run())
+
+    def test_waiters_per_session_are_bounded(self) -> None:
+        async def _run() -> None:
+            sessions = SessionExecutor(max_waiters=1)
+            release = asyncio.Event()
+
+            async def turn() -> None:
+                async with sessions.hold("s"):
+                    await release.wait()
+
+            running = asyncio.ensure_future(turn())
+            queued = asyncio.ensure_future(turn())
+            await asyncio.sleep(0)
+            self.assertEqual(sessions._entries["s"].waiters, 1)
+            with self.assertRaises(SessionBusyError):
+                async with sessions.hold("s"):
+                    pass
+            async with sessions.hold("other"):
+                pass
+
+            release.set()
+            await asyncio.gather(running, queued)
+            stats = sessions.stats()
+            self.assertEqual((stats.acquired, stats.rejected, stats.active_sessions), (3, 1, 0))
+
+        asyncio.run(_run())
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import unittest
+
+from pydantic import BaseModel
+
+from genai_sdk.agent import Agent
+from genai_sdk.config import AgentConfig, ModelConfig
+from genai_sdk.errors import StructuredOutputError
+from genai_sdk.providers.base import Provider, ProviderEvent, ProviderRequest, ProviderResponse
+from genai_sdk.structured import IncrementalJSONParser, get_validator
+from genai_sdk.tools.function import FunctionTool
+from genai_sdk.types import ToolCall, Usage
+
+
+class Answer(BaseModel):
+    answer: str
+    score: int
+
+
+class TestStructuredValidation(unittest.TestCase):
+    def test_validator_is_cached_and_accepts_fenced_json(self) -> None:
+        validator = get_validator(Answer)
+        self.assertIs(get_validator(Answer), validator)
+        fenced = 'Here you go:\n```json\n{"answer": "yes", "score": 3}\n```'
+        self.assertEqual(json.loads(validator.validate_json(fenced)), {"answer": "yes", "score": 3})
+        with self.assertRaises(StructuredOutputError):
+            validator.validate_json('{"answer": "yes"}')
+
+    def test_incremental_parser_skips_prose_and_validates_the_object(self) -> None:
+        parser = IncrementalJSONParser(validator=get_validator(Answer))
+        parser.feed('Sure! Here it is:\n```json\n{"answer": "ye')
+        self.assertFalse(parser.complete or parser.failed)
+        parser.feed('s", "score": 1}\n``` and a closing remark')
+        self.assertTrue(parser.complete)
+        self.assertFalse(parser.failed)
+        self.assertEqual(parser.document(), '{"answer": "yes", "score": 1}')
+
+        invalid = IncrementalJSONParser(validator=get_validator(Answer))
+        invalid.feed('I think the answer is {"answer": "yes"} because')
+        self.assertTrue(invalid.failed)
+        self.assertIsInstance(invalid.error, StructuredOutputError)
+
+        mismatched = IncrementalJSONParser()
+        mismatched.feed('{"answer": ]')
+        self.assertTrue(mismatched.failed)
+
+
+class ReaskProvider(Provider):
+    def __init__(self):
+        self.requests: list[ProviderRequest] = []
+        self.streamed: list[str] = []
+
+    async def generate(self, request: ProviderRequest) -> ProviderResponse:
+        self.requests.append(request)
+        return ProviderResponse(content='{"answer": "fixed", "score": 2}', usage=Usage(total_tokens=5))
+
+    async def stream(self, request: ProviderRequest):
+        self.requests.append(request)
+        for piece in ['Sure: {"answer": "yes"}', " and the score", " is more prose"]:
+            self.streamed.append(piece)
+            yield ProviderEvent(type="content", data=piece)
+        yield ProviderEvent(type="done", data=Usage(total_tokens=7))
+
+
+class PreambleToolProvider(Provider):
+    def __init__(self):
+        self.requests: list[ProviderRequest] = []
+
+    async def stream(self, request: ProviderRequest):
+        self.requests.append(request)
+        if len(self.requests) == 1:
+            yield ProviderEvent(type="content", data="Let me look that up.")
+            yield ProviderEvent(type="tool_call", data=ToolCall(name="lookup", arguments={}, call_id="c1"))
+        else:
+            yield ProviderEvent(type="content", data='{"answer": "found", "score": 1}')
+        yield ProviderEvent(type="done", data=Usage(total_tokens=3))
+
+
+class ProseWrappedProvider(Provider):
+    def __init__(self):
+        self.requests: list[ProviderRequest] = []
+
+    async def stream(self, request: ProviderRequest):
+        self.requests.append(request)
+        for piece in ["Sure! Here it is: ", '{"answer": "ok", ', '"score": 3}', " Anything else?"]:
+            yield ProviderEvent(type="content", data=piece)
+        yield ProviderEvent(type="done", data=Usage(total_tokens=4))
+
+
+class TestStructuredOutputRetries(unittest.TestCase):
+    def test_prose_around_valid_json_is_not_reasked(self) -> None:
+        async def _run() -> None:
+            provider = ProseWrappedProvider()
+            agent = Agent(
+                config=AgentConfig(
+                    model=ModelConfig(model="m"), stream_tool_dispatch=True, structured_output_retries=1
+                ),
+                provider=provider,
+            )
+            result = await agent.run("rate it", response_model=Answer)
+            self.assertEqual(json.loads(result.output_text), {"answer": "ok", "score": 3})
+            self.assertEqual(len(provider.requests), 1)
+            self.assertEqual(result.usage.total_tokens, 4)
+
+        asyncio.run(_run())
+
+    def test_text_before_a_tool_call_does_not_end_the_stream(self) -> None:
+        async def _run() -> None:
+            looked_up = []
+
+            async def lookup(args, ctx):
+                looked_up.append(True)
+                return "found"
+
+            provider = PreambleToolProvider()
+            agent = Agent(
+                config=AgentConfig(
+                    model=ModelConfig(model="m"), stream_tool_dispatch=True, structured_output_retries=1
+                ),
+                provider=provider,
+                tools=[FunctionTool(name="lookup", description="Look up", input_schema={"type": "object"}, fn=lookup)],
+            )
+            result = await agent.run("rate it", response_model=Answer)
+            self.assertEqual(looked_up, [True])
+            self.assertEqual(json.loads(result.output_text), {"answer": "found", "score": 1})
+            self.assertEqual(len(provider.requests), 2)
+
+        asyncio.run(_run())
+
+    def test_invalid_stream_is_cut_short_and_reasked(self) -> None:
+        async def _run() -> None:
+            provider = ReaskProvider()
+            agent = Agent(
+                config=AgentConfig(
+                    model=ModelConfig(model="m"), stream_tool_dispatch=True, structured_output_retries=1
+                ),
+                provider=provider,
+            )
+            result = await agent.run("rate it", response_model=Answer)
+            self.assertEqual(json.loads(result.output_text), {"answer": "fixed", "score": 2})
+            self.assertEqual(provider.streamed, ['Sure: {"answer": "yes"}'])
+            self.assertEqual(len(provider.requests), 2)
+            self.assertTrue(any("could not be used" in m.content for m in provider.requests[1].messages))
+
+            strict = Agent(
+                config=AgentConfig(model=ModelConfig(model="m"), stream_tool_dispatch=True), provider=ReaskProvider()
+            )
+            with self.assertRaises(StructuredOutputError):
+                await strict.run("rate it", response_model=Answer)
+
+        asyncio.run(_run())
@@ -0,0 +1,164 @@
+import asyncio
+import unittest
+
+from genai_sdk.agent import Agent
+from genai_sdk.config import AgentConfig, GenerationConfig, ModelConfig
+from genai_sdk.errors import ConfigurationError
+from genai_sdk.providers.base import ProviderResponse
+from genai_sdk.rag.base import Document
+from genai_sdk.rag.simple_vector import SimpleVectorRetriever
+from genai_sdk.tokens import ApproximateTokenizer, CallableTokenizer, count_message_tokens, count_messages_tokens, fit_history
+from genai_sdk.tools.function import FunctionTool
+from genai_sdk.types import Message
+
+from fakes import ScriptedProvider
+
+
+class TestTokenCounting(unittest.TestCase):
+    def test_counts_are_cached_per_tokenizer(self) -> None:
+        calls = []
+
+        def encode(text):
+            calls.append(text)
+            return text.split()
+
+        words = CallableTokenizer("words", encode)
+        message = Message(role="user", content="one two three")
+        self.assertEqual(count_message_tokens(message, words), 3 + 4)
+        self.assertEqual(count_message_tokens(message, words), 3 + 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(count_message_tokens(message, ApproximateTokenizer()), 4 + 4)
+
+        message.content = "one two four!"
+        self.assertEqual(count_message_tokens(message, words), 3 + 4)
+        self.assertEqual(len(calls), 2)
+        message.metadata["tool_calls"] = [{"id": "c1", "function": {"name": "lookup", "arguments": "{}"}}]
+        self.assertGreater(count_message_tokens(message, words), 3 + 4)
+
+    def test_context_priority_is_validated(self) -> None:
+        with self.assertRaises(ConfigurationError):
+            AgentConfig(model=ModelConfig(model="m"), context_priority=("tools", "rag", "history"))
+        with self.assertRaises(ConfigurationError):
+            AgentConfig(model=ModelConfig(model="m"), context_priority=("rag", "rag"))
+
+    def test_fit_history_keeps_summary_and_newest_messages(self) -> None:
+        tokenizer = ApproximateTokenizer()
+        history = [Message(role="system", content="summary")]
+        history += [Message(role="user" if i % 2 else "assistant", content=f"message {i:02d}") for i in range(10)]
+        fitted = fit_history(history, 30, tokenizer)
+        self.assertEqual(fitted[0].content, "summary")
+        self.assertEqual(fitted[-1].content, "message 09")
+        self.assertLessEqual(count_messages_tokens(fitted, tokenizer), 30)
+
+        orphaned = [Message(role="assistant", content="calling"), Message(role="tool", content="r" * 8)]
+        orphaned.append(Message(role="user", content="next"))
+        self.assertEqual([m.content for m in fit_history(orphaned, 13, tokenizer)], ["next"])
+
+
+class TestAgentInputBudget(unittest.TestCase):
+    def test_history_and_rag_are_trimmed_to_budget(self) -> None:
+        async def _run() -> None:
+            retriever = SimpleVectorRetriever(chunk_size=200, overlap=0)
+            await retriever.add_documents(
+                [Document(id=f"d{i}", text=f"agents use tools and retrieval {i} " * 10) for i in range(5)]
+            )
+            provider = ScriptedProvider(default=ProviderResponse(content="ok"))
+            tokenizer = ApproximateTokenizer()
+            agent = Agent(
+                config=AgentConfig(model=ModelConfig(model="m"), max_input_tokens=200, rag_context_token_budget=80),
+                provider=provider,
+                retriever=retriever,
+                tokenizer=tokenizer,
+            )
+            for i in range(6):
+                await agent.run(f"turn {i} " + "x" * 120, session_id="s")
+            await agent.run("how do agents use tools?", session_id="s")
+
+            messages = provider.requests[-1].messages
+            self.assertLessEqual(count_messages_tokens(messages, tokenizer), 200)
+            self.assertEqual(messages[-1].content, "how do agents use tools?")
+            self.assertTrue(any(m.content.startswith("Use only the provided context") for m in messages))
+            self.assertTrue(any(m.content.startswith("turn 5") for m in messages))
+            self.assertFalse(any(m.content.startswith("turn 0") for m in messages))
+
+        asyncio.run(_run())
+
+
+    def test_tool_schemas_are_reserved_before_other_sections(self) -> None:
+        async def _run() -> None:
+            async def noop(args, ctx):
+                return ""
+
+            tools = [
+                FunctionTool(name=f"tool_{i}", description="Does a thing " * 10, input_schema={"type": "object"}, fn=noop)
+                for i in range(3)
+            ]
+            provider = ScriptedProvider(default=ProviderResponse(content="ok"))
+            tokenizer = ApproximateTokenizer()
+            agent = Agent(
+                config=AgentConfig(
+                    model=ModelConfig(model="m"), max_input_tokens=300, context_priority=("history", "rag")
+                ),
+                provider=provider,
+                tools=tools,
+                tokenizer=tokenizer,
+            )
+            for i in range(6):
+                await agent.run(f"turn {i} " + "x" * 120, session_id="s")
+
+            schema_tokens = sum(agent._schema_tokens(t) for t in tools)
+            messages = provider.requests[-1].messages
+            self.assertLessEqual(count_messages_tokens(messages, tokenizer) + schema_tokens, 300)
+            self.assertTrue(any(m.content.startswith("turn 4") for m in messages))
+
+        asyncio.run(_run())
+
+
+class TestPrefixCacheLayout(unittest.TestCase):
+    def test_layout_is_validated_and_original_fields_keep_their_positions(self) -> None:
+        with self.assertRaises(ConfigurationError):
+            AgentConfig(model=ModelConfig(model="m"), prompt_layout="prefix-cache")
+        config = AgentConfig(ModelConfig(model="m"), GenerationConfig(), 2, 5.0, 6, 12, 3)
+        self.assertEqual(
+            (config.max_tool_iterations, config.tool_timeout_seconds, config.memory_window_messages), (2, 5.0, 6)
+        )
+        self.assertEqual((config.summary_trigger_messages, config.retrieval_top_k), (12, 3))
+
+    def test_summary_is_pinned_after_the_system_prompt(self) -> None:
+        async def _run() -> None:
+            retriever = SimpleVectorRetriever()
+            await retriever.add_documents([Document(id="d1", text="agents call tools")])
+            provider = ScriptedProvider(default=ProviderResponse(content="ok"))
+            agent = Agent(
+                config=AgentConfig(
+                    model=ModelConfig(model="m"),
+                    system_prompt="You are helpful.",
+                    prompt_layout="prefix_cache",
+                    memory_window_messages=2,
+                    summary_trigger_messages=4,
+                ),
+                provider=provider,
+                retriever=retriever,
+            )
+            for i in range(5):
+                await agent.run(f"question {i} about agents", session_id="s")
+
+            sent = [r.messages for r in provider.requests]
+            for request in sent:
+                self.assertEqual(request[0].content, "You are helpful.")
+                self.assertTrue(request[-1].content.startswith("Use only the provided context"))
+            # Before the first summary the sliding window is all there is.
+            self.assertEqual([m.content for m in sent[2][1:3]], ["question 1 about agents", "ok"])
+
+            # From then on the summary follows the system prompt and only the
+            # configured window of recent messages comes after it.
+            previous, last = sent[-2], sent[-1]
+            self.assertTrue(last[1].content.startswith("Summary:"))
+            self.assertEqual([m.content for m in last[2:4]], ["question 3 about agents", "ok"])
+            self.assertEqual(last[4].content, "question 4 about agents")
+            # Memory re-summarizes after every turn past the trigger, so the
+            # summary, and the cached prefix behind it, changes with it.
+            self.assertTrue(previous[1].content.startswith("Summary:"))
+            self.assertNotEqual(previous[1].content, last[1].content)
+
+        asyncio.run(_run())
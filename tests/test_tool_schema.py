@@ -0,0 +1,36 @@
+import unittest
+
+from genai_sdk.providers.openai_compatible import _decode_tool_arguments
+from genai_sdk.tools.schema import compile_schema
+
+
+class TestCompiledSchema(unittest.TestCase):
+    def test_reports_nested_errors(self) -> None:
+        validator = compile_schema(
+            {
+                "type": "object",
+                "properties": {
+                    "city": {"type": "string", "minLength": 2},
+                    "days": {"type": "integer", "minimum": 1, "maximum": 14},
+                    "units": {"enum": ["c", "f"]},
+                    "tags": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["city"],
+                "additionalProperties": False,
+            }
+        )
+
+        self.assertEqual(validator.errors({"city": "Paris", "days": 3, "units": "c", "tags": ["a"]}), [])
+        errors = validator.errors({"days": 30, "units": "k", "tags": [1], "extra": True})
+        self.assertIn("$: missing required property 'city'", errors)
+        self.assertIn("$.days: violates maximum 14", errors)
+        self.assertIn("$.tags[0]: expected string, got integer", errors)
+        self.assertIn("$: unexpected property 'extra'", errors)
+        self.assertEqual(len(errors), 5)
+
+    def test_decode_reports_malformed_arguments(self) -> None:
+        self.assertEqual(_decode_tool_arguments('{"a": 1}'), ({"a": 1}, None))
+        args, error = _decode_tool_arguments('{"a": ')
+        self.assertEqual(args, {})
+        self.assertIn("not valid JSON", error)
+        self.assertIn("JSON object", _decode_tool_arguments("[1]")[1])